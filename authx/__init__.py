@@ -2,9 +2,33 @@
 
 __version__ = "1.4.1"
 
+from typing import TYPE_CHECKING, Any
+
+from authx.base import AuthXCore
 from authx.config import AuthXConfig
-from authx.dependencies import AuthXDependency
-from authx.main import AuthX
 from authx.schema import RequestToken, TokenPayload
 
-__all__ = "AuthXConfig", "RequestToken", "TokenPayload", "AuthX", "AuthXDependency"
+if TYPE_CHECKING:
+    from authx.dependencies import AuthXDependency, LazySubject
+    from authx.main import AuthX
+
+__all__ = "AuthXConfig", "RequestToken", "TokenPayload", "AuthX", "AuthXCore", "AuthXDependency", "LazySubject"
+
+# The FastAPI integration is imported on first access, `AuthXCore` alone
+# mints and verifies tokens without loading FastAPI or Starlette
+_LAZY_IMPORTS = {
+    "AuthX": "authx.main",
+    "AuthXDependency": "authx.dependencies",
+    "LazySubject": "authx.dependencies",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
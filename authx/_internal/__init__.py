@@ -1,5 +1,10 @@
+from typing import TYPE_CHECKING, Any
+
+from authx._internal._broadcast import InvalidationChannel, UnixSocketInvalidationChannel
 from authx._internal._callback import _CallbackHandler
-from authx._internal._error import _ErrorHandler
+from authx._internal._clock import Clock, CoarseClock, FakeClock, SystemClock, get_clock, set_clock
+from authx._internal._ids import RandomIdGenerator, TimeOrderedIdGenerator, get_random_id, get_time_ordered_id
+from authx._internal._keys import Keyring, KeySet, KeySource, KeyWatcher, VerificationKey
 from authx._internal._logger import (
     get_logger,
     log_debug,
@@ -7,7 +12,13 @@ from authx._internal._logger import (
     log_info,
     set_log_level,
 )
-from authx._internal._signature import SignatureSerializer
+from authx._internal._metrics import AuthXMetrics
+from authx._internal._plan import RuntimePlan, compile_plan
+from authx._internal._server_timing import ServerTiming, ServerTimingMiddleware
+from authx._internal._snapshot import SubjectSnapshot
+from authx._internal._subject_cache import SubjectCache
+from authx._internal._timing import StageHistogram, StageHook
+from authx._internal._tracing import InMemoryTracer, RecordedSpan, Span, Tracer
 from authx._internal._utils import (
     RESERVED_CLAIMS,
     end_of_day,
@@ -16,14 +27,51 @@ from authx._internal._utils import (
     get_now_ts,
     get_uuid,
     tz_now,
-    utc,
 )
+from authx._internal._versions import MemoryVersionTable, VersionTable
+
+if TYPE_CHECKING:
+    from authx._internal._blocklist import SQLiteBlocklist
+    from authx._internal._error import _ErrorHandler
+    from authx._internal._signature import SignatureSerializer
+    from authx._internal._utils import utc
+
+# Names backed by optional or heavy imports (itsdangerous, sqlite3, pytz, fastapi),
+# loaded on first attribute access to keep `import authx` cheap
+_LAZY_IMPORTS = {
+    "SQLiteBlocklist": "authx._internal._blocklist",
+    "_ErrorHandler": "authx._internal._error",
+    "SignatureSerializer": "authx._internal._signature",
+    "utc": "authx._internal._utils",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = (
     "RESERVED_CLAIMS",
     "get_now",
     "get_now_ts",
     "get_uuid",
+    "get_random_id",
+    "RandomIdGenerator",
+    "TimeOrderedIdGenerator",
+    "get_time_ordered_id",
+    "Clock",
+    "SystemClock",
+    "CoarseClock",
+    "FakeClock",
+    "get_clock",
+    "set_clock",
     "_CallbackHandler",
     "_ErrorHandler",
     "get_logger",
@@ -36,4 +84,27 @@ __all__ = (
     "end_of_day",
     "end_of_week",
     "SignatureSerializer",
+    "SQLiteBlocklist",
+    "SubjectCache",
+    "SubjectSnapshot",
+    "StageHistogram",
+    "AuthXMetrics",
+    "ServerTiming",
+    "ServerTimingMiddleware",
+    "StageHook",
+    "Tracer",
+    "Span",
+    "InMemoryTracer",
+    "RecordedSpan",
+    "MemoryVersionTable",
+    "VersionTable",
+    "InvalidationChannel",
+    "UnixSocketInvalidationChannel",
+    "RuntimePlan",
+    "compile_plan",
+    "KeyWatcher",
+    "KeySet",
+    "Keyring",
+    "KeySource",
+    "VerificationKey",
 )
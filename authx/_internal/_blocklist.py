@@ -0,0 +1,302 @@
+import asyncio
+import datetime
+import sqlite3
+import threading
+import time
+from typing import Optional, Union
+
+from authx._internal._ids import ULID_LENGTH, is_ulid, ulid_bound
+
+# SQLite caps the number of bound parameters per statement (999 on older builds)
+_MAX_LOOKUP_PARAMS = 500
+
+
+class SQLiteBlocklist:
+    """Durable token blocklist backed by a local SQLite database.
+
+    Meant for single-host deployments that need revocations to survive a restart
+    without running Redis. The instance is itself a token callback and can be
+    registered with `AuthX.set_token_blocklist`.
+
+    Lookups issued during the same event-loop tick are grouped into a single
+    `IN (...)` query, revocations are buffered and written behind in batches,
+    and expired rows are pruned incrementally by `exp` after each write. With
+    a running event loop, queries and writes run on its default executor.
+
+    With `JWT_JTI_FORMAT="ulid"`, a whole issue time window can be revoked as a
+    single `jti` range, and rows can be pruned by issue time on the `jti` index.
+
+    Args:
+        path (str, optional): SQLite database path. Defaults to "authx_blocklist.db".
+        flush_interval (float, optional): Seconds to buffer revocations before writing. Defaults to 0.5.
+        max_pending (int, optional): Buffered revocations forcing an immediate write. Defaults to 256.
+        prune_batch (int, optional): Maximum expired rows deleted per write. Defaults to 500.
+    """
+
+    def __init__(
+        self,
+        path: str = "authx_blocklist.db",
+        flush_interval: float = 0.5,
+        max_pending: int = 256,
+        prune_batch: int = 500,
+    ) -> None:
+        """Open the database and create the blocklist table if needed."""
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.prune_batch = prune_batch
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS authx_blocklist (jti TEXT NOT NULL, exp INTEGER)")
+            self._conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_authx_blocklist_jti ON authx_blocklist (jti)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_authx_blocklist_exp ON authx_blocklist (exp)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS authx_blocklist_ranges (low TEXT NOT NULL, high TEXT NOT NULL, exp INTEGER)"
+            )
+            # Few ranges are expected, they are checked in memory before any query
+            self._ranges: list[tuple[str, str]] = []
+            self._data_version: Optional[int] = None
+            self._refresh_ranges()
+
+        self._pending_writes: dict[str, Optional[int]] = {}
+        self._pending_ranges: dict[tuple[str, str], Optional[int]] = {}
+        self._closed = False
+        self._pending_lookups: dict[str, list[asyncio.Future[bool]]] = {}
+        self._lookup_scheduled = False
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    async def __call__(self, token: str, **kwargs: object) -> bool:
+        """Token callback checking whether the token `jti` has been revoked."""
+        jti, _ = self._read_claims(token)
+        if jti is None:
+            return False
+        return await self.contains(jti)
+
+    def revoke(self, jti: str, exp: Optional[int] = None) -> None:
+        """Buffer a revocation, it is written to the database in the next batch.
+
+        Args:
+            jti (str): Unique identifier of the token to revoke
+            exp (Optional[int], optional): Token expiry as epoch seconds, used for pruning. Defaults to None.
+        """
+        with self._lock:
+            self._pending_writes[jti] = None if exp is None else int(exp)
+            pending = len(self._pending_writes)
+        self._schedule_write(immediate=pending >= self.max_pending)
+
+    def revoke_token(self, token: str) -> None:
+        """Buffer the revocation of an encoded token, using its `jti` and `exp` claims."""
+        jti, exp = self._read_claims(token)
+        if jti is None:
+            raise ValueError("Token has no 'jti' claim")
+        self.revoke(jti, exp=exp)
+
+    def revoke_issued_between(
+        self,
+        start: Union[float, datetime.datetime],
+        end: Union[float, datetime.datetime],
+        exp: Optional[int] = None,
+    ) -> None:
+        """Revoke every ULID `jti` issued from `start` included to `end` excluded.
+
+        The range applies to lookups at once and its write starts right away, off the
+        event loop when one is running. Tokens with random or UUID `jti` values are not affected.
+
+        Args:
+            start (Union[float, datetime.datetime]): Start of the issue window, as epoch seconds or datetime
+            end (Union[float, datetime.datetime]): End of the issue window, as epoch seconds or datetime
+            exp (Optional[int], optional): Epoch seconds after which every token of the window
+                has expired, used for pruning. Defaults to None.
+        """
+        low, high = ulid_bound(_epoch(start)), ulid_bound(_epoch(end))
+        with self._lock:
+            self._pending_ranges = {**self._pending_ranges, (low, high): None if exp is None else int(exp)}
+        self._schedule_write(immediate=True)
+
+    def _in_revoked_range(self, jti: str) -> bool:
+        ranges, pending = self._ranges, self._pending_ranges
+        return bool(ranges or pending) and is_ulid(jti) and any(low <= jti < high for low, high in (*ranges, *pending))
+
+    async def contains(self, jti: str) -> bool:
+        """Check whether a `jti` is revoked, batching concurrent lookups into one query."""
+        if jti in self._pending_writes or self._in_revoked_range(jti):
+            return True
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[bool] = loop.create_future()
+        self._pending_lookups.setdefault(jti, []).append(future)
+        if not self._lookup_scheduled:
+            self._lookup_scheduled = True
+            loop.call_soon(self._run_lookups)
+        return await future
+
+    def is_revoked(self, jti: str) -> bool:
+        """Synchronously check whether a `jti` is revoked."""
+        if jti in self._pending_writes or self._in_revoked_range(jti):
+            return True
+        return jti in self._query([jti])
+
+    def flush(self) -> None:
+        """Write buffered revocations and prune a batch of expired rows, blocking the caller."""
+        self._cancel_flush()
+        with self._lock:
+            self._write()
+
+    def _schedule_write(self, immediate: bool) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to write behind, persist right away
+            self.flush()
+            return
+        if immediate:
+            self._write_behind()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.flush_interval, self._write_behind)
+
+    def _write_behind(self) -> None:
+        self._cancel_flush()
+        # sqlite3 writes block, they run on the default executor instead of the event loop
+        asyncio.get_running_loop().run_in_executor(None, self._locked_write)
+
+    def _cancel_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+    def _locked_write(self) -> None:
+        with self._lock:
+            if not self._closed:
+                self._write()
+
+    def _write(self) -> None:
+        # Called with the lock held, buffered entries stay visible to lookups until committed
+        writes, ranges = self._pending_writes, self._pending_ranges
+        with self._conn:
+            if writes:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO authx_blocklist (jti, exp) VALUES (?, ?)", writes.items()
+                )
+            if ranges:
+                self._conn.executemany(
+                    "INSERT INTO authx_blocklist_ranges (low, high, exp) VALUES (?, ?, ?)",
+                    [(low, high, exp) for (low, high), exp in ranges.items()],
+                )
+            self._prune(self.prune_batch)
+        if ranges:
+            self._ranges = list(self._conn.execute("SELECT low, high FROM authx_blocklist_ranges"))
+        self._pending_writes, self._pending_ranges = {}, {}
+
+    def prune(self, limit: Optional[int] = None) -> int:
+        """Delete expired rows, oldest first.
+
+        Args:
+            limit (Optional[int], optional): Maximum rows to delete. Defaults to `prune_batch`.
+
+        Returns:
+            int: Number of deleted rows
+        """
+        with self._lock, self._conn:
+            return self._prune(self.prune_batch if limit is None else limit)
+
+    def prune_issued_before(self, timestamp: Union[float, datetime.datetime]) -> int:
+        """Delete the rows of ULID `jti` issued before `timestamp`, as a range scan of the `jti` index.
+
+        Use it with the longest token lifetime, e.g. `time.time() - refresh_expiry_seconds`,
+        for revocations recorded without `exp`.
+
+        Returns:
+            int: Number of deleted rows
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM authx_blocklist WHERE jti < ? AND length(jti) = ?",
+                (ulid_bound(_epoch(timestamp)), ULID_LENGTH),
+            )
+            return cursor.rowcount
+
+    def close(self) -> None:
+        """Flush buffered revocations and close the database.
+
+        Queries and writes already running on the executor finish first, later ones
+        find the database closed.
+        """
+        self._cancel_flush()
+        with self._lock:
+            if self._closed:
+                return
+            self._write()
+            self._closed = True
+            self._conn.close()
+
+    def _prune(self, limit: int) -> int:
+        now = int(time.time())
+        cursor = self._conn.execute(
+            "DELETE FROM authx_blocklist WHERE jti IN "
+            "(SELECT jti FROM authx_blocklist WHERE exp IS NOT NULL AND exp <= ? ORDER BY exp LIMIT ?)",
+            (now, limit),
+        )
+        if (
+            self._ranges
+            and self._conn.execute(
+                "DELETE FROM authx_blocklist_ranges WHERE exp IS NOT NULL AND exp <= ?", (now,)
+            ).rowcount
+        ):
+            self._ranges = list(self._conn.execute("SELECT low, high FROM authx_blocklist_ranges"))
+        return cursor.rowcount
+
+    def _refresh_ranges(self) -> None:
+        # `data_version` changes when another connection commits, e.g. a range revoked by another worker
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != self._data_version:
+            self._ranges = list(self._conn.execute("SELECT low, high FROM authx_blocklist_ranges"))
+            self._data_version = data_version
+
+    def _query(self, jtis: list[str]) -> set[str]:
+        found: set[str] = set()
+        with self._lock:
+            self._refresh_ranges()
+            found.update(jti for jti in jtis if self._in_revoked_range(jti))
+            for i in range(0, len(jtis), _MAX_LOOKUP_PARAMS):
+                chunk = jtis[i : i + _MAX_LOOKUP_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(f"SELECT jti FROM authx_blocklist WHERE jti IN ({placeholders})", chunk)
+                found.update(row[0] for row in rows)
+        return found
+
+    def _run_lookups(self) -> None:
+        self._lookup_scheduled = False
+        lookups, self._pending_lookups = self._pending_lookups, {}
+        # sqlite3 calls block, the query runs on the default executor instead of the event loop
+        query = asyncio.get_running_loop().run_in_executor(None, self._query, list(lookups))
+        query.add_done_callback(lambda done: self._resolve_lookups(lookups, done))
+
+    @staticmethod
+    def _resolve_lookups(lookups: dict[str, list[asyncio.Future[bool]]], query: asyncio.Future[set[str]]) -> None:
+        error = asyncio.CancelledError() if query.cancelled() else query.exception()
+        revoked = set() if error is not None else query.result()
+        for jti, futures in lookups.items():
+            for future in futures:
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(jti in revoked)
+
+    @staticmethod
+    def _read_claims(token: str) -> tuple[Optional[str], Optional[int]]:
+        import jwt
+
+        try:
+            claims = jwt.decode(token, options={"verify_signature": False})
+        except jwt.PyJWTError:
+            return None, None
+        exp = claims.get("exp")
+        return claims.get("jti"), (None if exp is None else int(exp))
+
+
+def _epoch(value: Union[float, datetime.datetime]) -> float:
+    return value.timestamp() if isinstance(value, datetime.datetime) else value
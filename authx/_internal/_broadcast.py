@@ -0,0 +1,127 @@
+import contextlib
+import glob
+import os
+import socket
+import stat
+import tempfile
+import threading
+from typing import Callable, Optional, Protocol, runtime_checkable
+
+InvalidationCallback = Callable[[str], None]
+
+
+@runtime_checkable
+class InvalidationChannel(Protocol):
+    """Interface fanning out subject invalidations to every worker."""
+
+    def publish(self, uid: str) -> None:
+        """Notify the other workers that a subject changed, the message is delivered to their callbacks as is."""
+        ...
+
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        """Register the callback run for invalidations published by other workers."""
+        ...
+
+    def close(self) -> None:
+        """Stop listening and release the channel resources."""
+        ...
+
+
+def _uid() -> int:
+    return os.getuid() if hasattr(os, "getuid") else 0
+
+
+def _check_private_directory(directory: str) -> None:
+    if not hasattr(os, "getuid"):  # pragma: no cover
+        return
+    status = os.stat(directory)
+    if status.st_uid != os.getuid() or stat.S_IMODE(status.st_mode) & 0o077:
+        raise PermissionError(
+            f"Invalidation directory {directory!r} must be owned by the current user and closed to group and others"
+        )
+
+
+class UnixSocketInvalidationChannel:
+    """Invalidation channel between the workers of a host, over Unix datagram sockets.
+
+    Each worker binds a socket named after its PID in a shared directory, and
+    publishing sends one datagram per peer socket found there. Sockets left
+    behind by dead workers are removed on the first failed delivery. Requires
+    a platform supporting `AF_UNIX` datagram sockets.
+
+    Any process able to write to the directory can send messages, including
+    version bumps that revoke tokens. The directory is created with mode `0o700`
+    and refused unless it is owned by the current user and closed to group and
+    others.
+
+    Args:
+        directory (Optional[str], optional): Directory shared by the workers.
+            Defaults to `authx-invalidation-<uid>` in the system temporary directory.
+        name (str, optional): Channel name, workers only talk to peers with the same name. Defaults to "authx".
+        poll_interval (float, optional): Seconds between checks for a closed channel. Defaults to 0.5.
+    """
+
+    def __init__(self, directory: Optional[str] = None, name: str = "authx", poll_interval: float = 0.5) -> None:
+        """Bind the worker socket in the shared directory.
+
+        Raises:
+            PermissionError: If the directory is not private to the current user
+        """
+        self.directory = directory or os.path.join(tempfile.gettempdir(), f"authx-invalidation-{_uid()}")
+        self.name = name
+        os.makedirs(self.directory, mode=0o700, exist_ok=True)
+        _check_private_directory(self.directory)
+        self.path = os.path.join(self.directory, f"{name}-{os.getpid()}-{id(self):x}.sock")
+
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(self.path)
+        self._sock.settimeout(poll_interval)
+        self._callbacks: list[InvalidationCallback] = []
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, uid: str) -> None:
+        """Send the subject identifier to every peer socket."""
+        message = uid.encode()
+        for peer in glob.glob(os.path.join(glob.escape(self.directory), f"{glob.escape(self.name)}-*.sock")):
+            if peer == self.path:
+                continue
+            try:
+                self._sock.sendto(message, peer)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # The worker owning this socket is gone
+                with contextlib.suppress(OSError):
+                    os.unlink(peer)
+            except OSError:
+                # A full receive buffer must not fail the publishing request
+                continue
+
+    def subscribe(self, callback: InvalidationCallback) -> None:
+        """Register a callback and start the listener thread on first subscription."""
+        self._callbacks.append(callback)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._listen, name=f"{self.name}-invalidation", daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the listener thread and remove the worker socket."""
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._sock.close()
+        with contextlib.suppress(OSError):
+            os.unlink(self.path)
+
+    def _listen(self) -> None:
+        while not self._closed.is_set():
+            try:
+                message = self._sock.recv(4096)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            uid = message.decode(errors="replace")
+            for callback in self._callbacks:
+                # A failing callback must not stop the listener
+                with contextlib.suppress(Exception):
+                    callback(uid)
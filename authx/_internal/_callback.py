@@ -5,10 +5,20 @@ if sys.version_info >= (3, 10):  # pragma: no cover
 else:
     from typing_extensions import ParamSpecKwargs  # pragma: no cover
 
-from typing import Generic, Optional
+import asyncio
+import inspect
+from collections.abc import Awaitable
+from typing import Any, Generic, Optional, Union
 
+from authx._internal._broadcast import InvalidationChannel
+from authx._internal._snapshot import SubjectSnapshot
+from authx._internal._subject_cache import SubjectCache
+from authx._internal._versions import VersionTable
 from authx.types import ModelCallback, T, TokenCallback
 
+# Prefix of channel messages carrying a version bump, `<prefix><version>:<uid>`
+_VERSION_MESSAGE = "\x00ver:"
+
 
 class _CallbackHandler(Generic[T]):
     """Base class for callback handlers in AuthX.
@@ -29,6 +39,11 @@ class _CallbackHandler(Generic[T]):
         self._model: Optional[T] = model
         self.callback_get_model_instance: Optional[ModelCallback[T]] = None
         self.callback_is_token_in_blocklist: Optional[TokenCallback] = None
+        self._subject_cache: Optional[SubjectCache[T]] = None
+        self._subject_getter_in_threadpool: bool = False
+        self._subject_snapshot: Optional[SubjectSnapshot[T]] = None
+        self._token_versions: Optional[VersionTable] = None
+        self._invalidation_channel: Optional[InvalidationChannel] = None
 
         # Exceptions
         self._callback_model_set_exception = AttributeError(
@@ -64,32 +79,191 @@ class _CallbackHandler(Generic[T]):
             raise self._callback_token_set_exception
         return False
 
-    def set_callback_get_model_instance(self, callback: ModelCallback[T]) -> None:
-        """Set callback for model instance."""
+    def set_callback_get_model_instance(self, callback: ModelCallback[T], run_in_threadpool: bool = False) -> None:
+        """Set callback for model instance.
+
+        Args:
+            callback (ModelCallback[T]): Sync or async callable returning the model instance
+            run_in_threadpool (bool, optional): Run a sync callback in a worker thread
+                so it does not block the event loop. Defaults to False.
+        """
         self.callback_get_model_instance = callback
+        self._subject_getter_in_threadpool = run_in_threadpool
 
     def set_callback_token_blocklist(self, callback: TokenCallback) -> None:
         """Set callback for token."""
         self.callback_is_token_in_blocklist = callback
 
-    def set_subject_getter(self, callback: ModelCallback[T]) -> None:
+    def set_subject_getter(self, callback: ModelCallback[T], run_in_threadpool: bool = False) -> None:
         """Set the callback to run for subject retrieval and serialization."""
-        self.set_callback_get_model_instance(callback)
+        self.set_callback_get_model_instance(callback, run_in_threadpool=run_in_threadpool)
 
     def set_token_blocklist(self, callback: TokenCallback) -> None:
         """Set the callback to run for validation of revoked tokens."""
         self.set_callback_token_blocklist(callback)
 
-    def _get_current_subject(self, uid: str, **kwargs: ParamSpecKwargs) -> Optional[T]:
-        """Get current model instance from callback."""
+    @property
+    def subject_cache(self) -> Optional[SubjectCache[T]]:
+        """Subject cache used by `get_current_subject`, if any."""
+        return self._subject_cache
+
+    def set_subject_cache(self, cache: Optional[SubjectCache[T]]) -> None:
+        """Set the cache for subjects returned by the subject getter, `None` disables caching."""
+        self._subject_cache = cache
+
+    @property
+    def subject_snapshot(self) -> Optional[SubjectSnapshot[T]]:
+        """Subject snapshot embedded in access tokens, if any."""
+        return self._subject_snapshot
+
+    def set_subject_snapshot(self, snapshot: Optional[SubjectSnapshot[T]]) -> None:
+        """Set the subject snapshot embedded in access tokens, `None` disables snapshots."""
+        self._subject_snapshot = snapshot
+
+    def set_invalidation_channel(self, channel: Optional[InvalidationChannel]) -> None:
+        """Set the channel broadcasting `invalidate_subject` and `bump_subject_version` calls to the other workers."""
+        self._invalidation_channel = channel
+        if channel is not None:
+            channel.subscribe(self._on_invalidation)
+
+    def _on_invalidation(self, message: str) -> None:
+        if not message.startswith(_VERSION_MESSAGE):
+            self._invalidate_cached_subject(message)
+            return
+        version, _, uid = message[len(_VERSION_MESSAGE) :].partition(":")
+        self._apply_subject_version(uid, int(version))
+        self._invalidate_cached_subject(uid)
+
+    def _apply_subject_version(self, uid: str, version: int) -> None:
+        # Shared tables already hold the bump, local ones expose `set` to receive it
+        set_version = getattr(self._token_versions, "set", None)
+        if set_version is not None and version > self._token_versions.get(uid):  # type: ignore[union-attr]
+            set_version(uid, version)
+
+    def invalidate_subject(self, uid: str) -> None:
+        """Drop a subject from the subject cache, on every worker when an invalidation channel is set."""
+        self._invalidate_cached_subject(uid)
+        if self._invalidation_channel is not None:
+            self._invalidation_channel.publish(uid)
+
+    def _invalidate_cached_subject(self, uid: str) -> None:
+        if self._subject_cache is not None:
+            self._subject_cache.invalidate(uid)
+
+    @property
+    def token_versions(self) -> Optional[VersionTable]:
+        """Per-subject token version table, if any."""
+        return self._token_versions
+
+    def set_token_versions(self, table: Optional[VersionTable]) -> None:
+        """Set the table used to stamp and check the `ver` claim, `None` disables version checks."""
+        self._token_versions = table
+
+    def bump_subject_version(self, uid: str) -> int:
+        """Invalidate every token minted for a subject along with its cached subject.
+
+        With an invalidation channel, the new version is published to the other
+        workers, which apply it to their table if it has a `set(uid, version)` method.
+
+        Args:
+            uid (str): Subject identifier
+
+        Raises:
+            AttributeError: If no token version table is set
+
+        Returns:
+            int: The new subject version
+        """
+        if self._token_versions is None:
+            raise AttributeError(f"Token version table not set for {self._model.__class__.__name__} instance")
+        version = self._token_versions.bump(uid)
+        self._invalidate_cached_subject(uid)
+        if self._invalidation_channel is not None:
+            self._invalidation_channel.publish(f"{_VERSION_MESSAGE}{version}:{uid}")
+        return version
+
+    def _is_token_version_current(self, uid: str, version: Any) -> bool:
+        """Check a token `ver` claim against the subject version, always True without a version table.
+
+        Only tokens older than the known version are rejected. The claim of a
+        verified token is signed, a newer version is adopted by tables with a
+        `set(uid, version)` method, so a worker that started after a bump, or
+        missed its broadcast, learns it from the first token carrying it.
+        """
+        if self._token_versions is None:
+            return True
+        version = version or 0
+        current = self._token_versions.get(uid)
+        if version > current:
+            self._apply_subject_version(uid, version)
+        return version >= current
+
+    def _get_current_subject(self, uid: str, **kwargs: ParamSpecKwargs) -> Union[Optional[T], Awaitable[Optional[T]]]:
+        """Get current model instance from callback, async callbacks return an awaitable."""
         self._check_model_callback_is_set()
         callback: Optional[ModelCallback[T]] = self.callback_get_model_instance
         return callback(uid, **kwargs) if callback is not None else None  # type: ignore
 
+    def _fetch_current_subject(self, uid: str) -> Union[Optional[T], Awaitable[Optional[T]]]:
+        """Call the model callback, offloading sync callbacks to a thread when enabled."""
+        callback = self.callback_get_model_instance
+        if self._subject_getter_in_threadpool and not _is_async_callable(callback):
+            return self._fetch_current_subject_in_thread(uid)
+        return self._get_current_subject(uid)
+
+    async def _fetch_current_subject_in_thread(self, uid: str) -> Optional[T]:
+        subject = await asyncio.to_thread(self._get_current_subject, uid)
+        # A sync callback may still return an awaitable, e.g. a lambda calling a coroutine function
+        if inspect.isawaitable(subject):
+            return await subject
+        return subject
+
+    async def _load_current_subject(self, uid: str, snapshot: Any = None) -> Optional[T]:
+        """Get current model instance, awaiting async callbacks and going through the subject cache when set.
+
+        A usable token snapshot claim is rebuilt into the model instance without calling the callback.
+        """
+        if snapshot is not None and self._subject_snapshot is not None:
+            usable, snapshot_subject = self._subject_snapshot.load(uid, snapshot)
+            if usable:
+                return snapshot_subject
+        self._check_model_callback_is_set()
+        if self._subject_cache is not None:
+            return await self._subject_cache.get_or_load(uid, self._fetch_current_subject)
+        subject = self._fetch_current_subject(uid)
+        if inspect.isawaitable(subject):
+            return await subject
+        return subject
+
     def is_token_in_blocklist(self, token: Optional[str], **kwargs: ParamSpecKwargs) -> bool:
-        """Check if token is in blocklist."""
+        """Check if token is in blocklist.
+
+        Raises:
+            TypeError: If the blocklist callback is asynchronous, use `is_token_revoked` instead
+        """
+        result = self._call_token_blocklist(token, **kwargs)
+        if inspect.isawaitable(result):
+            if inspect.iscoroutine(result):
+                result.close()
+            raise TypeError("The token blocklist callback is asynchronous, use `await is_token_revoked(token)`")
+        return result
+
+    async def is_token_revoked(self, token: Optional[str], **kwargs: ParamSpecKwargs) -> bool:
+        """Check if token is in blocklist, awaiting asynchronous blocklist callbacks."""
+        if not _is_async_callable(self.callback_is_token_in_blocklist):
+            return self.is_token_in_blocklist(token, **kwargs)
+        result = self._call_token_blocklist(token, **kwargs)
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
+    def _call_token_blocklist(self, token: Optional[str], **kwargs: ParamSpecKwargs) -> Union[bool, Awaitable[bool]]:
         if self._check_token_callback_is_set(ignore_errors=True):
             callback: Optional[TokenCallback] = self.callback_is_token_in_blocklist
             if callback is not None and token is not None:
                 return callback(token, **kwargs)  # type: ignore
         return False
+
+
+def _is_async_callable(callback: object) -> bool:
+    return inspect.iscoroutinefunction(callback) or inspect.iscoroutinefunction(type(callback).__call__)
@@ -0,0 +1,110 @@
+import datetime
+import time
+from typing import Callable, Optional, Protocol, runtime_checkable
+
+
+@runtime_checkable
+class Clock(Protocol):
+    """Source of the current time for token timestamps."""
+
+    def time(self) -> float:
+        """Return the current time in seconds since the epoch."""
+        ...
+
+
+class SystemClock:
+    """Clock reading the system time on every call."""
+
+    def time(self) -> float:
+        """Return `time.time()`."""
+        return time.time()
+
+
+class CoarseClock:
+    """Clock caching the epoch seconds for `resolution` seconds.
+
+    The epoch time is derived from a monotonic timer anchored on the system time.
+    The anchor is moved forward on refresh when the system time has run ahead of
+    the timer, never back, so the clock never goes backwards with system clock
+    adjustments. Token claims built from it may lag the system time by up to
+    `resolution` seconds, `decode_token` accepts `iat` and `nbf` within that leeway.
+
+    Args:
+        resolution (float, optional): Seconds a reading is reused for. Defaults to 1.0.
+        timer (Callable[[], float], optional): Monotonic time source. Defaults to time.monotonic.
+    """
+
+    def __init__(self, resolution: float = 1.0, timer: Callable[[], float] = time.monotonic) -> None:
+        """Anchor the monotonic timer on the system time."""
+        if resolution < 0:
+            raise ValueError("resolution must be positive")
+        self.resolution = resolution
+        self._timer = timer
+        self._offset = time.time() - timer()
+        # Monotonic time of the next refresh, and the cached epoch seconds
+        self._state = (float("-inf"), 0.0)
+
+    def time(self) -> float:
+        """Return the cached epoch seconds, refreshed once per `resolution`."""
+        monotonic = self._timer()
+        refresh_at, value = self._state
+        if monotonic < refresh_at:
+            return value
+        self._offset = max(self._offset, time.time() - monotonic)
+        value = self._offset + monotonic
+        self._state = (monotonic + self.resolution, value)
+        return value
+
+
+class FakeClock:
+    """Clock returning a settable time, for tests.
+
+    Args:
+        start (float, optional): Initial epoch seconds. Defaults to the current system time.
+    """
+
+    def __init__(self, start: Optional[float] = None) -> None:
+        """Initialize the clock at `start`."""
+        self._now = time.time() if start is None else start
+
+    def time(self) -> float:
+        """Return the current fake time."""
+        return self._now
+
+    def set(self, timestamp: float) -> None:
+        """Move the clock to `timestamp` epoch seconds."""
+        self._now = timestamp
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward by `seconds`."""
+        self._now += seconds
+
+
+_clock: Clock = SystemClock()
+
+
+def get_clock() -> Clock:
+    """Return the clock used for token timestamps."""
+    return _clock
+
+
+def set_clock(clock: Clock) -> Clock:
+    """Set the clock used for token timestamps, and return the previous one."""
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+
+def leeway() -> float:
+    """Seconds the configured clock may lag the system time, its `resolution` if it has one."""
+    return float(getattr(_clock, "resolution", 0.0))
+
+
+def now_ts() -> float:
+    """Current epoch seconds from the configured clock."""
+    return _clock.time()
+
+
+def now() -> datetime.datetime:
+    """Current UTC datetime from the configured clock."""
+    return datetime.datetime.fromtimestamp(_clock.time(), tz=datetime.timezone.utc)
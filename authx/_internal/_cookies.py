@@ -0,0 +1,132 @@
+import http.cookies
+import re
+from typing import Any, NamedTuple, Optional
+
+from authx.config import AuthXConfig
+from authx.types import SameSitePolicy
+
+# Values left unquoted by `http.cookies`, JWTs and AuthX CSRF values always are
+_LEGAL_VALUE = re.compile(r"[\w!#$%&'*+\-.^`|~:]+", re.ASCII)
+_PLACEHOLDER = "x"
+
+Header = tuple[bytes, bytes]
+
+
+class CookieTemplate:
+    """`Set-Cookie` header with its attributes rendered once, only the value changes per response.
+
+    Headers are rendered by `http.cookies.SimpleCookie`, exactly like Starlette's
+    `Response.set_cookie`. Values needing quotes go through `SimpleCookie` again.
+
+    Args:
+        key (str): Cookie name
+        path (Optional[str], optional): Path attribute. Defaults to "/".
+        domain (Optional[str], optional): Domain attribute. Defaults to None.
+        samesite (Optional[SameSitePolicy], optional): SameSite attribute. Defaults to "lax".
+        secure (bool, optional): Secure attribute. Defaults to False.
+        httponly (bool, optional): HttpOnly attribute. Defaults to False.
+        max_age (Optional[int], optional): Max-Age attribute. Defaults to None.
+    """
+
+    __slots__ = ("_attributes", "_prefix", "_suffix", "key")
+
+    def __init__(
+        self,
+        key: str,
+        path: Optional[str] = "/",
+        domain: Optional[str] = None,
+        samesite: Optional[SameSitePolicy] = "lax",
+        secure: bool = False,
+        httponly: bool = False,
+        max_age: Optional[int] = None,
+    ) -> None:
+        """Render the cookie attributes."""
+        self.key = key
+        attributes: dict[str, object] = {}
+        if max_age is not None:
+            attributes["max-age"] = max_age
+        if path is not None:
+            attributes["path"] = path
+        if domain is not None:
+            attributes["domain"] = domain
+        if secure:
+            attributes["secure"] = True
+        if httponly:
+            attributes["httponly"] = True
+        if samesite is not None:
+            attributes["samesite"] = samesite
+        self._attributes = attributes
+        rendered = self._render(_PLACEHOLDER)
+        self._prefix = f"{key}="
+        self._suffix = rendered[len(self._prefix) + len(_PLACEHOLDER) :]
+
+    def header(self, value: str) -> Header:
+        """`Set-Cookie` header setting the cookie to `value`."""
+        if _LEGAL_VALUE.fullmatch(value) is None:
+            return b"set-cookie", self._render(value).encode("latin-1")
+        return b"set-cookie", f"{self._prefix}{value}{self._suffix}".encode("latin-1")
+
+    def _render(self, value: str, **attributes: object) -> str:
+        cookie: http.cookies.SimpleCookie = http.cookies.SimpleCookie()
+        cookie[self.key] = value
+        for name, attribute in {**self._attributes, **attributes}.items():
+            cookie[self.key][name] = attribute
+        return cookie.output(header="").strip()
+
+
+class CookieTemplates(NamedTuple):
+    """Headers setting and deleting the token and CSRF cookies of a token type."""
+
+    token: CookieTemplate
+    csrf: Optional[CookieTemplate]
+    token_deletion: Header
+    csrf_deletion: Optional[Header]
+
+
+def deletion_header(key: str, path: str = "/", domain: Optional[str] = None) -> Header:
+    """`Set-Cookie` header expiring a cookie, as rendered by Starlette's `Response.delete_cookie`.
+
+    The `expires` attribute is the render time, any past date deletes the cookie.
+    """
+    template = CookieTemplate(key, path=path, domain=domain)
+    return b"set-cookie", template._render("", **{"max-age": 0, "expires": 0}).encode("latin-1")
+
+
+def build_cookie_templates(config: AuthXConfig, type: str, max_age: Optional[int] = None) -> CookieTemplates:
+    """Token and CSRF cookie templates and deletion headers of a token type.
+
+    Args:
+        config (AuthXConfig): Configuration the cookies are rendered from
+        type (str): Token type, "access" or "refresh"
+        max_age (Optional[int], optional): Max-Age attribute. Defaults to `JWT_COOKIE_MAX_AGE`.
+
+    Raises:
+        ValueError: If the token type is neither "access" nor "refresh"
+    """
+    if type == "access":
+        token_key = config.JWT_ACCESS_COOKIE_NAME
+        token_path = config.JWT_ACCESS_COOKIE_PATH
+        csrf_key = config.JWT_ACCESS_CSRF_COOKIE_NAME
+        csrf_path = config.JWT_ACCESS_CSRF_COOKIE_PATH
+    elif type == "refresh":
+        token_key = config.JWT_REFRESH_COOKIE_NAME
+        token_path = config.JWT_REFRESH_COOKIE_PATH
+        csrf_key = config.JWT_REFRESH_CSRF_COOKIE_NAME
+        csrf_path = config.JWT_REFRESH_CSRF_COOKIE_PATH
+    else:
+        raise ValueError("Token type must be 'access' | 'refresh'")
+
+    attributes: dict[str, Any] = {
+        "domain": config.JWT_COOKIE_DOMAIN,
+        "samesite": config.JWT_COOKIE_SAMESITE,
+        "secure": config.JWT_COOKIE_SECURE,
+        "max_age": max_age or config.JWT_COOKIE_MAX_AGE,
+    }
+    token_template = CookieTemplate(token_key, path=token_path, httponly=True, **attributes)
+    token_deletion = deletion_header(token_key, path=token_path, domain=config.JWT_COOKIE_DOMAIN)
+    csrf_template: Optional[CookieTemplate] = None
+    csrf_deletion: Optional[Header] = None
+    if config.JWT_COOKIE_CSRF_PROTECT and config.JWT_CSRF_IN_COOKIES:
+        csrf_template = CookieTemplate(csrf_key, path=csrf_path, httponly=False, **attributes)
+        csrf_deletion = deletion_header(csrf_key, path=csrf_path, domain=config.JWT_COOKIE_DOMAIN)
+    return CookieTemplates(token_template, csrf_template, token_deletion, csrf_deletion)
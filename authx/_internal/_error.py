@@ -1,10 +1,12 @@
 from typing import Optional
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 from authx import exceptions
 
+RenderedResponse = bytes
+
 
 class _ErrorHandler:
     """Base Handler for FastAPI handling AuthX exceptions."""
@@ -52,15 +54,56 @@ class _ErrorHandler:
             },
         )
 
+    def _render_error_response(
+        self,
+        exception: type[Exception],
+        status_code: int,
+        message: Optional[str],
+    ) -> Optional[RenderedResponse]:
+        """Render the JSON body of the error response for an exception class.
+
+        Returns:
+            Optional[RenderedResponse]: The rendered body, None when the message depends on the exception instance.
+        """
+        if message is None:
+            message = getattr(self, f"MSG_{exception.__name__}", None)
+            if message is None:
+                return None
+        response = JSONResponse(
+            status_code=status_code,
+            content={
+                "message": message,
+                "error_type": exception.__name__,
+            },
+        )
+        return bytes(response.body)
+
     def _set_app_exception_handler(
         self,
         app: FastAPI,
         exception: type[exceptions.AuthXException],
         status_code: int,
         message: Optional[str],
+        message_attr: Optional[str] = None,
     ) -> None:
-        async def exception_handler_wrapper(request: Request, exc: exceptions.AuthXException) -> JSONResponse:
-            return await self._error_handler(request, exc, status_code, message)
+        # The message is resolved on each error, so `MSG_*` overrides assigned after
+        # `handle_errors` apply. Bodies are rendered once per exception class and
+        # rendered again only when its message changes.
+        rendered: dict[type[Exception], tuple[Optional[str], Optional[RenderedResponse]]] = {}
+
+        async def exception_handler_wrapper(request: Request, exc: exceptions.AuthXException) -> Response:
+            exc_class = exc.__class__
+            current = message
+            if current is None:
+                current = getattr(self, message_attr or f"MSG_{exc_class.__name__}", None)
+            cached = rendered.get(exc_class)
+            if cached is None or cached[0] != current:
+                body = None if current is None else self._render_error_response(exc_class, status_code, current)
+                cached = rendered[exc_class] = (current, body)
+            response = cached[1]
+            if response is None:
+                return await self._error_handler(request, exc, status_code, current)
+            return Response(content=response, status_code=status_code, media_type="application/json")
 
         # Add the exception handler to the FastAPI application
         # The exception handler will be called when the specified exception is raised, and the status code and message will be returned
@@ -78,53 +121,62 @@ class _ErrorHandler:
             app,
             exception=exceptions.MissingTokenError,
             status_code=401,
-            message=self.MSG_TokenError,
+            message=None,
+            message_attr="MSG_TokenError",
         )
         self._set_app_exception_handler(
             app,
             exception=exceptions.MissingCSRFTokenError,
             status_code=401,
-            message=self.MSG_MissingCSRFTokenError,
+            message=None,
+            message_attr="MSG_MissingCSRFTokenError",
         )
         self._set_app_exception_handler(
             app,
             exception=exceptions.TokenTypeError,
             status_code=401,
-            message=self.MSG_TokenTypeError,
+            message=None,
+            message_attr="MSG_TokenTypeError",
         )
         self._set_app_exception_handler(
             app,
             exception=exceptions.RevokedTokenError,
             status_code=401,
-            message=self.MSG_RevokedTokenError,
+            message=None,
+            message_attr="MSG_RevokedTokenError",
         )
         self._set_app_exception_handler(
             app,
             exception=exceptions.TokenRequiredError,
             status_code=401,
-            message=self.MSG_TokenRequiredError,
+            message=None,
+            message_attr="MSG_TokenRequiredError",
         )
         self._set_app_exception_handler(
             app,
             exception=exceptions.FreshTokenRequiredError,
             status_code=401,
-            message=self.MSG_FreshTokenRequiredError,
+            message=None,
+            message_attr="MSG_FreshTokenRequiredError",
         )
         self._set_app_exception_handler(
             app,
             exception=exceptions.AccessTokenRequiredError,
             status_code=401,
-            message=self.MSG_AccessTokenRequiredError,
+            message=None,
+            message_attr="MSG_AccessTokenRequiredError",
         )
         self._set_app_exception_handler(
             app,
             exception=exceptions.RefreshTokenRequiredError,
             status_code=401,
-            message=self.MSG_RefreshTokenRequiredError,
+            message=None,
+            message_attr="MSG_RefreshTokenRequiredError",
         )
         self._set_app_exception_handler(
             app,
             exception=exceptions.CSRFError,
             status_code=401,
-            message=self.MSG_CSRFError,
+            message=None,
+            message_attr="MSG_CSRFError",
         )
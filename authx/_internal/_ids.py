@@ -0,0 +1,150 @@
+import base64
+import os
+import re
+import threading
+import weakref
+from typing import Optional, Union
+
+from authx._internal._clock import now_ts
+
+# Crockford base32 digits in ascending order, in place of the RFC 4648 alphabet
+_CROCKFORD = bytes.maketrans(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ234567", b"0123456789ABCDEFGHJKMNPQRSTVWXYZ")
+_CROCKFORD_VALUES = {char: value for value, char in enumerate("0123456789ABCDEFGHJKMNPQRSTVWXYZ")}
+_ULID_PATTERN = re.compile(r"[0-7][0-9A-HJKMNP-TV-Z]{25}")
+ULID_LENGTH = 26
+# Random bits after the 48 bits timestamp
+_ULID_RANDOM_BYTES = 10
+
+# 18 random bytes encode to 24 URL-safe base64 characters without padding, 144 bits of entropy
+ID_BYTES = 18
+_ID_CHARS = ID_BYTES * 4 // 3
+
+# Generators holding per-thread buffers, reset in forked children
+_generators: "weakref.WeakSet[Union[RandomIdGenerator, TimeOrderedIdGenerator]]" = weakref.WeakSet()
+
+
+class RandomIdGenerator:
+    """Random identifier generator for `jti` and CSRF claims.
+
+    Random bytes are read from `os.urandom` for `batch` identifiers at once and
+    encoded in one pass, each call then slices the next identifier off the
+    encoded buffer. Identifiers carry 144 random bits, more than the 122 bits
+    of a random UUID, in 24 URL-safe characters.
+
+    Every thread draws from its own buffer, and buffers are dropped in forked
+    children so they never hand out the identifiers of their parent.
+
+    Args:
+        batch (int, optional): Identifiers generated per `os.urandom` call. Defaults to 256.
+    """
+
+    def __init__(self, batch: int = 256) -> None:
+        """Initialize the generator, the first buffer is filled on first use."""
+        if batch < 1:
+            raise ValueError("batch must be at least 1")
+        self.batch = batch
+        self._local = threading.local()
+        _generators.add(self)
+
+    def __call__(self) -> str:
+        """Return a new identifier."""
+        local = self._local
+        try:
+            buffer: str = local.buffer
+            position: int = local.position
+        except AttributeError:
+            buffer, position = "", 0
+        if position >= len(buffer):
+            buffer = base64.urlsafe_b64encode(os.urandom(ID_BYTES * self.batch)).decode("ascii")
+            local.buffer = buffer
+            position = 0
+        local.position = position + _ID_CHARS
+        return buffer[position : position + _ID_CHARS]
+
+    def _reset(self) -> None:
+        self._local = threading.local()
+
+
+class TimeOrderedIdGenerator:
+    """ULID generator for `jti` claims that sort by issue time.
+
+    Identifiers are 26 Crockford base32 characters, a 48 bits millisecond
+    timestamp read from the AuthX clock followed by 80 random bits, so their
+    lexicographic order follows the issue time at millisecond resolution.
+    Blocklists can then revoke or prune a time window as a key range.
+
+    Random bytes are read from `os.urandom` for `batch` identifiers at once,
+    every thread draws from its own buffer, dropped in forked children.
+
+    Args:
+        batch (int, optional): Identifiers generated per `os.urandom` call. Defaults to 256.
+    """
+
+    def __init__(self, batch: int = 256) -> None:
+        """Initialize the generator, the first buffer is filled on first use."""
+        if batch < 1:
+            raise ValueError("batch must be at least 1")
+        self.batch = batch
+        self._local = threading.local()
+        _generators.add(self)
+
+    def __call__(self) -> str:
+        """Return a new identifier for the current time."""
+        local = self._local
+        try:
+            buffer: bytes = local.buffer
+            position: int = local.position
+        except AttributeError:
+            buffer, position = b"", 0
+        if position >= len(buffer):
+            buffer = os.urandom(_ULID_RANDOM_BYTES * self.batch)
+            local.buffer = buffer
+            position = 0
+        local.position = position + _ULID_RANDOM_BYTES
+        randomness = int.from_bytes(buffer[position : position + _ULID_RANDOM_BYTES], "big")
+        return _encode_ulid((int(now_ts() * 1000) << 80) | randomness)
+
+    def _reset(self) -> None:
+        self._local = threading.local()
+
+
+def _encode_ulid(value: int) -> str:
+    # 26 base32 characters hold 130 bits, the 128 bits value is shifted so the
+    # first character carries the 2 leading zero bits, and the tail is dropped
+    encoded = base64.b32encode((value << 6).to_bytes(17, "big"))[:ULID_LENGTH]
+    return encoded.translate(_CROCKFORD).decode("ascii")
+
+
+def ulid_bound(timestamp: float) -> str:
+    """Smallest ULID issued at `timestamp` epoch seconds, ULIDs from that time on compare greater or equal."""
+    return _encode_ulid(int(timestamp * 1000) << 80)
+
+
+def is_ulid(jti: str) -> bool:
+    """Whether `jti` is a ULID, as opposed to a random or UUID identifier."""
+    return len(jti) == ULID_LENGTH and _ULID_PATTERN.fullmatch(jti) is not None
+
+
+def ulid_timestamp(jti: str) -> Optional[float]:
+    """Issue time of a ULID in epoch seconds, None for other identifiers."""
+    if not is_ulid(jti):
+        return None
+    milliseconds = 0
+    for char in jti[:10]:
+        milliseconds = milliseconds * 32 + _CROCKFORD_VALUES[char]
+    return milliseconds / 1000
+
+
+def _reset_after_fork() -> None:
+    for generator in list(_generators):
+        generator._reset()
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+get_random_id = RandomIdGenerator()
+"""Default generator for `jti` and CSRF values."""
+
+get_time_ordered_id = TimeOrderedIdGenerator()
+"""Default generator for `jti` values when `JWT_JTI_FORMAT` is "ulid"."""
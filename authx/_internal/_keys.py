@@ -0,0 +1,351 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, NamedTuple, Optional, Protocol, cast, runtime_checkable
+
+from authx._internal._clock import now_ts
+from authx._internal._logger import log_error, log_info
+from authx.exceptions import JWTDecodeError
+from authx.types import AlgorithmType
+
+# JWK key types usable with each algorithm family
+_KEY_TYPES = {"HS": "oct", "RS": "RSA", "PS": "RSA", "ES": "EC", "Ed": "OKP"}
+# JWK members hashed by RFC 7638 thumbprints, per key type
+_THUMBPRINT_MEMBERS = {"oct": ("k",), "RSA": ("e", "n"), "EC": ("crv", "x", "y"), "OKP": ("crv", "x")}
+
+
+class VerificationKey(NamedTuple):
+    """Key verifying the tokens whose `kid` header is `kid`, signed with `algorithm` only.
+
+    `retire_at` is the epoch seconds a key replaced by a reload stops being accepted at.
+    """
+
+    kid: str
+    algorithm: AlgorithmType
+    key: Any
+    retire_at: Optional[float] = None
+
+
+class KeySet(NamedTuple):
+    """Keys of a `Keyring` or `KeyWatcher`, replaced as a whole on every change.
+
+    Verification keys are indexed by `kid`, current keys first, then replaced
+    keys in their grace window. Tokens are signed with `signing_key` and
+    `signing_algorithm`, and stamped with `signing_kid`.
+    """
+
+    signing_key: Optional[Any] = None
+    signing_kid: Optional[str] = None
+    signing_algorithm: Optional[AlgorithmType] = None
+    keys: Mapping[str, VerificationKey] = MappingProxyType({})
+
+    def select(self, token: str, algorithms: frozenset[str], allow_missing_kid: bool = False) -> VerificationKey:
+        """Key to verify `token` with, among the keys of an allowed algorithm.
+
+        Tokens with a `kid` header get the key indexed under it. Tokens without
+        one get the current signing key when `allow_missing_kid` is set, and are
+        rejected otherwise.
+
+        Raises:
+            JWTDecodeError: If the token header cannot be read, or no allowed key has its `kid`
+        """
+        kid = _unverified_kid(token)
+        if kid is None:
+            if not allow_missing_kid:
+                raise JWTDecodeError("Token has no key id")
+            kid = self.signing_kid
+        key = self.keys.get(kid) if kid is not None else None
+        if key is None or key.algorithm not in algorithms or not _active(key, None):
+            raise JWTDecodeError("Unknown key id")
+        return key
+
+
+@runtime_checkable
+class KeySource(Protocol):
+    """Provider of the keys AuthX signs and verifies tokens with, see `AuthXCore.set_keyring`."""
+
+    @property
+    def keys(self) -> KeySet:
+        """Current key set, read once per token."""
+        ...
+
+
+class Keyring:
+    """Signing and verification keys held in memory, indexed by `kid`.
+
+    Every key is bound to one algorithm. Tokens minted with the keyring carry the
+    `kid` of the signing key, verification picks the key and algorithm from the
+    token header with a single lookup, whatever the number of keys. Changes build
+    a new `KeySet` swapped in one assignment.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty keyring."""
+        self._keys = KeySet()
+        self._lock = threading.Lock()
+
+    @property
+    def keys(self) -> KeySet:
+        """Current key set."""
+        return self._keys
+
+    def add(self, key: Any, algorithm: AlgorithmType, kid: Optional[str] = None, signing: bool = False) -> str:
+        """Add a key, or replace the key with the same `kid`.
+
+        Args:
+            key (Any): PEM string, HMAC secret or key object. Private keys verify with their public part.
+            algorithm (AlgorithmType): Algorithm the key signs or verifies with
+            kid (Optional[str], optional): Key identifier. Defaults to the RFC 7638 thumbprint of the key.
+            signing (bool, optional): Sign new tokens with this key. Defaults to False.
+
+        Returns:
+            str: Key identifier
+        """
+        prepared = _prepare(algorithm, key)
+        public = _public(prepared)
+        kid = kid or _thumbprint(_jwk(algorithm, public))
+        with self._lock:
+            keys = self._keys
+            if signing:
+                keys = keys._replace(signing_key=prepared, signing_kid=kid, signing_algorithm=algorithm)
+            verification = {**keys.keys, kid: VerificationKey(kid, algorithm, public)}
+            self._keys = keys._replace(keys=MappingProxyType(verification))
+        return kid
+
+    def remove(self, kid: str) -> None:
+        """Remove a key, tokens signed with it stop verifying.
+
+        Raises:
+            KeyError: If no key has this `kid`
+        """
+        with self._lock:
+            keys = self._keys
+            verification = dict(keys.keys)
+            del verification[kid]
+            if keys.signing_kid == kid:
+                keys = KeySet()
+            self._keys = keys._replace(keys=MappingProxyType(verification))
+
+
+class KeyWatcher:
+    """Signing and verification keys read from files, reloaded when the files change.
+
+    Keys are read from PEM files or a JWKS JSON file and parsed once, so tokens
+    are signed and verified with key objects instead of PEM strings. A background
+    thread compares the file modification times every `interval` seconds and
+    parses changed files off the request path, then swaps the whole `KeySet` in
+    one assignment. Verification keys replaced by a reload stay valid for `grace`
+    seconds, tokens signed just before a rotation keep verifying.
+
+    Keys are indexed by `kid`, the JWKS `kid` member or the RFC 7638 thumbprint
+    of the key, so every worker stamps and looks up the same identifiers.
+
+    Files are written by the deployment, e.g. a mounted secret. A file that fails
+    to parse is logged and the current keys are kept, it is read again on the
+    next poll.
+
+    Args:
+        algorithm (AlgorithmType): Algorithm new tokens are signed with, usually `JWT_ALGORITHM`
+        private_key_file (Optional[str], optional): PEM private key, or secret for HMAC algorithms. Defaults to None.
+        public_key_file (Optional[str], optional): PEM public key. Defaults to None.
+        jwks_file (Optional[str], optional): JWKS document. Every signature key verifies tokens with its
+            `alg` member, or `algorithm` for keys of the same type without one. The first private key
+            for `algorithm` signs them. Defaults to None.
+        interval (float, optional): Seconds between two file checks. Defaults to 5.0.
+        grace (float, optional): Seconds replaced verification keys stay valid. Defaults to 300.0.
+
+    Raises:
+        ValueError: If no file is given
+    """
+
+    def __init__(
+        self,
+        algorithm: AlgorithmType,
+        private_key_file: Optional[str] = None,
+        public_key_file: Optional[str] = None,
+        jwks_file: Optional[str] = None,
+        interval: float = 5.0,
+        grace: float = 300.0,
+    ) -> None:
+        """Load the keys, files must be readable at startup."""
+        if private_key_file is None and public_key_file is None and jwks_file is None:
+            raise ValueError("KeyWatcher needs a private key, public key or JWKS file")
+        self.algorithm = algorithm
+        self.private_key_file = private_key_file
+        self.public_key_file = public_key_file
+        self.jwks_file = jwks_file
+        self.interval = interval
+        self.grace = grace
+        self._paths = tuple(path for path in (private_key_file, public_key_file, jwks_file) if path is not None)
+        self._stamps = self._stat()
+        self._keys = self._load()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def keys(self) -> KeySet:
+        """Current key set."""
+        return self._keys
+
+    @property
+    def signing_key(self) -> Optional[Any]:
+        """Current signing key, None when only verification keys are loaded."""
+        return self._keys.signing_key
+
+    def poll(self) -> bool:
+        """Reload the keys if a file changed since the last check.
+
+        Returns:
+            bool: True if new keys were loaded
+        """
+        with self._lock:
+            stamps = self._stat()
+            if stamps == self._stamps:
+                return False
+            try:
+                keys = self._load(self._keys)
+            except Exception as e:
+                # Partially written files are read again on the next poll
+                log_error(f"Failed to reload keys from {', '.join(self._paths)}: {e}", loc="KeyWatcher", method="poll")
+                return False
+            self._stamps = stamps
+            self._keys = keys
+        log_info(f"Reloaded keys from {', '.join(self._paths)}", loc="KeyWatcher", method="poll")
+        return True
+
+    def start(self) -> None:
+        """Start the polling thread, once per process, e.g. from the application lifespan."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="authx-keys", daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the polling thread."""
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _watch(self) -> None:
+        while not self._closed.wait(self.interval):
+            self.poll()
+
+    def _stat(self) -> tuple[Optional[tuple[int, int]], ...]:
+        stamps: list[Optional[tuple[int, int]]] = []
+        for path in self._paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stamps.append(None)
+            else:
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+        return tuple(stamps)
+
+    def _load(self, previous: Optional[KeySet] = None) -> KeySet:
+        from jwt import PyJWK
+
+        signing_key: Optional[Any] = None
+        signing_kid: Optional[str] = None
+        verification: dict[str, VerificationKey] = {}
+
+        if self.private_key_file is not None:
+            signing_key = _prepare(self.algorithm, _read(self.private_key_file))
+            public = _public(signing_key)
+            signing_kid = _thumbprint(_jwk(self.algorithm, public))
+            if self.public_key_file is None:
+                verification[signing_kid] = VerificationKey(signing_kid, self.algorithm, public)
+        if self.public_key_file is not None:
+            public = _prepare(self.algorithm, _read(self.public_key_file))
+            kid = _thumbprint(_jwk(self.algorithm, public))
+            if signing_kid is not None and signing_kid != kid:
+                # Files replaced one after the other, both are read again on the next poll
+                raise ValueError(f"Key files {self.private_key_file} and {self.public_key_file} do not match")
+            verification[kid] = VerificationKey(kid, self.algorithm, public)
+        if self.jwks_file is not None:
+            for jwk, algorithm in _read_jwks(self.jwks_file, self.algorithm):
+                key = PyJWK(jwk, algorithm).key
+                kid = jwk.get("kid") or _thumbprint(jwk)
+                if signing_key is None and algorithm == self.algorithm and ("d" in jwk or jwk["kty"] == "oct"):
+                    signing_key, signing_kid = key, kid
+                verification[kid] = VerificationKey(kid, algorithm, _public(key))
+
+        if previous is not None:
+            now = now_ts()
+            retire_at = now + self.grace
+            for kid, key in previous.keys.items():
+                if kid in verification or not _active(key, now):
+                    continue
+                verification[kid] = key if key.retire_at is not None else key._replace(retire_at=retire_at)
+        if signing_key is None:
+            return KeySet(keys=MappingProxyType(verification))
+        return KeySet(signing_key, signing_kid, self.algorithm, MappingProxyType(verification))
+
+
+def _active(key: VerificationKey, now: Optional[float]) -> bool:
+    if key.retire_at is None:
+        return True
+    return key.retire_at > (now_ts() if now is None else now)
+
+
+def _unverified_kid(token: str) -> Optional[str]:
+    import jwt
+
+    try:
+        kid = jwt.get_unverified_header(token).get("kid")
+    except jwt.DecodeError as e:
+        raise JWTDecodeError(*e.args) from e
+    return kid if isinstance(kid, str) else None
+
+
+def _prepare(algorithm: AlgorithmType, key: Any) -> Any:
+    from jwt.algorithms import get_default_algorithms
+
+    return get_default_algorithms()[algorithm].prepare_key(key)
+
+
+def _jwk(algorithm: AlgorithmType, key: Any) -> dict[str, Any]:
+    from jwt.algorithms import get_default_algorithms
+
+    return cast(dict[str, Any], json.loads(get_default_algorithms()[algorithm].to_jwk(key)))
+
+
+def _thumbprint(jwk: Mapping[str, Any]) -> str:
+    # RFC 7638, SHA-256 of the required members in lexicographic order without whitespace
+    members = {name: jwk[name] for name in ("kty", *_THUMBPRINT_MEMBERS[jwk["kty"]])}
+    canonical = json.dumps(members, sort_keys=True, separators=(",", ":"))
+    return base64.urlsafe_b64encode(hashlib.sha256(canonical.encode()).digest()).rstrip(b"=").decode("ascii")
+
+
+def _read(path: str) -> str:
+    with open(path, encoding="utf-8") as file:
+        key = file.read().strip()
+    if not key:
+        raise ValueError(f"Key file {path} is empty")
+    return key
+
+
+def _read_jwks(path: str, algorithm: AlgorithmType) -> list[tuple[dict[str, Any], AlgorithmType]]:
+    with open(path, encoding="utf-8") as file:
+        document = json.load(file)
+    key_type = _KEY_TYPES.get(algorithm[:2])
+    jwks: list[tuple[dict[str, Any], AlgorithmType]] = []
+    for jwk in document.get("keys", []):
+        if jwk.get("use", "sig") != "sig":
+            continue
+        if "alg" in jwk:
+            jwks.append((jwk, jwk["alg"]))
+        elif jwk.get("kty") == key_type:
+            jwks.append((jwk, algorithm))
+    if not jwks:
+        raise ValueError(f"JWKS file {path} has no signature key")
+    return jwks
+
+
+def _public(key: Any) -> Any:
+    # Private key objects cannot verify signatures, HMAC secrets are used as is
+    public_key = getattr(key, "public_key", None)
+    return public_key() if callable(public_key) else key
@@ -1,26 +1,30 @@
 import logging
-import sys
 import traceback
-from typing import Optional
+from typing import Optional, Union
 
 log = logging.getLogger("authx")
+# Library logger: emit nothing unless the application configures logging
+log.addHandler(logging.NullHandler())
 
 
 def get_logger() -> logging.Logger:
     return log
 
 
-def set_log_level(level: str) -> logging.Logger:
+def set_log_level(level: Union[int, str]) -> logging.Logger:
     log.setLevel(level)
     return log
 
 
 def log_debug(msg: str, loc: Optional[str] = None, method: Optional[str] = None) -> None:
-    log.debug(msg=_build_log_msg(msg=msg, loc=loc, method=method))
+    # Level guard first, the message is only built when it is emitted
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug(msg=_build_log_msg(msg=msg, loc=loc, method=method))
 
 
 def log_info(msg: str, loc: Optional[str] = None, method: Optional[str] = None) -> None:
-    log.info(msg=_build_log_msg(msg=msg, loc=loc, method=method))
+    if log.isEnabledFor(logging.INFO):
+        log.info(msg=_build_log_msg(msg=msg, loc=loc, method=method))
 
 
 def log_error(
@@ -29,8 +33,12 @@ def log_error(
     method: Optional[str] = None,
     e: Optional[Exception] = None,
 ) -> None:
+    if not log.isEnabledFor(logging.ERROR):
+        return
     log.error(msg=_build_log_msg(msg=msg, loc=loc, method=method))
-    log.error(f"{traceback.format_exc()}")
+    if e is not None:
+        # Formatted from the exception itself, `format_exc` is empty outside an except block
+        log.error("".join(traceback.format_exception(type(e), e, e.__traceback__)))
 
 
 def _build_log_msg(msg: str, loc: Optional[str] = None, method: Optional[str] = None) -> str:
@@ -42,8 +50,3 @@ def _build_log_msg(msg: str, loc: Optional[str] = None, method: Optional[str] =
         log_str = f"[{loc}][{method}] {log_str}"
 
     return log_str
-
-
-logging.basicConfig()
-logging.StreamHandler(sys.stdout)
-log.setLevel(logging.DEBUG)
@@ -0,0 +1,161 @@
+import threading
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING, Any, Optional
+
+from authx._internal._timing import DEFAULT_BUCKETS, StageHistogram
+
+if TYPE_CHECKING:
+    from authx._internal._subject_cache import SubjectCache
+
+Labels = tuple[tuple[str, str], ...]
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Counters:
+    """Labelled counters, each thread increments its own shard without locking."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._shards: list[dict[tuple[str, Labels], float]] = []
+        self._shards_lock = threading.Lock()
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1) -> None:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        key = (name, labels)
+        shard[key] = shard.get(key, 0) + value
+
+    def collect(self) -> dict[tuple[str, Labels], float]:
+        merged: dict[tuple[str, Labels], float] = {}
+        for shard in list(self._shards):
+            for key, value in list(shard.items()):
+                merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def clear(self) -> None:
+        for shard in list(self._shards):
+            shard.clear()
+
+
+class AuthXMetrics:
+    """Metrics registry for AuthX, rendered in the Prometheus text format.
+
+    Counts authentication outcomes by exception type, token location and algorithm,
+    minted tokens, implicit refreshes and subject cache hits, and keeps a latency
+    histogram per authentication stage. Recording never takes a lock: every thread
+    increments its own shard, and shards are merged when rendering.
+
+    Args:
+        buckets (Sequence[float], optional): Stage latency bucket upper bounds in seconds. Defaults to 10µs to 1s.
+        namespace (str, optional): Prefix of every metric name. Defaults to "authx".
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = "authx") -> None:
+        """Initialize an empty registry."""
+        self.namespace = namespace
+        self.stages = StageHistogram(buckets)
+        self._counters = _Counters()
+        self._subject_cache: Optional[SubjectCache[Any]] = None
+
+    def record_auth(self, outcome: str, location: Optional[str], algorithm: str) -> None:
+        """Count an authentication attempt, `outcome` is "success" or the exception class name."""
+        self._counters.inc(
+            "auth_total", (("outcome", outcome), ("location", location or "none"), ("algorithm", algorithm))
+        )
+
+    def record_token(self, type: str, algorithm: str) -> None:
+        """Count a minted token."""
+        self._counters.inc("tokens_created_total", (("type", type), ("algorithm", algorithm)))
+
+    def record_refresh(self, location: str = "cookies") -> None:
+        """Count an implicit access token refresh."""
+        self._counters.inc("implicit_refresh_total", (("location", location),))
+
+    def bind_subject_cache(self, cache: Optional["SubjectCache[Any]"]) -> None:
+        """Report the hit and miss counters of a subject cache."""
+        self._subject_cache = cache
+
+    def value(self, name: str, **labels: str) -> float:
+        """Sum of a counter over the series matching the given labels, `name` without namespace."""
+        wanted = set(labels.items())
+        return sum(
+            value
+            for (counter, series), value in self._counters.collect().items()
+            if counter == name and wanted.issubset(series)
+        )
+
+    def reset(self) -> None:
+        """Drop every recorded value, subject cache counters excepted."""
+        self._counters.clear()
+        self.stages.reset()
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines: list[str] = []
+        counters = self._counters.collect()
+        for name, help in (
+            ("auth_total", "Authentication attempts by outcome, token location and algorithm."),
+            ("tokens_created_total", "Tokens minted by type and algorithm."),
+            ("implicit_refresh_total", "Access tokens refreshed by the implicit refresh middleware."),
+        ):
+            series = sorted((labels, value) for (counter, labels), value in counters.items() if counter == name)
+            self._family(lines, name, "counter", help, ((name, labels, value) for labels, value in series))
+
+        cache = self._subject_cache
+        if cache is not None:
+            for name, help, value in (
+                ("subject_cache_hits_total", "Subject cache hits.", cache.hits),
+                ("subject_cache_misses_total", "Subject cache misses.", cache.misses),
+            ):
+                self._family(lines, name, "counter", help, [(name, (), value)])
+            self._family(
+                lines, "subject_cache_size", "gauge", "Subjects in cache.", [("subject_cache_size", (), len(cache))]
+            )
+
+        samples: list[tuple[str, Labels, float]] = []
+        for stage in self.stages.stages():
+            stage_label: Labels = (("stage", stage),)
+            for bound, count in self.stages.cumulative(stage):
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                samples.append(("stage_duration_seconds_bucket", (*stage_label, ("le", le)), count))
+            samples.append(("stage_duration_seconds_sum", stage_label, self.stages.sum(stage)))
+            samples.append(("stage_duration_seconds_count", stage_label, self.stages.count(stage)))
+        self._family(lines, "stage_duration_seconds", "histogram", "Authentication stage latencies.", samples)
+        return "\n".join(lines) + "\n"
+
+    async def endpoint(self) -> Any:
+        """Endpoint returning the rendered metrics, e.g. `app.add_api_route("/metrics", metrics.endpoint)`."""
+        from starlette.responses import Response
+
+        return Response(self.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+    def _family(
+        self,
+        lines: list[str],
+        name: str,
+        type: str,
+        help: str,
+        samples: Iterable[tuple[str, Labels, float]],
+    ) -> None:
+        samples = list(samples)
+        if not samples:
+            return
+        lines.append(f"# HELP {self.namespace}_{name} {help}")
+        lines.append(f"# TYPE {self.namespace}_{name} {type}")
+        for sample, labels, value in samples:
+            rendered = ",".join(f'{key}="{_escape(label)}"' for key, label in labels)
+            suffix = f"{{{rendered}}}" if rendered else ""
+            lines.append(f"{self.namespace}_{sample}{suffix} {_format(value)}")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
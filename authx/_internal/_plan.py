@@ -0,0 +1,153 @@
+from datetime import timedelta
+from typing import Any, NamedTuple, Optional
+
+from authx._internal._cookies import CookieTemplates, build_cookie_templates
+from authx.config import PYDANTIC_V2, AuthXConfig
+from authx.exceptions import BadConfigurationError
+from authx.types import AlgorithmType, JTIFormat, StringOrSequence, TokenLocation
+
+# Locations a refresh token can be read from
+_REFRESH_LOCATIONS = ("cookies", "json")
+
+
+class _FrozenAuthXConfig(AuthXConfig):
+    """Read-only `AuthXConfig` held by a compiled plan, assignments raise instead of being ignored."""
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise TypeError(f"AuthX configuration is read-only, load a new AuthXConfig with load_config to change {name}")
+
+
+def _frozen_copy(config: AuthXConfig) -> AuthXConfig:
+    # Built without validation or environment lookup, the values were validated with `config`
+    if PYDANTIC_V2:
+        copy = config.model_copy(deep=True)
+        return _FrozenAuthXConfig.model_construct(_fields_set=copy.model_fields_set, **dict(copy))
+    copy = config.copy(deep=True)
+    return _FrozenAuthXConfig.construct(_fields_set=copy.__fields_set__, **dict(copy))
+
+
+class RuntimePlan(NamedTuple):
+    """Immutable view of an `AuthXConfig` read on the request path, compiled by `compile_plan`.
+
+    Membership checks use frozensets, keys are resolved and cookie headers are
+    rendered once. `config` is a read-only copy taken at compile time, changes to
+    the caller's configuration are not seen. AuthX swaps its whole plan on
+    `load_config`, so one plan never mixes two configurations.
+    """
+
+    config: AuthXConfig
+    algorithm: AlgorithmType
+    decode_algorithms: tuple[AlgorithmType, ...]
+    allowed_algorithms: frozenset[str]
+    private_key: Optional[str]
+    public_key: Optional[str]
+    key_error: Optional[str]
+    locations: tuple[TokenLocation, ...]
+    refresh_locations: tuple[TokenLocation, ...]
+    location_set: frozenset[TokenLocation]
+    csrf_protect: bool
+    csrf_methods: frozenset[str]
+    csrf_in_payload: bool
+    implicit_refresh_seconds: float
+    implicit_refresh_route_exclude: frozenset[str]
+    implicit_refresh_route_include: frozenset[str]
+    implicit_refresh_method_exclude: frozenset[str]
+    implicit_refresh_method_include: frozenset[str]
+    access_cookies: CookieTemplates
+    refresh_cookies: CookieTemplates
+    access_expires: Optional[timedelta]
+    refresh_expires: Optional[timedelta]
+    encode_audience: Optional[StringOrSequence]
+    encode_issuer: Optional[str]
+    decode_audience: Optional[StringOrSequence]
+    decode_issuer: Optional[str]
+    jti_format: JTIFormat
+
+    def signing_key(self) -> str:
+        """Key to encode tokens with.
+
+        Raises:
+            BadConfigurationError: If the algorithm is not supported or its key is not set
+        """
+        if self.private_key is None:
+            raise BadConfigurationError(self.key_error)
+        return self.private_key
+
+    def verification_key(self) -> str:
+        """Key to decode tokens with.
+
+        Raises:
+            BadConfigurationError: If the algorithm is not supported or its key is not set
+        """
+        if self.public_key is None:
+            raise BadConfigurationError(self.key_error)
+        return self.public_key
+
+    def csrf_required(self, method: str) -> bool:
+        """Whether requests with this HTTP method must carry a CSRF token."""
+        return self.csrf_protect and method.upper() in self.csrf_methods
+
+    def has_location(self, location: TokenLocation) -> bool:
+        """Check if the token location is enabled."""
+        return location in self.location_set
+
+    def cookie_templates(self, type: str) -> CookieTemplates:
+        """Cookie templates of a token type.
+
+        Raises:
+            ValueError: If the token type is neither "access" nor "refresh"
+        """
+        if type == "access":
+            return self.access_cookies
+        if type == "refresh":
+            return self.refresh_cookies
+        raise ValueError("Token type must be 'access' | 'refresh'")
+
+
+def _resolve_keys(config: AuthXConfig) -> tuple[Optional[str], Optional[str], Optional[str]]:
+    # Configuration errors are raised when a key is used, not when the plan is compiled
+    try:
+        return config.private_key, config.public_key, None
+    except BadConfigurationError as e:
+        return None, None, str(e)
+
+
+def compile_plan(config: AuthXConfig) -> RuntimePlan:
+    """Compile the request path view of a configuration.
+
+    The plan is compiled from a read-only deep copy of `config`, later changes to
+    it are not seen by the plan, compile it again to apply them.
+    """
+    config = _frozen_copy(config)
+    private_key, public_key, key_error = _resolve_keys(config)
+    locations = tuple(dict.fromkeys(config.JWT_TOKEN_LOCATION))
+    return RuntimePlan(
+        config=config,
+        algorithm=config.JWT_ALGORITHM,
+        decode_algorithms=(config.JWT_ALGORITHM,),
+        # Keyring keys are bound to one algorithm, the allow-list only applies to them
+        allowed_algorithms=frozenset((config.JWT_ALGORITHM, *config.JWT_DECODE_ALGORITHMS)),
+        private_key=private_key,
+        public_key=public_key,
+        key_error=key_error,
+        locations=locations,
+        refresh_locations=tuple(location for location in locations if location in _REFRESH_LOCATIONS),
+        location_set=frozenset(locations),
+        csrf_protect=config.JWT_COOKIE_CSRF_PROTECT,
+        csrf_methods=frozenset(method.upper() for method in config.JWT_CSRF_METHODS),
+        csrf_in_payload="cookies" in locations and config.JWT_COOKIE_CSRF_PROTECT,
+        implicit_refresh_seconds=config.JWT_IMPLICIT_REFRESH_DELTATIME.total_seconds(),
+        implicit_refresh_route_exclude=frozenset(config.JWT_IMPLICIT_REFRESH_ROUTE_EXCLUDE),
+        implicit_refresh_route_include=frozenset(config.JWT_IMPLICIT_REFRESH_ROUTE_INCLUDE),
+        implicit_refresh_method_exclude=frozenset(config.JWT_IMPLICIT_REFRESH_METHOD_EXCLUDE),
+        implicit_refresh_method_include=frozenset(config.JWT_IMPLICIT_REFRESH_METHOD_INCLUDE),
+        access_cookies=build_cookie_templates(config, "access"),
+        refresh_cookies=build_cookie_templates(config, "refresh"),
+        access_expires=config.JWT_ACCESS_TOKEN_EXPIRES,
+        refresh_expires=config.JWT_REFRESH_TOKEN_EXPIRES,
+        encode_audience=config.JWT_ENCODE_AUDIENCE,
+        encode_issuer=config.JWT_ENCODE_ISSUER,
+        decode_audience=config.JWT_DECODE_AUDIENCE,
+        decode_issuer=config.JWT_DECODE_ISSUER,
+        jti_format=config.JWT_JTI_FORMAT,
+    )
@@ -0,0 +1,80 @@
+import random
+from collections.abc import Awaitable, MutableMapping
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[MutableMapping[str, Any], Receive, Send], Awaitable[None]]
+
+# Stage durations of the current sampled request, unset for other requests
+_request_timings: ContextVar[Optional[dict[str, float]]] = ContextVar("authx_server_timing", default=None)
+
+
+class ServerTiming:
+    """Stage hook collecting the AuthX stages of sampled requests for the `Server-Timing` header.
+
+    Durations are collected while `ServerTimingMiddleware` handles a sampled request,
+    from dependencies as well as from middlewares, and summed per stage.
+
+    Args:
+        sample_rate (float, optional): Fraction of requests getting the header, between 0 and 1. Defaults to 1.0.
+        prefix (str, optional): Prefix of the metric names in the header. Defaults to "authx-".
+    """
+
+    def __init__(self, sample_rate: float = 1.0, prefix: str = "authx-") -> None:
+        """Initialize the collector."""
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+        self.sample_rate = sample_rate
+        self.prefix = prefix
+
+    def __call__(self, stage: str, duration: float) -> None:
+        """Record a stage duration for the current request, when sampled."""
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + duration
+
+    def sample(self) -> bool:
+        """Whether the next request gets the header."""
+        return self.sample_rate >= 1 or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    def render(self, timings: dict[str, float]) -> str:
+        """Render stage durations as a `Server-Timing` header value, in milliseconds."""
+        return ", ".join(f"{self.prefix}{stage};dur={duration * 1000:.3f}" for stage, duration in timings.items())
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware adding the stages collected by a `ServerTiming` hook to the response headers.
+
+    Args:
+        app (ASGIApp): Application to wrap
+        server_timing (ServerTiming): Collector registered as an AuthX stage hook
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: ServerTiming) -> None:
+        """Wrap the application."""
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: MutableMapping[str, Any], receive: Receive, send: Send) -> None:
+        """Collect the stages of sampled HTTP requests, and add them to the response start."""
+        if scope["type"] != "http" or not self.server_timing.sample():
+            await self.app(scope, receive, send)
+            return
+
+        timings: dict[str, float] = {}
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and timings:
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", self.server_timing.render(timings).encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        token = _request_timings.set(timings)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
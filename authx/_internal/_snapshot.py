@@ -0,0 +1,59 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Generic, Optional
+
+from authx._internal._versions import VersionTable
+from authx.types import T
+
+_VERSION_KEY = "_v"
+
+
+class SubjectSnapshot(Generic[T]):
+    """Declares a compact subject snapshot embedded in access token claims.
+
+    At mint time the declared `fields` are read from the subject and stored under
+    the `claim` key. When retrieving the current subject, the snapshot is rebuilt
+    with `loader` instead of calling the subject getter. With a `versions` table,
+    snapshots minted for an older subject version are ignored and the subject
+    getter is used instead.
+
+    Args:
+        fields (Sequence[str]): Subject attributes or keys to embed
+        loader (Callable[[dict[str, Any]], T], optional): Builds a subject from the snapshot. Defaults to dict.
+        claim (str, optional): Claim storing the snapshot. Defaults to "sbj".
+        versions (Optional[VersionTable], optional): Per-subject version table. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        fields: Sequence[str],
+        loader: Callable[[dict[str, Any]], T] = dict,  # type: ignore[assignment]
+        claim: str = "sbj",
+        versions: Optional[VersionTable] = None,
+    ) -> None:
+        """Initialize the snapshot declaration."""
+        self.fields = tuple(fields)
+        self.loader = loader
+        self.claim = claim
+        self.versions = versions
+
+    def dump(self, uid: str, subject: Any) -> dict[str, Any]:
+        """Extract the declared fields from a subject, stamping its current version."""
+        if isinstance(subject, Mapping):
+            snapshot = {field: subject[field] for field in self.fields if field in subject}
+        else:
+            snapshot = {field: getattr(subject, field) for field in self.fields if hasattr(subject, field)}
+        if self.versions is not None:
+            snapshot[_VERSION_KEY] = self.versions.get(uid)
+        return snapshot
+
+    def load(self, uid: str, snapshot: Any) -> tuple[bool, Optional[T]]:
+        """Rebuild a subject from a snapshot claim.
+
+        Returns:
+            tuple[bool, Optional[T]]: Whether the snapshot is usable, and the rebuilt subject
+        """
+        if not isinstance(snapshot, Mapping):
+            return False, None
+        if self.versions is not None and snapshot.get(_VERSION_KEY, 0) != self.versions.get(uid):
+            return False, None
+        return True, self.loader({k: v for k, v in snapshot.items() if k != _VERSION_KEY})
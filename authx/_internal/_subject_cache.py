@@ -0,0 +1,137 @@
+import asyncio
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable
+from typing import Any, Callable, Generic, Optional, Union
+
+from authx.types import T
+
+SubjectLoader = Callable[[str], Union[Optional[T], Awaitable[Optional[T]]]]
+
+
+class SubjectCache(Generic[T]):
+    """In-process TTL/LRU cache for subjects returned by the subject getter.
+
+    Entries are keyed by the token `sub` claim. Unknown subjects (a getter returning `None`)
+    are cached for `negative_ttl` seconds, and concurrent misses for the same `sub` share a
+    single getter invocation.
+
+    Args:
+        ttl (float, optional): Seconds a loaded subject stays cached. Defaults to 60.0.
+        maxsize (int, optional): Maximum number of cached subjects. Defaults to 1024.
+        negative_ttl (Optional[float], optional): Seconds an unknown subject stays cached,
+            `None` disables negative caching. Defaults to 5.0.
+        timer (Callable[[], float], optional): Monotonic time source. Defaults to time.monotonic.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 60.0,
+        maxsize: int = 1024,
+        negative_ttl: Optional[float] = 5.0,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize an empty subject cache."""
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.negative_ttl = negative_ttl
+        self.hits = 0
+        self.misses = 0
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, Optional[T]]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future[Optional[T]]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of cached subjects, expired entries included."""
+        return len(self._entries)
+
+    def __contains__(self, uid: object) -> bool:
+        """Check if a non expired entry exists for the subject."""
+        return isinstance(uid, str) and self._lookup(uid)[0]
+
+    def get(self, uid: str, default: Optional[T] = None) -> Optional[T]:
+        """Return the cached subject or `default` when missing or expired."""
+        found, value = self._lookup(uid)
+        return value if found else default
+
+    def set(self, uid: str, value: Optional[T]) -> None:
+        """Store a subject, `None` values are stored as negative entries."""
+        ttl = self.ttl if value is not None else self.negative_ttl
+        if ttl is None:
+            return
+        with self._lock:
+            self._entries[uid] = (self._timer() + ttl, value)
+            self._entries.move_to_end(uid)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, uid: str) -> None:
+        """Drop the cached subject, a load already in flight will not be stored."""
+        with self._lock:
+            self._entries.pop(uid, None)
+            self._inflight.pop(uid, None)
+
+    def clear(self) -> None:
+        """Drop every cached subject."""
+        with self._lock:
+            self._entries.clear()
+            self._inflight.clear()
+
+    async def get_or_load(self, uid: str, loader: SubjectLoader[T]) -> Optional[T]:
+        """Return the cached subject or load it, sharing the load between concurrent callers.
+
+        Args:
+            uid (str): Subject identifier
+            loader (SubjectLoader[T]): Sync or async callable returning the subject
+
+        Returns:
+            Optional[T]: The subject, `None` for unknown subjects
+        """
+        found, value = self._lookup(uid)
+        if found:
+            self.hits += 1
+            return value
+        self.misses += 1
+
+        inflight = self._inflight.get(uid)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future: asyncio.Future[Optional[T]] = asyncio.get_running_loop().create_future()
+        self._inflight[uid] = future
+        try:
+            result: Any = loader(uid)
+            if inspect.isawaitable(result):
+                result = await result
+        except BaseException as e:
+            if self._inflight.get(uid) is future:
+                del self._inflight[uid]
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark the exception as retrieved when no concurrent caller awaits it
+                future.exception()
+            raise
+
+        if self._inflight.get(uid) is future:
+            del self._inflight[uid]
+            self.set(uid, result)
+        future.set_result(result)
+        return result
+
+    def _lookup(self, uid: str) -> tuple[bool, Optional[T]]:
+        entry = self._entries.get(uid)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        with self._lock:
+            if expires_at <= self._timer():
+                self._entries.pop(uid, None)
+                return False, None
+            if uid in self._entries:
+                self._entries.move_to_end(uid)
+        return True, value
@@ -0,0 +1,144 @@
+import bisect
+import contextlib
+import threading
+import time
+from collections.abc import Sequence
+from typing import Any, Callable, Optional
+
+StageHook = Callable[[str, float], None]
+"""Receives the stage name and its duration in seconds."""
+
+# Upper bounds in seconds, from 10µs to 1s
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+
+# Shared by every stage when no hook is registered
+_NO_TIMING = contextlib.nullcontext()
+
+
+class _StageTimer:
+    __slots__ = ("_hooks", "_stage", "_start")
+
+    def __init__(self, hooks: Sequence[StageHook], stage: str) -> None:
+        self._hooks = hooks
+        self._stage = stage
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        duration = time.perf_counter() - self._start
+        for hook in self._hooks:
+            hook(self._stage, duration)
+
+
+def time_stage(hooks: Sequence[StageHook], stage: str) -> contextlib.AbstractContextManager[None]:
+    """Context manager reporting the duration of its block to the hooks, a shared no-op without hooks."""
+    if not hooks:
+        return _NO_TIMING
+    return _StageTimer(hooks, stage)
+
+
+class StageHistogram:
+    """Stage hook collecting durations into fixed bucket histograms.
+
+    Every thread records into its own shard, so recording never takes a lock.
+    Reads merge the shards and may miss records made concurrently.
+
+    Args:
+        buckets (Sequence[float], optional): Sorted bucket upper bounds in seconds. Defaults to 10µs to 1s.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """Initialize an empty histogram."""
+        self.buckets = tuple(buckets)
+        self._local = threading.local()
+        self._shards: list[dict[str, list[float]]] = []
+        self._shards_lock = threading.Lock()
+
+    def __call__(self, stage: str, duration: float) -> None:
+        """Record a stage duration."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        # One slot per bucket, one for durations above the last bucket, then the sum
+        values = shard.get(stage)
+        if values is None:
+            values = shard[stage] = [0.0] * (len(self.buckets) + 2)
+        values[bisect.bisect_left(self.buckets, duration)] += 1
+        values[-1] += duration
+
+    def _merged(self, stage: str) -> list[float]:
+        merged = [0.0] * (len(self.buckets) + 2)
+        for shard in list(self._shards):
+            values = shard.get(stage)
+            if values is not None:
+                for i, value in enumerate(values):
+                    merged[i] += value
+        return merged
+
+    def stages(self) -> list[str]:
+        """Names of the stages recorded so far."""
+        return sorted({stage for shard in list(self._shards) for stage in list(shard)})
+
+    def count(self, stage: str) -> int:
+        """Number of durations recorded for a stage."""
+        return int(sum(self._merged(stage)[:-1]))
+
+    def sum(self, stage: str) -> float:
+        """Total seconds recorded for a stage."""
+        return self._merged(stage)[-1]
+
+    def cumulative(self, stage: str) -> list[tuple[float, int]]:
+        """Cumulative counts per bucket upper bound, ending with `inf`."""
+        merged = self._merged(stage)
+        total = 0
+        result = []
+        for bound, value in zip((*self.buckets, float("inf")), merged[:-1]):
+            total += int(value)
+            result.append((bound, total))
+        return result
+
+    def quantile(self, stage: str, q: float) -> Optional[float]:
+        """Estimate a quantile, as the upper bound of the bucket holding it. None without records."""
+        cumulative = self.cumulative(stage)
+        total = cumulative[-1][1]
+        if not total:
+            return None
+        rank = q * total
+        for bound, count in cumulative:
+            if count >= rank:
+                return bound
+        return float("inf")  # pragma: no cover
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Count, sum and cumulative buckets of every stage."""
+        return {
+            stage: {"count": self.count(stage), "sum": self.sum(stage), "buckets": self.cumulative(stage)}
+            for stage in self.stages()
+        }
+
+    def reset(self) -> None:
+        """Drop every recorded duration."""
+        for shard in list(self._shards):
+            shard.clear()
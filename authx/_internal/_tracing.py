@@ -0,0 +1,116 @@
+import contextlib
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager
+from contextvars import ContextVar
+from typing import Any, NamedTuple, Optional, Protocol, runtime_checkable
+
+# Shared by every span when no tracer is set
+_NO_SPAN: AbstractContextManager[None] = contextlib.nullcontext()
+
+
+@runtime_checkable
+class Span(Protocol):
+    """Span interface used by AuthX, satisfied by OpenTelemetry spans."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute on the span."""
+        ...
+
+
+@runtime_checkable
+class Tracer(Protocol):
+    """Tracer interface used by AuthX, satisfied by OpenTelemetry tracers.
+
+    e.g. `auth.set_tracer(opentelemetry.trace.get_tracer("authx"))`.
+    """
+
+    def start_as_current_span(self, name: str) -> AbstractContextManager[Any]:
+        """Start a span, current until the context manager exits, and return it on enter."""
+        ...
+
+
+class _OutcomeSpan:
+    """Wraps a tracer span and sets its `authx.outcome` attribute on exit."""
+
+    __slots__ = ("_manager", "_span")
+
+    def __init__(self, tracer: Tracer, name: str) -> None:
+        self._manager = tracer.start_as_current_span(name)
+        self._span: Any = None
+
+    def __enter__(self) -> Span:
+        self._span = self._manager.__enter__()
+        return self._span
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> Optional[bool]:
+        self._span.set_attribute("authx.outcome", "success" if exc_type is None else exc_type.__name__)
+        return self._manager.__exit__(exc_type, exc, tb)
+
+
+def trace_span(tracer: Optional[Tracer], name: str) -> AbstractContextManager[Optional[Span]]:
+    """Context manager tracing its block as a span, a shared no-op yielding None without tracer.
+
+    The span gets an `authx.outcome` attribute, "success" or the raised exception class name.
+    Other attributes are set on the yielded span, after checking it is not None.
+    """
+    if tracer is None:
+        return _NO_SPAN
+    return _OutcomeSpan(tracer, name)
+
+
+class RecordedSpan(NamedTuple):
+    """Span finished by an `InMemoryTracer`."""
+
+    name: str
+    attributes: dict[str, Any]
+    parent: Optional[str]
+    duration: float
+
+
+class _InMemorySpan:
+    __slots__ = ("attributes", "name")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.attributes: dict[str, Any] = {}
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+
+class InMemoryTracer:
+    """Tracer keeping finished spans in memory, for tests.
+
+    Spans are nested per context, like OpenTelemetry spans: concurrent tasks on
+    one event loop each see their own current span. The `parent` of a recorded
+    span is the name of the span current when it started.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a tracer without spans."""
+        self.spans: list[RecordedSpan] = []
+        # Names of the open spans, replaced rather than mutated so tasks copying the context never share it
+        self._stack: ContextVar[tuple[str, ...]] = ContextVar(f"authx_tracer_stack_{id(self):x}", default=())
+
+    @contextlib.contextmanager
+    def start_as_current_span(self, name: str) -> Iterator[_InMemorySpan]:
+        """Start a span, recorded when the context manager exits."""
+        stack = self._stack.get()
+        span = _InMemorySpan(name)
+        parent = stack[-1] if stack else None
+        token = self._stack.set((*stack, name))
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            self._stack.reset(token)
+            self.spans.append(RecordedSpan(name, span.attributes, parent, time.perf_counter() - start))
+
+    def find(self, name: str) -> list[RecordedSpan]:
+        """Recorded spans with the given name."""
+        return [span for span in self.spans if span.name == name]
+
+    def clear(self) -> None:
+        """Drop every recorded span."""
+        self.spans.clear()
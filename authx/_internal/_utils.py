@@ -2,14 +2,15 @@ import datetime as dt
 import uuid
 from datetime import datetime, timedelta
 from datetime import timezone as tz
-from typing import Union
-
-from dateutil import parser as dateutil_parser
-from dateutil.relativedelta import relativedelta
-from pytz import BaseTzInfo, timezone
+from typing import TYPE_CHECKING, Any, Optional, Union
 
+from authx._internal._clock import now, now_ts
 from authx.types import Numeric
 
+if TYPE_CHECKING:
+    from dateutil.relativedelta import relativedelta
+    from pytz import BaseTzInfo
+
 RESERVED_CLAIMS = {
     "fresh",
     "csrf",
@@ -23,32 +24,48 @@ RESERVED_CLAIMS = {
     "sub",
 }
 
-utc = timezone("UTC")
+
+def __getattr__(name: str) -> Any:
+    # `utc` is resolved on first access, so `pytz` is not imported with authx
+    if name == "utc":
+        return _utc()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _utc() -> "BaseTzInfo":
+    from pytz import utc
+
+    return utc
 
 
 def get_now() -> dt.datetime:
-    return dt.datetime.now(tz=dt.timezone.utc)
+    return now()
 
 
 def get_now_ts() -> Numeric:
-    return get_now().timestamp()
+    # Read from the clock directly, without building a datetime
+    return now_ts()
 
 
 def get_uuid() -> str:
     return str(uuid.uuid4())
 
 
-def time_diff(dt1: datetime, dt2: datetime) -> relativedelta:
+def time_diff(dt1: datetime, dt2: datetime) -> "relativedelta":
+    from dateutil.relativedelta import relativedelta
+
     return relativedelta(dt1, dt2)
 
 
-def to_UTC(event_timestamp: Union[datetime, str], tz: BaseTzInfo = utc) -> datetime:
+def to_UTC(event_timestamp: Union[datetime, str], tz: Optional["BaseTzInfo"] = None) -> datetime:
     if isinstance(event_timestamp, datetime):  # pragma: no cover
         dt = event_timestamp
     else:
+        from dateutil import parser as dateutil_parser  # pragma: no cover
+
         dt = dateutil_parser.parse(event_timestamp)  # pragma: no cover
 
-    return dt.astimezone(tz)
+    return dt.astimezone(tz or _utc())
 
 
 def to_UTC_without_tz(event_timestamp: str, format: str = "%Y-%m-%d %H:%M:%S.%f") -> str:
@@ -87,14 +104,20 @@ def days_ago(dt: datetime, days: int = 1, hours: int = 0, minutes: int = 0, seco
 
 
 def months_ago(dt: datetime, months: int = 1) -> datetime:
+    from dateutil.relativedelta import relativedelta
+
     return dt - relativedelta(months=months)
 
 
 def months_after(dt: datetime, months: int = 1) -> datetime:
+    from dateutil.relativedelta import relativedelta
+
     return dt + relativedelta(months=months)
 
 
 def years_ago(dt: datetime, years: int = 1) -> datetime:
+    from dateutil.relativedelta import relativedelta
+
     past = dt - relativedelta(years=years)
     if dt.tzinfo:  # pragma: no cover
         past = past.replace(tzinfo=past.tzinfo)  # pragma: no cover
@@ -109,46 +132,50 @@ def days_after(dt: datetime, days: int = 1, hours: int = 0, minutes: int = 0, se
 
 
 def is_today(dt: datetime) -> bool:
+    utc = _utc()
     return dt.astimezone(utc).day == datetime.now().astimezone(utc).day
 
 
 def is_yesterday(dt: datetime) -> bool:
+    utc = _utc()
     return dt.astimezone(utc).day == days_ago(datetime.now().astimezone(utc)).day
 
 
 def is_tomorrow(dt: datetime) -> bool:
+    utc = _utc()
     return dt.astimezone(utc).day == days_after(datetime.now().astimezone(utc)).day
 
 
 def IST_time() -> datetime:
-    return datetime.now().astimezone(utc)
+    return datetime.now().astimezone(_utc())
 
 
-def tz_now(tz: BaseTzInfo = utc) -> datetime:
+def tz_now(tz: Optional["BaseTzInfo"] = None) -> datetime:
+    tz = tz or _utc()
     dt = datetime.now(tz=tz)
     return dt.replace(tzinfo=tz)
 
 
-def tz_from_iso(dt: str, to_tz: BaseTzInfo = utc, format: str = "%Y-%m-%dT%H:%M:%S.%f%z") -> datetime:
+def tz_from_iso(dt: str, to_tz: Optional["BaseTzInfo"] = None, format: str = "%Y-%m-%dT%H:%M:%S.%f%z") -> datetime:
     date_time = datetime.strptime(dt, format)
-    return date_time.astimezone(to_tz)
+    return date_time.astimezone(to_tz or _utc())
 
 
-def start_of_week(dt: Union[str, datetime], to_tz: BaseTzInfo = utc) -> datetime:
+def start_of_week(dt: Union[str, datetime], to_tz: Optional["BaseTzInfo"] = None) -> datetime:
     if isinstance(dt, str):  # pragma: no cover
         dt = datetime.strptime(dt, "%Y-%m-%d")  # pragma: no cover
     day_of_the_week = dt.weekday()
     return days_ago(dt=dt, days=day_of_the_week)
 
 
-def end_of_week(dt: Union[str, datetime], to_tz: BaseTzInfo = utc) -> datetime:
+def end_of_week(dt: Union[str, datetime], to_tz: Optional["BaseTzInfo"] = None) -> datetime:
     if isinstance(dt, str):  # pragma: no cover
         dt = datetime.strptime(dt, "%Y-%m-%d")  # pragma: no cover
     _start_of_week = start_of_week(dt=dt, to_tz=to_tz)
     return days_after(dt=_start_of_week, days=6)
 
 
-def end_of_last_week(dt: Union[str, datetime], to_tz: BaseTzInfo = utc) -> datetime:
+def end_of_last_week(dt: Union[str, datetime], to_tz: Optional["BaseTzInfo"] = None) -> datetime:
     if isinstance(dt, str):  # pragma: no cover
         dt = datetime.strptime(dt, "%Y-%m-%d")  # pragma: no cover
     _end_of_current_week = end_of_week(dt=dt, to_tz=to_tz)
@@ -0,0 +1,48 @@
+import threading
+from typing import Protocol, runtime_checkable
+
+
+@runtime_checkable
+class VersionTable(Protocol):
+    """Backend interface for per-subject version numbers.
+
+    Lookups happen on the request path and at mint time, backends should answer
+    from local memory and propagate bumps out of band.
+    """
+
+    def get(self, uid: str) -> int:
+        """Return the current version of a subject, `0` when unknown."""
+        ...
+
+    def bump(self, uid: str) -> int:
+        """Increment the version of a subject and return the new version."""
+        ...
+
+
+class MemoryVersionTable:
+    """In-memory table of per-subject version numbers.
+
+    Subjects start at version `0`, bump a subject version whenever its record
+    changes to mark every token and snapshot minted before as stale.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty version table."""
+        self._lock = threading.Lock()
+        self._versions: dict[str, int] = {}
+
+    def get(self, uid: str) -> int:
+        """Return the current version of a subject."""
+        return self._versions.get(uid, 0)
+
+    def set(self, uid: str, version: int) -> None:
+        """Set the current version of a subject."""
+        with self._lock:
+            self._versions[uid] = version
+
+    def bump(self, uid: str) -> int:
+        """Increment the version of a subject and return the new version."""
+        with self._lock:
+            version = self._versions.get(uid, 0) + 1
+            self._versions[uid] = version
+        return version
@@ -0,0 +1,517 @@
+"""Framework independent core of AuthX."""
+
+from collections.abc import Sequence
+from contextlib import AbstractContextManager
+from typing import Any, Callable, Optional, TypeVar, Union
+
+from authx._internal._callback import _CallbackHandler
+from authx._internal._ids import get_random_id, get_time_ordered_id
+from authx._internal._keys import KeySource
+from authx._internal._metrics import AuthXMetrics
+from authx._internal._plan import RuntimePlan, compile_plan
+from authx._internal._subject_cache import SubjectCache
+from authx._internal._timing import StageHook, time_stage
+from authx._internal._tracing import Span, Tracer, trace_span
+from authx.config import AuthXConfig
+from authx.exceptions import AuthXException, BadConfigurationError, RevokedTokenError
+from authx.schema import RequestToken, TokenPayload
+from authx.types import (
+    AlgorithmType,
+    DateTimeExpression,
+    StringOrSequence,
+    T,
+    TokenLocation,
+    TokenType,
+)
+
+R = TypeVar("R")
+
+
+class AuthXCore(_CallbackHandler[T]):
+    """Token minting, verification, blocklist and subject hooks without a web framework.
+
+    `AuthXCore` does not import FastAPI or Starlette, it can be used from workers
+    and command line tools that only mint or verify tokens. `authx.AuthX` builds
+    the FastAPI integration on top of it.
+
+    Args:
+        config (Optional[AuthXConfig], optional): Configuration instance to use. Defaults to a new AuthXConfig().
+        model (Optional[T], optional): Model type hint. Defaults to dict[str, Any].
+    """
+
+    def __init__(self, config: Optional[AuthXConfig] = None, model: Optional[T] = None) -> None:
+        """AuthX core object.
+
+        Args:
+            config (Optional[AuthXConfig], optional): Configuration instance to use. Defaults to a new AuthXConfig().
+            model (Optional[T], optional): Model type hint. Defaults to dict[str, Any].
+        """
+        self.model: Union[T, dict[str, Any]] = model if model is not None else {}
+        super().__init__(model=model)
+        self._plan: RuntimePlan = compile_plan(config if config is not None else AuthXConfig())
+        self._stage_hooks: list[StageHook] = []
+        self._metrics: Optional[AuthXMetrics] = None
+        self._tracer: Optional[Tracer] = None
+        self._keyring: Optional[KeySource] = None
+        self._allow_missing_kid = False
+
+    def load_config(self, config: AuthXConfig) -> None:
+        """Load and store the configuration for the authentication system.
+
+        A copy of the configuration is compiled into a runtime plan that replaces
+        the current one in a single assignment. Each step of a request, e.g. token
+        extraction or verification, reads one whole plan, but a request running
+        during the swap may use the old plan for some steps and the new one for
+        later steps. Changes made to `config` afterwards are not seen until it is
+        loaded again, the `config` property returns the read-only copy in use.
+
+        Args:
+            config: The configuration settings for the AuthX authentication system.
+
+        Returns:
+            None
+        """
+        self._plan = compile_plan(config)
+
+    @property
+    def config(self) -> AuthXConfig:
+        """AuthX Configuration getter.
+
+        The configuration in use is read-only, assigning a field raises a `TypeError`,
+        pass a new configuration to `load_config` instead.
+
+        Returns:
+            AuthXConfig: Configuration BaseSettings
+        """
+        return self._plan.config
+
+    @property
+    def stage_hooks(self) -> tuple[StageHook, ...]:
+        """Hooks receiving the duration of each authentication stage."""
+        return tuple(self._stage_hooks)
+
+    def add_stage_hook(self, hook: StageHook) -> None:
+        """Register a hook called with the stage name and its duration in seconds.
+
+        Stages are `extract`, `blocklist`, `signature`, `claims`, `version` and `subject`.
+        Hooks run on the request path and should only record the duration.
+
+        Args:
+            hook (StageHook): Callable receiving the stage name and its duration
+        """
+        self._stage_hooks.append(hook)
+
+    def remove_stage_hook(self, hook: StageHook) -> None:
+        """Unregister a stage hook.
+
+        Raises:
+            ValueError: If the hook is not registered
+        """
+        self._stage_hooks.remove(hook)
+
+    def _time_stage(self, stage: str) -> AbstractContextManager[None]:
+        return time_stage(self._stage_hooks, stage)
+
+    @property
+    def tracer(self) -> Optional[Tracer]:
+        """Tracer receiving the AuthX spans, if any."""
+        return self._tracer
+
+    def set_tracer(self, tracer: Optional[Tracer]) -> None:
+        """Set the tracer receiving the AuthX spans, `None` disables tracing.
+
+        Spans are `authx.extract`, `authx.blocklist`, `authx.verify_token`, `authx.subject`
+        and `authx.create_token`. Each carries an `authx.outcome` attribute, "success"
+        or the raised exception class name, along with the token algorithm, type or location
+        when known.
+
+        Args:
+            tracer (Optional[Tracer]): OpenTelemetry compatible tracer, e.g. `opentelemetry.trace.get_tracer("authx")`
+        """
+        self._tracer = tracer
+
+    def _span(self, name: str) -> AbstractContextManager[Optional[Span]]:
+        return trace_span(self._tracer, name)
+
+    @property
+    def keyring(self) -> Optional[KeySource]:
+        """Keyring providing the signing and verification keys, if any."""
+        return self._keyring
+
+    def set_keyring(self, keyring: Optional[KeySource], allow_missing_kid: bool = False) -> None:
+        """Sign and verify tokens with the keys of a `Keyring` or `KeyWatcher` instead of the configured keys.
+
+        Minted tokens carry the `kid` header of the signing key. Tokens with a
+        `kid` are verified with the key indexed under it, if its algorithm is
+        `JWT_ALGORITHM` or one of `JWT_DECODE_ALGORITHMS`. Tokens without `kid`
+        are rejected unless `allow_missing_kid` is set. `None` goes back to the
+        configured keys.
+
+        Args:
+            keyring (Optional[KeySource]): Keyring, or watcher reloading the key files
+            allow_missing_kid (bool, optional): Verify tokens without `kid`, e.g. minted before
+                the keyring was set, with the current signing key only. Defaults to False.
+        """
+        self._keyring = keyring
+        self._allow_missing_kid = allow_missing_kid
+
+    def _signing(
+        self, plan: RuntimePlan, headers: Optional[dict[str, Any]]
+    ) -> tuple[Any, AlgorithmType, Optional[dict[str, Any]]]:
+        keyring = self._keyring
+        if keyring is None:
+            return plan.signing_key(), plan.algorithm, headers
+        keys = keyring.keys
+        if keys.signing_key is None or keys.signing_algorithm is None:
+            raise BadConfigurationError("Keyring has no signing key")
+        return keys.signing_key, keys.signing_algorithm, {**(headers or {}), "kid": keys.signing_kid}
+
+    def _with_verification_keys(
+        self,
+        plan: RuntimePlan,
+        token: str,
+        decode: Callable[[Any, Sequence[AlgorithmType]], R],
+        verify: bool = True,
+    ) -> R:
+        keyring = self._keyring
+        if keyring is None:
+            return decode(plan.verification_key(), plan.decode_algorithms)
+        if not verify:
+            return decode("", plan.decode_algorithms)
+        key = keyring.keys.select(token, plan.allowed_algorithms, allow_missing_kid=self._allow_missing_kid)
+        return decode(key.key, (key.algorithm,))
+
+    @property
+    def metrics(self) -> Optional[AuthXMetrics]:
+        """Metrics registry recording authentication outcomes and stage latencies, if any."""
+        return self._metrics
+
+    def set_metrics(self, metrics: Optional[AuthXMetrics]) -> None:
+        """Set the metrics registry, `None` disables metrics.
+
+        The registry collects stage latencies as a stage hook and reports the subject cache counters.
+        """
+        if self._metrics is not None:
+            self.remove_stage_hook(self._metrics.stages)
+        self._metrics = metrics
+        if metrics is not None:
+            self.add_stage_hook(metrics.stages)
+            metrics.bind_subject_cache(self._subject_cache)
+
+    def set_subject_cache(self, cache: Optional[SubjectCache[T]]) -> None:
+        """Set the cache for subjects returned by the subject getter, `None` disables caching."""
+        super().set_subject_cache(cache)
+        if self._metrics is not None:
+            self._metrics.bind_subject_cache(cache)
+
+    def _record_auth(self, outcome: str, request_token: Optional[RequestToken]) -> None:
+        if self._metrics is not None:
+            location = request_token.location if request_token is not None else None
+            self._metrics.record_auth(outcome, location, self._plan.algorithm)
+
+    def _create_payload(
+        self,
+        plan: RuntimePlan,
+        uid: str,
+        type: str,
+        fresh: bool = False,
+        expiry: Optional[DateTimeExpression] = None,
+        data: Optional[dict[str, Any]] = None,
+        audience: Optional[StringOrSequence] = None,
+        **kwargs: Any,
+    ) -> TokenPayload:
+        # Handle additional data
+        if data is None:
+            data = {}
+        # Handle expiry date
+        exp = expiry
+        if exp is None:
+            exp = plan.access_expires if type == "access" else plan.refresh_expires
+        # Handle CSRF
+        csrf = ""
+        if plan.csrf_in_payload:
+            csrf = get_random_id()
+        # Handle audience
+        aud = audience
+        if aud is None:
+            aud = plan.encode_audience
+        # Handle JTI, time ordered IDs let blocklists revoke and prune by issue time
+        if plan.jti_format == "ulid":
+            data = {**data, "jti": get_time_ordered_id()}
+        return TokenPayload(
+            sub=uid,
+            fresh=fresh,
+            exp=exp,
+            type=type,
+            iss=plan.encode_issuer,
+            aud=aud,
+            csrf=csrf,
+            # Handle NBF
+            nbf=None,
+            **data,
+        )
+
+    def _create_token(
+        self,
+        uid: str,
+        type: str,
+        fresh: bool = False,
+        headers: Optional[dict[str, Any]] = None,
+        expiry: Optional[DateTimeExpression] = None,
+        data: Optional[dict[str, Any]] = None,
+        audience: Optional[StringOrSequence] = None,
+        **kwargs: Any,
+    ) -> str:
+        plan = self._plan
+        if self._token_versions is not None:
+            data = {**(data or {}), "ver": self._token_versions.get(uid)}
+        with self._span("authx.create_token") as span:
+            key, algorithm, headers = self._signing(plan, headers)
+            if self._metrics is not None:
+                self._metrics.record_token(type, algorithm)
+            if span is not None:
+                span.set_attribute("authx.type", type)
+                span.set_attribute("authx.algorithm", algorithm)
+            payload = self._create_payload(
+                plan,
+                uid=uid,
+                type=type,
+                fresh=fresh,
+                expiry=expiry,
+                data=data,
+                audience=audience,
+                **kwargs,
+            )
+            return payload.encode(
+                key=key,
+                algorithm=algorithm,
+                headers=headers,
+                data=data,
+            )
+
+    def _decode_token(
+        self,
+        token: str,
+        verify: bool = True,
+        audience: Optional[StringOrSequence] = None,
+        issuer: Optional[str] = None,
+    ) -> TokenPayload:
+        plan = self._plan
+        return self._with_verification_keys(
+            plan,
+            token,
+            lambda key, algorithms: TokenPayload.decode(
+                token=token,
+                key=key,
+                algorithms=algorithms,
+                verify=verify,
+                audience=audience or plan.decode_audience,
+                issuer=issuer or plan.decode_issuer,
+            ),
+            verify=verify,
+        )
+
+    def create_access_token(
+        self,
+        uid: str,
+        fresh: bool = False,
+        headers: Optional[dict[str, Any]] = None,
+        expiry: Optional[DateTimeExpression] = None,
+        data: Optional[dict[str, Any]] = None,
+        audience: Optional[StringOrSequence] = None,
+        *args: Any,
+        subject: Optional[T] = None,
+        **kwargs: Any,
+    ) -> str:
+        """Generate an Access Token.
+
+        Args:
+            uid (str): Unique identifier to generate token for
+            fresh (bool, optional): Generate fresh token. Defaults to False.
+            headers (Optional[dict[str, Any]], optional): TODO. Defaults to None.
+            expiry (Optional[DateTimeExpression], optional): Use a user defined expiry claim. Defaults to None.
+            data (Optional[dict[str, Any]], optional): Additional data to store in token. Defaults to None.
+            audience (Optional[StringOrSequence], optional): Audience claim. Defaults to None.
+            subject (Optional[T], optional): Subject to embed as a snapshot claim,
+                requires `set_subject_snapshot`. Defaults to None.
+
+        Returns:
+            str: Access Token
+        """
+        if subject is not None and self._subject_snapshot is not None:
+            data = {**(data or {}), self._subject_snapshot.claim: self._subject_snapshot.dump(uid, subject)}
+        return self._create_token(
+            uid=uid,
+            type="access",
+            fresh=fresh,
+            headers=headers,
+            expiry=expiry,
+            data=data,
+            audience=audience,
+        )
+
+    def create_refresh_token(
+        self,
+        uid: str,
+        headers: Optional[dict[str, Any]] = None,
+        expiry: Optional[DateTimeExpression] = None,
+        data: Optional[dict[str, Any]] = None,
+        audience: Optional[StringOrSequence] = None,
+        *args: Any,
+        **kwargs: Any,
+    ) -> str:
+        """Generate a Refresh Token.
+
+        Args:
+            uid (str): Unique identifier to generate token for
+            headers (Optional[dict[str, Any]], optional): TODO. Defaults to None.
+            expiry (Optional[DateTimeExpression], optional): Use a user defined expiry claim. Defaults to None.
+            data (Optional[dict[str, Any]], optional): Additional data to store in token. Defaults to None.
+            audience (Optional[StringOrSequence], optional): Audience claim. Defaults to None.
+
+        Returns:
+            str: Refresh Token
+        """
+        return self._create_token(
+            uid=uid,
+            type="refresh",
+            headers=headers,
+            expiry=expiry,
+            data=data,
+            audience=audience,
+        )
+
+    def verify_token(
+        self,
+        token: RequestToken,
+        verify_type: bool = True,
+        verify_fresh: bool = False,
+        verify_csrf: bool = True,
+    ) -> TokenPayload:
+        """Verify a request token.
+
+        Args:
+            token (RequestToken): RequestToken instance
+            verify_type (bool, optional): Apply token type verification. Defaults to True.
+            verify_fresh (bool, optional): Apply token freshness verification. Defaults to False.
+            verify_csrf (bool, optional): Apply token CSRF verification. Defaults to True.
+
+        Returns:
+            TokenPayload: _description_
+        """
+        plan = self._plan
+        with self._span("authx.verify_token") as span:
+            if span is not None:
+                span.set_attribute("authx.algorithm", plan.algorithm)
+                span.set_attribute("authx.location", token.location)
+            # Same checks as `RequestToken.verify`, split to time each stage
+            with self._time_stage("signature"):
+                decoded_token = self._with_verification_keys(
+                    plan,
+                    token.token,
+                    lambda key, algorithms: token._decode(
+                        key=key,
+                        algorithms=algorithms,
+                        audience=plan.decode_audience,
+                        issuer=plan.decode_issuer,
+                    ),
+                )
+            with self._time_stage("claims"):
+                return token._validate(
+                    decoded_token,
+                    verify_type=verify_type,
+                    verify_csrf=verify_csrf,
+                    verify_fresh=verify_fresh,
+                )
+
+    async def _verify_request_token(
+        self,
+        request_token: RequestToken,
+        verify_type: bool = True,
+        verify_fresh: bool = False,
+        verify_csrf: bool = True,
+    ) -> TokenPayload:
+        """Run the blocklist, signature, claims and token version checks on a request token."""
+        with self._time_stage("blocklist"), self._span("authx.blocklist") as span:
+            revoked = await self.is_token_revoked(request_token.token)
+            if span is not None:
+                span.set_attribute("authx.revoked", revoked)
+        if revoked:
+            raise RevokedTokenError("Token has been revoked")
+
+        payload = self.verify_token(
+            request_token,
+            verify_type=verify_type,
+            verify_fresh=verify_fresh,
+            verify_csrf=verify_csrf,
+        )
+        with self._time_stage("version"):
+            self._check_token_version(payload)
+        return payload
+
+    def _check_token_version(self, payload: TokenPayload) -> None:
+        if not self._is_token_version_current(payload.sub, getattr(payload, "ver", None)):
+            raise RevokedTokenError("Token version is outdated")
+
+    async def authenticate(
+        self,
+        token: str,
+        type: TokenType = "access",
+        verify_type: bool = True,
+        verify_fresh: bool = False,
+        csrf: Optional[str] = None,
+        location: TokenLocation = "headers",
+    ) -> TokenPayload:
+        """Verify an encoded token outside of a request, blocklist and token version included.
+
+        Args:
+            token (str): Encoded token
+            type (TokenType, optional): Expected token type. Defaults to "access".
+            verify_type (bool, optional): Apply token type verification. Defaults to True.
+            verify_fresh (bool, optional): Apply token freshness verification. Defaults to False.
+            csrf (Optional[str], optional): CSRF value sent along a cookie token. Defaults to None.
+            location (TokenLocation, optional): Location the token was read from. Defaults to "headers".
+
+        Note:
+            CSRF is verified for `cookies` tokens when `JWT_COOKIE_CSRF_PROTECT` is enabled.
+
+        Raises:
+            RevokedTokenError: When the token is in the blocklist or its version is outdated
+            JWTDecodeError: When the token cannot be decoded or verified
+
+        Returns:
+            TokenPayload: The verified token payload
+        """
+        request_token = RequestToken(token=token, csrf=csrf, type=type, location=location)
+        try:
+            payload = await self._verify_request_token(
+                request_token,
+                verify_type=verify_type,
+                verify_fresh=verify_fresh,
+                verify_csrf=self._plan.csrf_protect,
+            )
+        except AuthXException as e:
+            self._record_auth(e.__class__.__name__, request_token)
+            raise
+        if self._metrics is not None:
+            self._record_auth("success", request_token)
+        return payload
+
+    async def get_subject(self, payload: TokenPayload) -> Optional[T]:
+        """Retrieve the subject of a verified token payload.
+
+        Uses the subject snapshot claim, the subject cache and the subject getter, in that order.
+
+        Args:
+            payload (TokenPayload): Verified token payload
+
+        Returns:
+            The subject if found, otherwise None.
+        """
+        with self._time_stage("subject"), self._span("authx.subject"):
+            return await self._load_current_subject(uid=payload.sub, snapshot=self._get_subject_snapshot_claim(payload))
+
+    def _get_subject_snapshot_claim(self, token: TokenPayload) -> Any:
+        if self._subject_snapshot is None:
+            return None
+        return getattr(token, self._subject_snapshot.claim, None)
@@ -1,10 +1,10 @@
 """AuthX Configuration Module."""
 
+import functools
 from collections.abc import Sequence
 from datetime import timedelta
 from typing import Optional
 
-from jwt.algorithms import get_default_algorithms, requires_cryptography
 from pydantic import Field
 from pydantic.version import VERSION as PYDANTIC_VERSION
 
@@ -12,6 +12,7 @@ from authx.exceptions import BadConfigurationError
 from authx.types import (
     AlgorithmType,
     HTTPMethods,
+    JTIFormat,
     SameSitePolicy,
     StringOrSequence,
     TokenLocations,
@@ -23,6 +24,15 @@ else:
     from pydantic import BaseSettings  # type: ignore # pragma: no cover
 
 
+@functools.lru_cache(maxsize=1)
+def _algorithm_families() -> tuple[frozenset[str], frozenset[str]]:
+    """Symmetric and asymmetric algorithms supported by PyJWT, built once."""
+    from jwt.algorithms import get_default_algorithms, requires_cryptography
+
+    supported = frozenset(get_default_algorithms())
+    return supported - requires_cryptography, supported & requires_cryptography
+
+
 class AuthXConfig(BaseSettings):
     """AuthX Base Configuration Object.
 
@@ -48,6 +58,7 @@ class AuthXConfig(BaseSettings):
     JWT_ENCODE_NBF: bool = True
     JWT_ERROR_MESSAGE_KEY: str = "msg"
     JWT_IDENTITY_CLAIM: str = "sub"
+    JWT_JTI_FORMAT: JTIFormat = "random"
     JWT_PRIVATE_KEY: Optional[str] = None
     JWT_PUBLIC_KEY: Optional[str] = None
     JWT_REFRESH_TOKEN_EXPIRES: Optional[timedelta] = timedelta(days=20)
@@ -95,12 +106,12 @@ class AuthXConfig(BaseSettings):
     @property
     def is_algo_symmetric(self) -> bool:
         """Check if the JWT_ALGORITHM is a symmetric encryption algorithm."""
-        return self.JWT_ALGORITHM in get_default_algorithms() and self.JWT_ALGORITHM not in requires_cryptography
+        return self.JWT_ALGORITHM in _algorithm_families()[0]
 
     @property
     def is_algo_asymmetric(self) -> bool:
         """Check if the JWT_ALGORITHM is an asymmetric encryption algorithm."""
-        return self.JWT_ALGORITHM in get_default_algorithms() and self.JWT_ALGORITHM in requires_cryptography
+        return self.JWT_ALGORITHM in _algorithm_families()[1]
 
     def _get_key(self, crypto_value: Optional[str]) -> str:
         """Get the key for the algorithm type (symmetric or asymmetric) and the algorithm."""
@@ -109,6 +120,8 @@ class AuthXConfig(BaseSettings):
         elif self.is_algo_asymmetric:
             key = crypto_value
         else:
+            from jwt.algorithms import get_default_algorithms
+
             raise BadConfigurationError(
                 f"JWT_ALGORITHM {self.JWT_ALGORITHM} is not supported, please use one of {get_default_algorithms()}",
             )
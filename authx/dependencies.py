@@ -1,6 +1,8 @@
 """AuthX dependencies for FastAPI."""
 
-from typing import TYPE_CHECKING, Any, Generic, Optional
+import asyncio
+from collections.abc import Awaitable, Generator
+from typing import TYPE_CHECKING, Any, Callable, Generic, Optional
 
 from fastapi import Request, Response
 
@@ -217,3 +219,69 @@ class AuthXDependency(Generic[T]):
         The authenticated subject if present, otherwise None.
         """
         return await self._security.get_current_subject(request=self._request)
+
+
+class LazySubject(Generic[T]):
+    """An awaitable proxy loading the authenticated subject on first access.
+
+    Returned by the `AuthX.LAZY_SUBJECT` dependency. The token is validated when the dependency
+    resolves, but the subject getter only runs once the proxy is awaited. Later accesses within
+    the same request reuse the loaded value.
+
+    Attributes:
+        uid: The subject identifier from the token `sub` claim.
+        loaded: Whether the subject has already been loaded.
+    """
+
+    __slots__ = ("_uid", "_loader", "_loaded", "_value", "_pending")
+
+    def __init__(self, uid: str, loader: Callable[[str], Awaitable[Optional[T]]]) -> None:
+        """Initialize the proxy for a subject identifier.
+
+        Args:
+            uid: The subject identifier from the token `sub` claim.
+            loader: Async callable returning the subject for an identifier.
+        """
+        self._uid = uid
+        self._loader = loader
+        self._loaded = False
+        self._value: Optional[T] = None
+        self._pending: Optional[asyncio.Future[Optional[T]]] = None
+
+    @property
+    def uid(self) -> str:
+        """Retrieve the subject identifier without loading the subject."""
+        return self._uid
+
+    @property
+    def loaded(self) -> bool:
+        """Check whether the subject has already been loaded."""
+        return self._loaded
+
+    async def get(self) -> Optional[T]:
+        """Load the subject on first call and return the cached value afterwards.
+
+        Concurrent first accesses share a single subject getter call.
+
+        Returns:
+        The authenticated subject if present, otherwise None.
+        """
+        if self._loaded:
+            return self._value
+        if self._pending is None:
+            self._pending = asyncio.ensure_future(self._load())
+        return await asyncio.shield(self._pending)
+
+    def __await__(self) -> Generator[Any, None, Optional[T]]:
+        """Allow `await subject` as a shorthand for `await subject.get()`."""
+        return self.get().__await__()
+
+    async def _load(self) -> Optional[T]:
+        try:
+            value = await self._loader(self._uid)
+        except BaseException:
+            self._pending = None
+            raise
+        self._value = value
+        self._loaded = True
+        return value
@@ -1,45 +1,45 @@
 """Main module for AuthX."""
 
 import contextlib
-import datetime
 from collections.abc import Awaitable, Coroutine
 from typing import (
     Any,
     Callable,
     Literal,
     Optional,
-    Union,
     overload,
 )
 
-from fastapi import Depends, Request, Response
+from fastapi import Depends, FastAPI, Request, Response
 
-from authx._internal._callback import _CallbackHandler
+from authx._internal._cookies import CookieTemplates, build_cookie_templates
 from authx._internal._error import _ErrorHandler
-from authx._internal._utils import get_uuid
+from authx._internal._server_timing import ServerTiming, ServerTimingMiddleware
+from authx.base import AuthXCore
 from authx.config import AuthXConfig
 from authx.core import _get_token_from_request
-from authx.dependencies import AuthXDependency
-from authx.exceptions import AuthXException, MissingTokenError, RevokedTokenError
+from authx.dependencies import AuthXDependency, LazySubject
+from authx.exceptions import AuthXException, MissingTokenError
 from authx.schema import RequestToken, TokenPayload
 from authx.types import (
-    DateTimeExpression,
-    StringOrSequence,
     T,
     TokenLocations,
     TokenType,
 )
 
 
-class AuthX(_CallbackHandler[T], _ErrorHandler):
+class AuthX(AuthXCore[T], _ErrorHandler):
     """The base class for AuthX.
 
     AuthX enables JWT management within a FastAPI application.
     Its main purpose is to provide a reusable & simple syntax to protect API
     with JSON Web Token authentication.
 
+    Token minting, verification and callbacks are inherited from the
+    framework independent `authx.base.AuthXCore`.
+
     Args:
-        config (AuthXConfig, optional): Configuration instance to use. Defaults to AuthXConfig().
+        config (Optional[AuthXConfig], optional): Configuration instance to use. Defaults to a new AuthXConfig().
         model (Optional[T], optional): Model type hint. Defaults to dict[str, Any].
 
     Note:
@@ -48,120 +48,21 @@ class AuthX(_CallbackHandler[T], _ErrorHandler):
 
     """
 
-    def __init__(self, config: AuthXConfig = AuthXConfig(), model: Optional[T] = None) -> None:
+    def __init__(self, config: Optional[AuthXConfig] = None, model: Optional[T] = None) -> None:
         """AuthX base object.
 
         Args:
-            config (AuthXConfig, optional): Configuration instance to use. Defaults to AuthXConfig().
+            config (Optional[AuthXConfig], optional): Configuration instance to use. Defaults to a new AuthXConfig().
             model (Optional[T], optional): Model type hint. Defaults to dict[str, Any].
         """
-        self.model: Union[T, dict[str, Any]] = model if model is not None else {}
-        super().__init__(model=model)
-        super(_CallbackHandler, self).__init__()
-        self._config = config
-
-    def load_config(self, config: AuthXConfig) -> None:
-        """Load and store the configuration for the authentication system.
-
-        Sets the internal configuration object with the provided authentication configuration.
-
-        Args:
-            config: The configuration settings for the AuthX authentication system.
-
-        Returns:
-            None
-        """
-        self._config = config
-
-    @property
-    def config(self) -> AuthXConfig:
-        """AuthX Configuration getter.
-
-        Returns:
-            AuthXConfig: Configuration BaseSettings
-        """
-        return self._config
-
-    def _create_payload(
-        self,
-        uid: str,
-        type: str,
-        fresh: bool = False,
-        expiry: Optional[DateTimeExpression] = None,
-        data: Optional[dict[str, Any]] = None,
-        audience: Optional[StringOrSequence] = None,
-        **kwargs: Any,
-    ) -> TokenPayload:
-        # Handle additional data
-        if data is None:
-            data = {}
-        # Handle expiry date
-        exp = expiry
-        if exp is None:
-            exp = self.config.JWT_ACCESS_TOKEN_EXPIRES if type == "access" else self.config.JWT_REFRESH_TOKEN_EXPIRES
-        # Handle CSRF
-        csrf = ""
-        if self.config.has_location("cookies") and self.config.JWT_COOKIE_CSRF_PROTECT:
-            csrf = get_uuid()
-        # Handle audience
-        aud = audience
-        if aud is None:
-            aud = self.config.JWT_ENCODE_AUDIENCE
-        return TokenPayload(
-            sub=uid,
-            fresh=fresh,
-            exp=exp,
-            type=type,
-            iss=self.config.JWT_ENCODE_ISSUER,
-            aud=aud,
-            csrf=csrf,
-            # Handle NBF
-            nbf=None,
-            **data,
-        )
-
-    def _create_token(
-        self,
-        uid: str,
-        type: str,
-        fresh: bool = False,
-        headers: Optional[dict[str, Any]] = None,
-        expiry: Optional[DateTimeExpression] = None,
-        data: Optional[dict[str, Any]] = None,
-        audience: Optional[StringOrSequence] = None,
-        **kwargs: Any,
-    ) -> str:
-        payload = self._create_payload(
-            uid=uid,
-            type=type,
-            fresh=fresh,
-            expiry=expiry,
-            data=data,
-            audience=audience,
-            **kwargs,
-        )
-        return payload.encode(
-            key=self.config.private_key,
-            algorithm=self.config.JWT_ALGORITHM,
-            headers=headers,
-            data=data,
-        )
+        super().__init__(config=config, model=model)
 
-    def _decode_token(
-        self,
-        token: str,
-        verify: bool = True,
-        audience: Optional[StringOrSequence] = None,
-        issuer: Optional[str] = None,
-    ) -> TokenPayload:
-        return TokenPayload.decode(
-            token=token,
-            key=self.config.public_key,
-            algorithms=[self.config.JWT_ALGORITHM],
-            verify=verify,
-            audience=audience or self.config.JWT_DECODE_AUDIENCE,
-            issuer=issuer or self.config.JWT_DECODE_ISSUER,
-        )
+    def _cookie_templates(self, type: str, max_age: Optional[int] = None) -> CookieTemplates:
+        """Token and CSRF cookie templates and deletion headers of a token type, rendered once per config."""
+        # Custom max ages are rendered per call, the plan only holds the configured one
+        if max_age is None:
+            return self._plan.cookie_templates(type)
+        return build_cookie_templates(self._plan.config, type, max_age)
 
     def _set_cookies(
         self,
@@ -172,75 +73,25 @@ class AuthX(_CallbackHandler[T], _ErrorHandler):
         *args: Any,
         **kwargs: Any,
     ) -> None:
-        if type == "access":
-            token_key = self.config.JWT_ACCESS_COOKIE_NAME
-            token_path = self.config.JWT_ACCESS_COOKIE_PATH
-            csrf_key = self.config.JWT_ACCESS_CSRF_COOKIE_NAME
-            csrf_path = self.config.JWT_ACCESS_CSRF_COOKIE_PATH
-        elif type == "refresh":
-            token_key = self.config.JWT_REFRESH_COOKIE_NAME
-            token_path = self.config.JWT_REFRESH_COOKIE_PATH
-            csrf_key = self.config.JWT_REFRESH_CSRF_COOKIE_NAME
-            csrf_path = self.config.JWT_REFRESH_CSRF_COOKIE_PATH
-        else:
-            raise ValueError("Token type must be 'access' | 'refresh'")
-
+        templates = self._cookie_templates(type, max_age)
         # Set cookie
-        response.set_cookie(
-            key=token_key,
-            value=token,
-            path=token_path,
-            domain=self.config.JWT_COOKIE_DOMAIN,
-            samesite=self.config.JWT_COOKIE_SAMESITE,
-            secure=self.config.JWT_COOKIE_SECURE,
-            httponly=True,
-            max_age=max_age or self.config.JWT_COOKIE_MAX_AGE,
-        )
+        response.raw_headers.append(templates.token.header(token))
         # Set CSRF
-        if self.config.JWT_COOKIE_CSRF_PROTECT and self.config.JWT_CSRF_IN_COOKIES:
+        if templates.csrf is not None:
             # Set CSRF cookie to be string not None
             csrf = self._decode_token(token=token, verify=True).csrf
-            str_csrf = csrf if csrf is not None else ""
-            response.set_cookie(
-                key=csrf_key,
-                value=str_csrf,
-                path=csrf_path,
-                domain=self.config.JWT_COOKIE_DOMAIN,
-                samesite=self.config.JWT_COOKIE_SAMESITE,
-                secure=self.config.JWT_COOKIE_SECURE,
-                httponly=False,
-                max_age=max_age or self.config.JWT_COOKIE_MAX_AGE,
-            )
+            response.raw_headers.append(templates.csrf.header(csrf if csrf is not None else ""))
 
     def _unset_cookies(
         self,
         type: str,
         response: Response,
     ) -> None:
-        if type == "access":
-            token_key = self.config.JWT_ACCESS_COOKIE_NAME
-            token_path = self.config.JWT_ACCESS_COOKIE_PATH
-            csrf_key = self.config.JWT_ACCESS_CSRF_COOKIE_NAME
-            csrf_path = self.config.JWT_ACCESS_CSRF_COOKIE_PATH
-        elif type == "refresh":
-            token_key = self.config.JWT_REFRESH_COOKIE_NAME
-            token_path = self.config.JWT_REFRESH_COOKIE_PATH
-            csrf_key = self.config.JWT_REFRESH_CSRF_COOKIE_NAME
-            csrf_path = self.config.JWT_REFRESH_CSRF_COOKIE_PATH
-        else:
-            raise ValueError("Token type must be 'access' | 'refresh'")
+        templates = self._cookie_templates(type)
         # Unset cookie
-        response.delete_cookie(
-            key=token_key,
-            path=token_path,
-            domain=self.config.JWT_COOKIE_DOMAIN,
-        )
-        if self.config.JWT_COOKIE_CSRF_PROTECT and self.config.JWT_CSRF_IN_COOKIES:
-            response.delete_cookie(
-                key=csrf_key,
-                path=csrf_path,
-                domain=self.config.JWT_COOKIE_DOMAIN,
-            )
+        response.raw_headers.append(templates.token_deletion)
+        if templates.csrf_deletion is not None:
+            response.raw_headers.append(templates.csrf_deletion)
 
     @overload
     async def _get_token_from_request(
@@ -267,18 +118,22 @@ class AuthX(_CallbackHandler[T], _ErrorHandler):
         refresh: bool = False,
         optional: bool = False,
     ) -> Optional[RequestToken]:
-        # Simplify the setting of locations based on refresh status
+        plan = self._plan
+        # Default locations come from the plan, in configuration order
         if locations is None:
-            default_locations = set(self.config.JWT_TOKEN_LOCATION)
-            locations = list(default_locations.intersection(["cookies", "json"]) if refresh else default_locations)
+            locations = plan.refresh_locations if refresh else plan.locations
         try:
             # Directly call the internal function to get the token
-            return await _get_token_from_request(
-                request=request,
-                refresh=refresh,
-                locations=locations,
-                config=self.config,
-            )
+            with self._time_stage("extract"), self._span("authx.extract") as span:
+                request_token = await _get_token_from_request(
+                    request=request,
+                    refresh=refresh,
+                    locations=locations,
+                    config=plan.config,
+                )
+                if span is not None:
+                    span.set_attribute("authx.location", request_token.location)
+                return request_token
         except MissingTokenError:
             # Return None if optional, else propagate the exception
             if optional:
@@ -335,117 +190,27 @@ class AuthX(_CallbackHandler[T], _ErrorHandler):
         else:
             ...  # pragma: no cover
         if verify_csrf is None:
-            verify_csrf = self.config.JWT_COOKIE_CSRF_PROTECT and (
-                request.method.upper() in self.config.JWT_CSRF_METHODS
-            )
-
-        request_token = await method(
-            request=request,
-            locations=locations,
-        )
-
-        if self.is_token_in_blocklist(request_token.token):
-            raise RevokedTokenError("Token has been revoked")
-
-        return self.verify_token(
-            request_token,
-            verify_type=verify_type,
-            verify_fresh=verify_fresh,
-            verify_csrf=verify_csrf,
-        )
-
-    def verify_token(
-        self,
-        token: RequestToken,
-        verify_type: bool = True,
-        verify_fresh: bool = False,
-        verify_csrf: bool = True,
-    ) -> TokenPayload:
-        """Verify a request token.
+            verify_csrf = self._plan.csrf_required(request.method)
 
-        Args:
-            token (RequestToken): RequestToken instance
-            verify_type (bool, optional): Apply token type verification. Defaults to True.
-            verify_fresh (bool, optional): Apply token freshness verification. Defaults to False.
-            verify_csrf (bool, optional): Apply token CSRF verification. Defaults to True.
-
-        Returns:
-            TokenPayload: _description_
-        """
-        return token.verify(
-            key=self.config.public_key,
-            algorithms=[self.config.JWT_ALGORITHM],
-            verify_fresh=verify_fresh,
-            verify_type=verify_type,
-            verify_csrf=verify_csrf,
-            audience=self.config.JWT_DECODE_AUDIENCE,
-            issuer=self.config.JWT_DECODE_ISSUER,
-        )
-
-    def create_access_token(
-        self,
-        uid: str,
-        fresh: bool = False,
-        headers: Optional[dict[str, Any]] = None,
-        expiry: Optional[DateTimeExpression] = None,
-        data: Optional[dict[str, Any]] = None,
-        audience: Optional[StringOrSequence] = None,
-        *args: Any,
-        **kwargs: Any,
-    ) -> str:
-        """Generate an Access Token.
-
-        Args:
-            uid (str): Unique identifier to generate token for
-            fresh (bool, optional): Generate fresh token. Defaults to False.
-            headers (Optional[dict[str, Any]], optional): TODO. Defaults to None.
-            expiry (Optional[DateTimeExpression], optional): Use a user defined expiry claim. Defaults to None.
-            data (Optional[dict[str, Any]], optional): Additional data to store in token. Defaults to None.
-            audience (Optional[StringOrSequence], optional): Audience claim. Defaults to None.
-
-        Returns:
-            str: Access Token
-        """
-        return self._create_token(
-            uid=uid,
-            type="access",
-            fresh=fresh,
-            headers=headers,
-            expiry=expiry,
-            data=data,
-            audience=audience,
-        )
-
-    def create_refresh_token(
-        self,
-        uid: str,
-        headers: Optional[dict[str, Any]] = None,
-        expiry: Optional[DateTimeExpression] = None,
-        data: Optional[dict[str, Any]] = None,
-        audience: Optional[StringOrSequence] = None,
-        *args: Any,
-        **kwargs: Any,
-    ) -> str:
-        """Generate a Refresh Token.
-
-        Args:
-            uid (str): Unique identifier to generate token for
-            headers (Optional[dict[str, Any]], optional): TODO. Defaults to None.
-            expiry (Optional[DateTimeExpression], optional): Use a user defined expiry claim. Defaults to None.
-            data (Optional[dict[str, Any]], optional): Additional data to store in token. Defaults to None.
-            audience (Optional[StringOrSequence], optional): Audience claim. Defaults to None.
+        request_token: Optional[RequestToken] = None
+        try:
+            request_token = await method(
+                request=request,
+                locations=locations,
+            )
 
-        Returns:
-            str: Refresh Token
-        """
-        return self._create_token(
-            uid=uid,
-            type="refresh",
-            headers=headers,
-            expiry=expiry,
-            data=data,
-            audience=audience,
-        )
+            payload = await self._verify_request_token(
+                request_token,
+                verify_type=verify_type,
+                verify_fresh=verify_fresh,
+                verify_csrf=verify_csrf,
+            )
+        except AuthXException as e:
+            self._record_auth(e.__class__.__name__, request_token)
+            raise
+        if self._metrics is not None:
+            self._record_auth("success", request_token)
+        return payload
 
     def set_access_cookies(
         self,
@@ -559,6 +324,11 @@ class AuthX(_CallbackHandler[T], _ErrorHandler):
         """FastAPI Dependency to retrieve the current subject from request."""
         return Depends(self.get_current_subject)
 
+    @property
+    def LAZY_SUBJECT(self) -> LazySubject[T]:
+        """FastAPI Dependency to retrieve the current subject from request on first access."""
+        return Depends(self.get_lazy_subject)
+
     def get_dependency(self, request: Request, response: Response) -> AuthXDependency[Any]:
         """FastAPI Dependency to return a AuthX sub-object within the route context.
 
@@ -654,8 +424,23 @@ class AuthX(_CallbackHandler[T], _ErrorHandler):
             The authenticated subject if present, otherwise None.
         """
         token: TokenPayload = await self._auth_required(request=request)
-        uid = token.sub
-        return self._get_current_subject(uid=uid)
+        return await self.get_subject(token)
+
+    async def get_lazy_subject(self, request: Request) -> LazySubject[T]:
+        """Retrieve a lazy proxy to the currently authenticated subject.
+
+        Validates the request token right away, but only calls the subject getter
+        when the returned proxy is first awaited.
+
+        Args:
+            request: The HTTP request containing authentication credentials.
+
+        Returns:
+            A `LazySubject` proxy resolving to the authenticated subject.
+        """
+        token: TokenPayload = await self._auth_required(request=request)
+        # Loaded through get_subject, so the deferred load is timed and traced like an eager one
+        return LazySubject(token.sub, lambda uid: self.get_subject(token))
 
     def get_token_from_request(
         self, type: TokenType = "access", optional: bool = True
@@ -691,6 +476,25 @@ class AuthX(_CallbackHandler[T], _ErrorHandler):
 
         return _token_getter
 
+    def add_server_timing(self, app: FastAPI, sample_rate: float = 1.0, prefix: str = "authx-") -> ServerTiming:
+        """Add the duration of the AuthX stages to the `Server-Timing` header of responses.
+
+        Covers the stages run by dependencies and by the implicit refresh middleware.
+        Call it after adding the other middlewares, so the header middleware wraps them.
+
+        Args:
+            app (FastAPI): Application to add the header to
+            sample_rate (float, optional): Fraction of requests getting the header. Defaults to 1.0.
+            prefix (str, optional): Prefix of the metric names in the header. Defaults to "authx-".
+
+        Returns:
+            ServerTiming: The stage hook collecting the durations
+        """
+        server_timing = ServerTiming(sample_rate=sample_rate, prefix=prefix)
+        self.add_stage_hook(server_timing)
+        app.add_middleware(ServerTimingMiddleware, server_timing=server_timing)
+        return server_timing
+
     def _implicit_refresh_enabled_for_request(self, request: Request) -> bool:
         """Check if a request should implement implicit token refresh.
 
@@ -700,17 +504,34 @@ class AuthX(_CallbackHandler[T], _ErrorHandler):
         Returns:
             bool: True if request allows for refreshing access token
         """
-        if request.url.components.path in self.config.JWT_IMPLICIT_REFRESH_ROUTE_EXCLUDE:
+        plan = self._plan
+        if request.url.components.path in plan.implicit_refresh_route_exclude:
             return False
-        elif request.url.components.path in self.config.JWT_IMPLICIT_REFRESH_ROUTE_INCLUDE:
+        elif request.url.components.path in plan.implicit_refresh_route_include:
             return True
-        elif request.method in self.config.JWT_IMPLICIT_REFRESH_METHOD_EXCLUDE:
+        elif request.method in plan.implicit_refresh_method_exclude:
             return False
-        elif request.method in self.config.JWT_IMPLICIT_REFRESH_METHOD_INCLUDE:
+        elif request.method in plan.implicit_refresh_method_include:
             return False
         else:
             return True
 
+    async def _refresh_subject_snapshot(self, payload: TokenPayload) -> tuple[dict[str, Any], Optional[T]]:
+        """Claims to copy into a refreshed token, and the subject to snapshot in it.
+
+        The snapshot claim is never copied, it would outlive the subject it was taken
+        from. The subject is loaded again to embed a fresh snapshot, when a subject
+        getter is set.
+        """
+        data = payload.extra_dict
+        snapshot = self._subject_snapshot
+        if snapshot is None:
+            return data, None
+        data = {key: value for key, value in data.items() if key != snapshot.claim}
+        if self.callback_get_model_instance is None:
+            return data, None
+        return data, await self._load_current_subject(payload.sub)
+
     async def implicit_refresh_middleware(
         self,
         request: Request,
@@ -740,7 +561,8 @@ class AuthX(_CallbackHandler[T], _ErrorHandler):
         """
         response = await call_next(request)
 
-        if self.config.has_location("cookies") and self._implicit_refresh_enabled_for_request(request):
+        plan = self._plan
+        if plan.has_location("cookies") and self._implicit_refresh_enabled_for_request(request):
             with contextlib.suppress(AuthXException):
                 # Refresh mechanism
                 token = await self._get_token_from_request(
@@ -749,11 +571,14 @@ class AuthX(_CallbackHandler[T], _ErrorHandler):
                     refresh=False,
                     optional=False,
                 )
-                payload = self.verify_token(token, verify_fresh=False)
-                if (
-                    datetime.timedelta(payload.time_until_expiry)  # type: ignore
-                    < self.config.JWT_IMPLICIT_REFRESH_DELTATIME
-                ):
-                    new_token = self.create_access_token(uid=payload.sub, fresh=False, data=payload.extra_dict)
+                # Same CSRF rule as the dependencies, the CSRF header only comes with unsafe methods
+                verify_csrf = plan.csrf_required(request.method)
+                payload = self.verify_token(token, verify_fresh=False, verify_csrf=verify_csrf)
+                self._check_token_version(payload)
+                if payload._seconds_until_expiry < plan.implicit_refresh_seconds:
+                    data, subject = await self._refresh_subject_snapshot(payload)
+                    new_token = self.create_access_token(uid=payload.sub, fresh=False, data=data, subject=subject)
                     self.set_access_cookies(new_token, response=response)
+                    if self._metrics is not None:
+                        self._metrics.record_refresh()
         return response
@@ -12,7 +12,8 @@ from typing import (
 from pydantic import BaseModel, Field, ValidationError
 from pydantic.version import VERSION as PYDANTIC_VERSION
 
-from authx._internal._utils import get_now, get_now_ts, get_uuid
+from authx._internal._ids import get_random_id
+from authx._internal._utils import get_now, get_now_ts
 from authx.exceptions import (
     AccessTokenRequiredError,
     CSRFError,
@@ -37,6 +38,14 @@ else:
     from pydantic import Extra, validator  # pragma: no cover
 
 
+# Messages for the common token type mismatches, avoiding formatting on rejected requests
+_TOKEN_TYPE_ERRORS: dict[tuple[str, Optional[str]], str] = {
+    (required, received): f"'{required}' token required, '{received}' token received"
+    for required in ("access", "refresh")
+    for received in ("access", "refresh")
+}
+
+
 class TokenPayload(BaseModel):
     """A comprehensive Pydantic model for managing JSON Web Token (JWT) payloads with advanced token lifecycle handling.
 
@@ -77,11 +86,11 @@ class TokenPayload(BaseModel):
 
             extra = Extra.allow  # pragma: no cover
 
-    jti: Optional[str] = Field(default_factory=get_uuid)
+    jti: Optional[str] = Field(default_factory=get_random_id)
     iss: Optional[str] = None
     sub: str
     aud: Optional[StringOrSequence] = None
-    exp: Optional[DateTimeExpression] = None
+    exp: Optional[Union[Numeric, DateTimeExpression]] = None
     nbf: Optional[Union[Numeric, DateTimeExpression]] = None
     iat: Optional[Union[Numeric, DateTimeExpression]] = Field(default_factory=lambda: int(get_now_ts()))
     type: Optional[str] = Field(
@@ -144,12 +153,12 @@ class TokenPayload(BaseModel):
         Raises:
             TypeError: If the expiration claim is not a float, int, datetime, or timedelta object.
         """
-        if isinstance(self.exp, datetime.datetime):  # pragma: no cover
+        if isinstance(self.exp, (float, int)):
+            return datetime.datetime.fromtimestamp(self.exp, tz=datetime.timezone.utc)
+        elif isinstance(self.exp, datetime.datetime):  # pragma: no cover
             return self.exp  # pragma: no cover
         elif isinstance(self.exp, datetime.timedelta):
             return self.issued_at + self.exp
-        elif isinstance(self.exp, (float, int)):
-            return datetime.datetime.fromtimestamp(self.exp, tz=datetime.timezone.utc)  # pragma: no cover
         else:
             raise TypeError("'exp' claim should be of type float | int | datetime.datetime")
 
@@ -162,7 +171,14 @@ class TokenPayload(BaseModel):
         Returns:
             A timedelta object representing the remaining time until token expiration.
         """
-        return self.expiry_datetime - get_now()
+        return datetime.timedelta(seconds=self._seconds_until_expiry)
+
+    @property
+    def _seconds_until_expiry(self) -> float:
+        # Epoch arithmetic for the request path, without building datetimes
+        if isinstance(self.exp, (float, int)):
+            return self.exp - get_now_ts()
+        return (self.expiry_datetime - get_now()).total_seconds()
 
     @property
     def time_since_issued(self) -> datetime.timedelta:
@@ -181,10 +197,11 @@ class TokenPayload(BaseModel):
         def _set_default_ts(
             cls, value: Union[float, int, datetime.datetime, datetime.timedelta]
         ) -> Union[float, int]:  # pragma: no cover
+            # Claims are kept as integer epoch seconds, datetimes only come out of the properties
             if isinstance(value, datetime.datetime):
-                return value.timestamp()
+                return int(value.timestamp())
             elif isinstance(value, datetime.timedelta):
-                return (get_now() + value).timestamp()
+                return int(get_now_ts()) + int(value.total_seconds())
             return value
     else:
 
@@ -192,10 +209,11 @@ class TokenPayload(BaseModel):
         def _set_default_ts(
             cls, value: Union[float, int, datetime.datetime, datetime.timedelta]
         ) -> Union[float, int]:  # pragma: no cover
+            # Claims are kept as integer epoch seconds, datetimes only come out of the properties
             if isinstance(value, datetime.datetime):
-                return value.timestamp()
+                return int(value.timestamp())
             elif isinstance(value, datetime.timedelta):
-                return (get_now() + value).timestamp()
+                return int(get_now_ts()) + int(value.total_seconds())
             return value
 
     def has_scopes(self, *scopes: Sequence[str]) -> bool:
@@ -359,10 +377,26 @@ class RequestToken(BaseModel):
             FreshTokenRequiredError: If a fresh token is required but not provided.
             CSRFError: If CSRF token validation fails.
         """
+        decoded_token = self._decode(
+            key=key, algorithms=algorithms, audience=audience, issuer=issuer, verify_jwt=verify_jwt
+        )
+        return self._validate(
+            decoded_token, verify_type=verify_type, verify_csrf=verify_csrf, verify_fresh=verify_fresh
+        )
+
+    def _decode(
+        self,
+        key: str,
+        algorithms: Optional[Sequence[AlgorithmType]] = None,
+        audience: Optional[StringOrSequence] = None,
+        issuer: Optional[str] = None,
+        verify_jwt: bool = True,
+    ) -> dict[str, Any]:
+        """Decode the token, checking its signature and registered claims."""
         if algorithms is None:  # pragma: no cover
             algorithms = ["HS256"]  # pragma: no cover
         try:
-            decoded_token = decode_token(
+            return decode_token(
                 token=self.token,
                 key=key,
                 algorithms=algorithms,
@@ -370,14 +404,26 @@ class RequestToken(BaseModel):
                 audience=audience,
                 issuer=issuer,
             )
-            payload = TokenPayload.model_validate(decoded_token) if PYDANTIC_V2 else TokenPayload(**decoded_token)
         except JWTDecodeError as e:
             raise JWTDecodeError(*e.args) from e
+
+    def _validate(
+        self,
+        decoded_token: dict[str, Any],
+        verify_type: bool = True,
+        verify_csrf: bool = True,
+        verify_fresh: bool = False,
+    ) -> TokenPayload:
+        """Parse the decoded claims and check the token type, freshness and CSRF."""
+        try:
+            payload = TokenPayload.model_validate(decoded_token) if PYDANTIC_V2 else TokenPayload(**decoded_token)
         except ValidationError as e:
             raise JWTDecodeError(*e.args) from e
 
         if verify_type and (self.type != payload.type):
-            error_msg = f"'{self.type}' token required, '{payload.type}' token received"
+            error_msg = _TOKEN_TYPE_ERRORS.get((self.type, payload.type)) or (
+                f"'{self.type}' token required, '{payload.type}' token received"
+            )
             if self.type == "access":
                 raise AccessTokenRequiredError(error_msg)
             elif self.type == "refresh":  # pragma: no cover
@@ -389,7 +435,7 @@ class RequestToken(BaseModel):
 
         if verify_csrf and self.location == "cookies":
             if self.csrf is None:
-                raise CSRFError(f"Missing CSRF token in {self.location}")
+                raise CSRFError("Missing CSRF token in cookies")
             if payload.csrf is None:
                 raise CSRFError("Cookies token missing CSRF claim")  # pragma: no cover
             if not compare_digest(self.csrf, payload.csrf):
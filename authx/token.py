@@ -1,12 +1,14 @@
 """Token encoding and decoding functions."""
 
 import datetime
+import functools
 from collections.abc import Sequence
+from types import ModuleType
 from typing import Any, Optional, Union
 
-import jwt
-
-from authx._internal._utils import RESERVED_CLAIMS, get_now, get_now_ts, get_uuid
+from authx._internal._clock import leeway
+from authx._internal._ids import get_random_id
+from authx._internal._utils import RESERVED_CLAIMS, get_now_ts
 from authx.exceptions import JWTDecodeError
 from authx.types import (
     AlgorithmType,
@@ -17,12 +19,20 @@ from authx.types import (
 )
 
 
+@functools.lru_cache(maxsize=1)
+def _jwt() -> ModuleType:
+    """PyJWT, imported on first use so `import authx` does not load it, then reused by every call."""
+    import jwt
+
+    return jwt
+
+
 def create_token(
     uid: str,
     key: str,
     type: TokenType = "access",
     jti: Optional[str] = None,
-    expiry: Optional[DateTimeExpression] = None,
+    expiry: Optional[Union[Numeric, DateTimeExpression]] = None,
     issued: Optional[Union[Numeric, DateTimeExpression]] = None,
     fresh: bool = False,
     csrf: Optional[str] = None,
@@ -36,7 +46,8 @@ def create_token(
     ignore_errors: bool = True,
 ) -> str:
     """Encode a token."""
-    now = get_now()
+    # Integer epoch seconds from the AuthX clock, timedelta claims are added to it without building datetimes
+    now = int(get_now_ts())
 
     # Filter additional data to remove JWT claims
     additional_claims = {}
@@ -47,7 +58,7 @@ def create_token(
 
     jwt_claims: dict[str, Union[str, bool, float, int, Sequence[str]]] = {
         "sub": uid,
-        "jti": jti or get_uuid(),
+        "jti": jti or get_random_id(),
         "type": type,
     }
 
@@ -55,7 +66,7 @@ def create_token(
         jwt_claims["fresh"] = fresh
 
     if csrf and not isinstance(csrf, str):
-        jwt_claims["csrf"] = get_uuid()
+        jwt_claims["csrf"] = get_random_id()
     elif isinstance(csrf, str):
         jwt_claims["csrf"] = csrf
 
@@ -64,12 +75,12 @@ def create_token(
     elif isinstance(issued, (float, int)):
         jwt_claims["iat"] = issued
     else:
-        jwt_claims["iat"] = get_now_ts()
+        jwt_claims["iat"] = now
 
     if isinstance(expiry, datetime.datetime):
         jwt_claims["exp"] = expiry.timestamp()
     elif isinstance(expiry, datetime.timedelta):
-        jwt_claims["exp"] = (now + expiry).timestamp()
+        jwt_claims["exp"] = now + int(expiry.total_seconds())
     elif isinstance(expiry, (float, int)):
         jwt_claims["exp"] = expiry
 
@@ -81,7 +92,7 @@ def create_token(
     if isinstance(not_before, datetime.datetime):
         jwt_claims["nbf"] = not_before.timestamp()
     elif isinstance(not_before, datetime.timedelta):
-        jwt_claims["nbf"] = (now + not_before).timestamp()
+        jwt_claims["nbf"] = now + int(not_before.total_seconds())
     elif isinstance(not_before, (int, float)):
         jwt_claims["nbf"] = not_before
 
@@ -90,7 +101,7 @@ def create_token(
 
     payload = additional_claims | jwt_claims
 
-    return jwt.encode(payload=payload, key=key, algorithm=algorithm, headers=headers)
+    return _jwt().encode(payload=payload, key=key, algorithm=algorithm, headers=headers)
 
 
 def decode_token(
@@ -109,15 +120,50 @@ def decode_token(
     # Explicitly cast algorithms to list[str]
     # to avoid mypy error: "Value of type "Optional[Sequence[AlgorithmType]]" is not indexable"
     algorithm: list[str] = list(algorithms) if algorithms else ["HS256"]
+    # Time claims are checked below against the AuthX clock, PyJWT would read the system time
+    options = {"verify_signature": verify, "verify_exp": False, "verify_nbf": False, "verify_iat": False}
     try:
-        return jwt.decode(
+        payload: dict[str, Any] = _jwt().decode(
             jwt=token,
             key=key,
             algorithms=algorithm,
             audience=audience,
             issuer=issuer,
-            options={"verify_signature": verify},
+            options=options,
             data=data,
         )
+        if verify:
+            _validate_time_claims(payload, get_now_ts(), leeway())
+        return payload
     except Exception as e:
         raise JWTDecodeError(*e.args) from e
+
+
+def _validate_time_claims(payload: dict[str, Any], now: float, leeway: float = 0.0) -> None:
+    """Check the `iat`, `nbf` and `exp` claims like PyJWT does, at `now` instead of the system time.
+
+    `iat` and `nbf` are accepted up to `leeway` seconds ahead of `now`, the lag of a
+    coarse clock behind tokens minted by a system clock.
+    """
+    jwt = _jwt()
+    if "iat" in payload:
+        try:
+            iat = int(payload["iat"])
+        except ValueError as e:
+            raise jwt.InvalidIssuedAtError("Issued At claim (iat) must be an integer.") from e
+        if iat > now + leeway:
+            raise jwt.ImmatureSignatureError("The token is not yet valid (iat)")
+    if "nbf" in payload:
+        try:
+            nbf = int(payload["nbf"])
+        except ValueError as e:
+            raise jwt.DecodeError("Not Before claim (nbf) must be an integer.") from e
+        if nbf > now + leeway:
+            raise jwt.ImmatureSignatureError("The token is not yet valid (nbf)")
+    if "exp" in payload:
+        try:
+            exp = int(payload["exp"])
+        except ValueError as e:
+            raise jwt.DecodeError("Expiration Time claim (exp) must be an integer.") from e
+        if exp <= now:
+            raise jwt.ExpiredSignatureError("Signature has expired")
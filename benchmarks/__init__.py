@@ -0,0 +1 @@
+"""AuthX benchmarks, run from the repository root, e.g. `python -m benchmarks.import_time`."""
@@ -0,0 +1,64 @@
+"""Machine-readable results and baseline comparison shared by the benchmarks."""
+
+import json
+import platform
+import sys
+from collections.abc import Mapping
+from typing import Any
+
+Results = dict[str, dict[str, float]]
+
+
+def dump(benchmark: str, results: Results) -> dict[str, Any]:
+    """Wrap results with the environment they were measured in."""
+    return {
+        "benchmark": benchmark,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": sys.platform,
+        "results": results,
+    }
+
+
+def save(path: str, benchmark: str, results: Results) -> None:
+    """Write results to a baseline file."""
+    with open(path, "w") as f:
+        json.dump(dump(benchmark, results), f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load(path: str) -> Results:
+    """Read the results of a baseline file."""
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(
+    results: Mapping[str, Mapping[str, float]],
+    baseline: Mapping[str, Mapping[str, float]],
+    metric: str,
+    tolerance: float,
+    higher_is_better: bool = False,
+) -> list[str]:
+    """List the cases whose `metric` regressed by more than `tolerance` (a ratio) against the baseline."""
+    regressions = []
+    for case, values in results.items():
+        previous = baseline.get(case, {}).get(metric)
+        current = values.get(metric)
+        if not previous or current is None:
+            continue
+        ratio = current / previous
+        regressed = ratio < 1 - tolerance if higher_is_better else ratio > 1 + tolerance
+        if regressed:
+            regressions.append(f"{case}: {metric} {previous:.6g} -> {current:.6g} ({ratio - 1:+.1%})")
+    return regressions
+
+
+def report(results: Mapping[str, Mapping[str, float]], columns: list[str]) -> str:
+    """Render results as a plain text table."""
+    width = max([len("case"), *(len(case) for case in results)])
+    lines = ["  ".join(["case".ljust(width), *(column.rjust(12) for column in columns)])]
+    for case, values in results.items():
+        cells = [f"{values[column]:.6g}".rjust(12) if column in values else "-".rjust(12) for column in columns]
+        lines.append("  ".join([case.ljust(width), *cells]))
+    return "\n".join(lines)
@@ -0,0 +1,62 @@
+"""Calibrated timing loops for sync and async callables."""
+
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable
+from typing import Any, Callable
+
+
+def _calibrate(run: Callable[[int], float], min_time: float) -> int:
+    """Smallest power of ten of loops whose run lasts at least `min_time` seconds."""
+    loops = 1
+    while True:
+        if run(loops) >= min_time or loops >= 10**7:
+            return loops
+        loops *= 10
+
+
+def _stats(samples: list[float], loops: int) -> dict[str, float]:
+    per_op = sorted(sample / loops for sample in samples)
+    median = statistics.median(per_op)
+    return {
+        "loops": float(loops),
+        "min_ns": per_op[0] * 1e9,
+        "median_ns": median * 1e9,
+        "stdev_ns": (statistics.stdev(per_op) if len(per_op) > 1 else 0.0) * 1e9,
+        "ops_per_sec": 1 / median if median else 0.0,
+    }
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5, min_time: float = 0.05) -> dict[str, float]:
+    """Time a synchronous callable."""
+
+    def run(loops: int) -> float:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        return time.perf_counter() - start
+
+    loops = _calibrate(run, min_time)
+    return _stats([run(loops) for _ in range(repeat)], loops)
+
+
+def measure_async(
+    fn: Callable[[], Awaitable[Any]],
+    loop: asyncio.AbstractEventLoop,
+    repeat: int = 5,
+    min_time: float = 0.05,
+) -> dict[str, float]:
+    """Time a coroutine function, every loop runs inside a single task on `loop`."""
+
+    async def batch(loops: int) -> float:
+        start = time.perf_counter()
+        for _ in range(loops):
+            await fn()
+        return time.perf_counter() - start
+
+    def run(loops: int) -> float:
+        return loop.run_until_complete(batch(loops))
+
+    loops = _calibrate(run, min_time)
+    return _stats([run(loops) for _ in range(repeat)], loops)
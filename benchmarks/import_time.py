@@ -0,0 +1,113 @@
+"""Import-time and cold-start benchmark.
+
+Every measurement runs in a fresh interpreter so module caches never leak
+between runs. Usage:
+
+    python -m benchmarks.import_time --runs 20
+    python -m benchmarks.import_time --save benchmarks/import_time.json
+    python -m benchmarks.import_time --baseline benchmarks/import_time.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Optional
+
+from benchmarks import _baseline
+
+_TIMER = """
+import time
+_start = time.perf_counter()
+{code}
+print(time.perf_counter() - _start)
+"""
+
+CASES = {
+    "import authx": "import authx",
+    "AuthX()": (
+        "from authx import AuthX, AuthXConfig\nAuthX(AuthXConfig(JWT_SECRET_KEY='secret', JWT_TOKEN_LOCATION=['headers']))"
+    ),
+    "first token": (
+        "from authx import AuthX, AuthXConfig\n"
+        "auth = AuthX(AuthXConfig(JWT_SECRET_KEY='secret', JWT_TOKEN_LOCATION=['headers']))\n"
+        "auth._decode_token(auth.create_access_token(uid='user'))"
+    ),
+}
+
+
+def measure(code: str) -> float:
+    """Seconds spent running `code` in a fresh interpreter, interpreter startup excluded."""
+    output = subprocess.run(
+        [sys.executable, "-c", _TIMER.format(code=code)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def heaviest_imports(module: str = "authx", limit: int = 10) -> list[tuple[str, float]]:
+    """Modules with the highest cumulative import time, in seconds, from `python -X importtime`."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        if cumulative.isdigit():
+            timings.append((name.strip(), int(cumulative) / 1e6))
+    return sorted(timings, key=lambda item: item[1], reverse=True)[:limit]
+
+
+def run(runs: int) -> _baseline.Results:
+    """Measure every case `runs` times."""
+    results: _baseline.Results = {}
+    for case, code in CASES.items():
+        samples = [measure(code) for _ in range(runs)]
+        results[case] = {
+            "min_ms": min(samples) * 1e3,
+            "median_ms": statistics.median(samples) * 1e3,
+            "max_ms": max(samples) * 1e3,
+        }
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line entry point, returns a non-zero status on regression."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per case")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline file")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed median slowdown ratio")
+    parser.add_argument("--top", type=int, default=0, help="also list the N slowest imports")
+    args = parser.parse_args(argv)
+
+    results = run(args.runs)
+    if args.json:
+        print(json.dumps(_baseline.dump("import_time", results), indent=2, sort_keys=True))
+    else:
+        print(_baseline.report(results, ["min_ms", "median_ms", "max_ms"]))
+    if args.top:
+        print()
+        for name, seconds in heaviest_imports(limit=args.top):
+            print(f"{seconds * 1e3:9.2f} ms  {name}")
+    if args.save:
+        _baseline.save(args.save, "import_time", results)
+    if args.baseline:
+        regressions = _baseline.compare(results, _baseline.load(args.baseline), "median_ms", args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
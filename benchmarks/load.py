@@ -0,0 +1,312 @@
+"""In-process load harness for AuthX protected FastAPI routes.
+
+Requests are sent straight to the ASGI application, without sockets, so the
+measure covers FastAPI dependency resolution, middlewares and error handlers
+on top of AuthX itself. Usage:
+
+    python -m benchmarks.load
+    python -m benchmarks.load --scenarios valid subject --requests 5000 --concurrency 32
+    python -m benchmarks.load --mix valid=80,expired=10,missing=10
+    python -m benchmarks.load --save benchmarks/load.json
+    python -m benchmarks.load --baseline benchmarks/load.json --tolerance 0.1
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import random
+import statistics
+import sys
+import time
+from collections.abc import Awaitable
+from typing import Any, Callable, NamedTuple, Optional
+
+from fastapi import Depends, FastAPI
+
+from authx import AuthX, AuthXConfig
+from authx._internal import AuthXMetrics, SubjectCache
+from benchmarks import _baseline
+
+ASGIApp = Callable[[dict[str, Any], Callable[[], Awaitable[dict[str, Any]]], Callable[..., Awaitable[None]]], Any]
+
+
+class Request(NamedTuple):
+    """ASGI request prepared once and replayed, with the status expected in return."""
+
+    method: str
+    path: str
+    headers: list[tuple[bytes, bytes]]
+    expected_status: int
+
+
+class Scenario(NamedTuple):
+    """Application under test and the request it receives."""
+
+    app: FastAPI
+    request: Request
+    # Response header whose presence is required, e.g. `set-cookie` for implicit refresh
+    expected_header: Optional[bytes] = None
+
+
+def build_app(implicit_refresh: bool = False, subject_cache: bool = False, subject_latency: float = 0.0) -> FastAPI:
+    """AuthX protected application with an access route and a current subject route."""
+    config = AuthXConfig(
+        JWT_SECRET_KEY="benchmark-secret-key-of-reasonable-length",
+        JWT_TOKEN_LOCATION=["headers", "cookies"],
+        JWT_COOKIE_CSRF_PROTECT=True,
+        JWT_COOKIE_SECURE=False,
+    )
+    auth: AuthX[dict[str, str]] = AuthX(config=config)
+
+    async def get_subject(uid: str) -> dict[str, str]:
+        if subject_latency:
+            await asyncio.sleep(subject_latency)
+        return {"uid": uid}
+
+    auth.set_subject_getter(get_subject)  # type: ignore[arg-type]
+    if subject_cache:
+        auth.set_subject_cache(SubjectCache(ttl=60.0))
+
+    app = FastAPI()
+    auth.handle_errors(app)
+    if implicit_refresh:
+        app.middleware("http")(auth.implicit_refresh_middleware)
+
+    @app.get("/protected", dependencies=[Depends(auth.access_token_required)])
+    async def protected_get() -> dict[str, bool]:
+        return {"ok": True}
+
+    @app.post("/protected", dependencies=[Depends(auth.access_token_required)])
+    async def protected_post() -> dict[str, bool]:
+        return {"ok": True}
+
+    @app.get("/subject")
+    async def subject(subject: dict[str, str] = auth.CURRENT_SUBJECT) -> dict[str, str]:
+        return subject
+
+    app.state.auth = auth
+    return app
+
+
+def _bearer(token: str) -> list[tuple[bytes, bytes]]:
+    return [(b"authorization", f"Bearer {token}".encode())]
+
+
+def _cookies(auth: AuthX[Any], token: str) -> list[tuple[bytes, bytes]]:
+    csrf = auth._decode_token(token).csrf or ""
+    cookie = f"{auth.config.JWT_ACCESS_COOKIE_NAME}={token}"
+    return [(b"cookie", cookie.encode()), (auth.config.JWT_ACCESS_CSRF_HEADER_NAME.lower().encode(), csrf.encode())]
+
+
+def _valid(latency: float) -> Scenario:
+    app = build_app()
+    token = app.state.auth.create_access_token(uid="user")
+    return Scenario(app, Request("GET", "/protected", _bearer(token), 200))
+
+
+def _expired(latency: float) -> Scenario:
+    app = build_app()
+    token = app.state.auth.create_access_token(uid="user", expiry=datetime.timedelta(seconds=-60))
+    # AuthX answers undecodable tokens with 422
+    return Scenario(app, Request("GET", "/protected", _bearer(token), 422))
+
+
+def _missing(latency: float) -> Scenario:
+    return Scenario(build_app(), Request("GET", "/protected", [], 401))
+
+
+def _cookie_csrf(latency: float) -> Scenario:
+    app = build_app()
+    token = app.state.auth.create_access_token(uid="user")
+    return Scenario(app, Request("POST", "/protected", _cookies(app.state.auth, token), 200))
+
+
+def _implicit_refresh(latency: float) -> Scenario:
+    app = build_app(implicit_refresh=True)
+    # Expires within JWT_IMPLICIT_REFRESH_DELTATIME, every request gets a new cookie
+    token = app.state.auth.create_access_token(uid="user", expiry=datetime.timedelta(minutes=5))
+    request = Request("POST", "/protected", _cookies(app.state.auth, token), 200)
+    return Scenario(app, request, expected_header=b"set-cookie")
+
+
+def _subject(latency: float) -> Scenario:
+    app = build_app(subject_latency=latency)
+    token = app.state.auth.create_access_token(uid="user")
+    return Scenario(app, Request("GET", "/subject", _bearer(token), 200))
+
+
+def _subject_cached(latency: float) -> Scenario:
+    app = build_app(subject_cache=True, subject_latency=latency)
+    token = app.state.auth.create_access_token(uid="user")
+    return Scenario(app, Request("GET", "/subject", _bearer(token), 200))
+
+
+SCENARIOS: dict[str, Callable[[float], Scenario]] = {
+    "valid": _valid,
+    "expired": _expired,
+    "missing": _missing,
+    "cookie_csrf": _cookie_csrf,
+    "implicit_refresh": _implicit_refresh,
+    "subject": _subject,
+    "subject_cached": _subject_cached,
+}
+
+
+async def call(app: ASGIApp, request: Request) -> tuple[int, set[bytes]]:
+    """Send one request to the application, returns the status and the response header names."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": request.method,
+        "scheme": "http",
+        "path": request.path,
+        "raw_path": request.path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": request.headers,
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    received = False
+    status = 0
+    header_names: set[bytes] = set()
+
+    async def receive() -> dict[str, Any]:
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The client stays connected until the response is sent
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}  # pragma: no cover
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            header_names.update(name for name, _ in message.get("headers", []))
+
+    await app(scope, receive, send)
+    return status, header_names
+
+
+async def drive(scenarios: list[Scenario], weights: list[float], requests: int, concurrency: int) -> dict[str, float]:
+    """Replay requests drawn from the weighted scenarios with `concurrency` clients."""
+    latencies: list[float] = []
+    errors = 0
+    remaining = requests
+    rng = random.Random(0)
+
+    async def client() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            scenario = scenarios[0] if len(scenarios) == 1 else rng.choices(scenarios, weights)[0]
+            start = time.perf_counter()
+            try:
+                status, header_names = await call(scenario.app, scenario.request)
+            except Exception:
+                # Unhandled errors are re-raised by Starlette once the 500 response is sent
+                status, header_names = 500, set()
+            latencies.append(time.perf_counter() - start)
+            if status != scenario.request.expected_status or (
+                scenario.expected_header is not None and scenario.expected_header not in header_names
+            ):
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "requests": float(len(latencies)),
+        "errors": float(errors),
+        "rps": len(latencies) / elapsed,
+        "mean_ms": statistics.fmean(latencies) * 1e3,
+        "p50_ms": percentiles[49] * 1e3,
+        "p99_ms": percentiles[98] * 1e3,
+    }
+
+
+def _parse_mix(mix: str) -> dict[str, float]:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        if name not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name!r}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def run(
+    names: list[str],
+    requests: int,
+    concurrency: int,
+    warmup: int = 100,
+    subject_latency: float = 0.0,
+    mix: Optional[dict[str, float]] = None,
+    metrics: bool = False,
+) -> _baseline.Results:
+    """Run every scenario in `names` on its own, then the weighted `mix` if any."""
+    runs: dict[str, tuple[list[Scenario], list[float]]] = {
+        name: ([SCENARIOS[name](subject_latency)], [1.0]) for name in names
+    }
+    if mix:
+        runs["mix"] = ([SCENARIOS[name](subject_latency) for name in mix], list(mix.values()))
+
+    results: _baseline.Results = {}
+    for name, (scenarios, weights) in runs.items():
+        if metrics:
+            for scenario in scenarios:
+                scenario.app.state.auth.set_metrics(AuthXMetrics())
+        if warmup:
+            asyncio.run(drive(scenarios, weights, warmup, concurrency))
+        results[name] = asyncio.run(drive(scenarios, weights, requests, concurrency))
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line entry point, returns a non-zero status on errors or regression."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument("--mix", type=_parse_mix, help="also run a weighted mix, e.g. valid=80,expired=20")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent in-process clients")
+    parser.add_argument("--warmup", type=int, default=100, help="requests sent before measuring")
+    parser.add_argument("--subject-latency", type=float, default=0.0, help="seconds spent by the subject getter")
+    parser.add_argument("--metrics", action="store_true", help="record AuthX metrics during the run")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline file")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed req/s drop ratio")
+    args = parser.parse_args(argv)
+
+    results = run(
+        args.scenarios, args.requests, args.concurrency, args.warmup, args.subject_latency, args.mix, args.metrics
+    )
+    if args.json:
+        print(json.dumps(_baseline.dump("load", results), indent=2, sort_keys=True))
+    else:
+        print(_baseline.report(results, ["rps", "p50_ms", "p99_ms", "errors"]))
+    if args.save:
+        _baseline.save(args.save, "load", results)
+    status = 0
+    for name, values in results.items():
+        if values["errors"]:
+            print(f"ERROR {name}: {values['errors']:.0f} unexpected responses", file=sys.stderr)
+            status = 1
+    if args.baseline:
+        regressions = _baseline.compare(
+            results, _baseline.load(args.baseline), "rps", args.tolerance, higher_is_better=True
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        status = status or int(bool(regressions))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""Microbenchmarks of the AuthX token path.
+
+Covers `create_token`, `decode_token`, `RequestToken.verify` and
+`_get_token_from_request` across the supported algorithms, claim payload
+sizes, token locations and CSRF settings, and `AuthXCore` access token
+minting with its `jti` and CSRF identifiers. Usage:
+
+    python -m benchmarks.micro
+    python -m benchmarks.micro --filter 'HS256|extract' --json
+    python -m benchmarks.micro --save benchmarks/micro.json
+    python -m benchmarks.micro --baseline benchmarks/micro.json --tolerance 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import uuid
+from collections.abc import Awaitable, Iterator
+from typing import Any, Callable, Optional, Union, get_args
+
+from authx._internal import get_random_id
+from authx.base import AuthXCore
+from authx.config import AuthXConfig
+from authx.core import _get_token_from_request
+from authx.schema import RequestToken
+from authx.token import create_token, decode_token
+from authx.types import AlgorithmType, AsymmetricAlgorithmType, SymmetricAlgorithmType, TokenLocation
+from benchmarks import _baseline, _runner
+
+ALGORITHMS: tuple[AlgorithmType, ...] = (*get_args(SymmetricAlgorithmType), *get_args(AsymmetricAlgorithmType))
+LOCATIONS: tuple[TokenLocation, ...] = ("headers", "cookies", "json", "query")
+
+# Number of additional claims, values are short strings
+PAYLOAD_SIZES = {"small": 0, "medium": 16, "large": 128}
+
+Case = tuple[str, Union[Callable[[], Any], Callable[[], Awaitable[Any]]], bool]
+
+
+def _keys(algorithm: str) -> tuple[str, str]:
+    """Signing and verifying keys for an algorithm, PEM encoded for asymmetric ones."""
+    if algorithm.startswith("HS"):
+        return "benchmark-secret-key-of-reasonable-length", "benchmark-secret-key-of-reasonable-length"
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+    private_key: Any
+    if algorithm.startswith(("RS", "PS")):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        curves: dict[str, ec.EllipticCurve] = {
+            "ES256": ec.SECP256R1(),
+            "ES256K": ec.SECP256K1(),
+            "ES384": ec.SECP384R1(),
+            "ES512": ec.SECP521R1(),
+        }
+        private_key = ec.generate_private_key(curves[algorithm])
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public_pem = (
+        private_key.public_key()
+        .public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+        .decode()
+    )
+    return private_pem, public_pem
+
+
+def _claims(size: str) -> dict[str, Any]:
+    return {f"claim_{i}": f"value-{i:04d}" for i in range(PAYLOAD_SIZES[size])}
+
+
+def _request(location: TokenLocation, token: str, csrf: Optional[str], config: AuthXConfig) -> Callable[[], Any]:
+    """Factory of fresh Starlette requests carrying the token, requests cache their parsed content."""
+    from starlette.requests import Request
+
+    headers: list[tuple[bytes, bytes]] = []
+    body = b""
+    query = b""
+    method = "POST" if csrf else "GET"
+    if location == "headers":
+        headers.append((config.JWT_HEADER_NAME.lower().encode(), f"{config.JWT_HEADER_TYPE} {token}".encode()))
+    elif location == "cookies":
+        headers.append((b"cookie", f"{config.JWT_ACCESS_COOKIE_NAME}={token}".encode()))
+        if csrf:
+            headers.append((config.JWT_ACCESS_CSRF_HEADER_NAME.lower().encode(), csrf.encode()))
+    elif location == "json":
+        body = json.dumps({config.JWT_JSON_KEY: token}).encode()
+        headers.append((b"content-type", b"application/json"))
+    else:
+        query = f"{config.JWT_QUERY_STRING_NAME}={token}".encode()
+    scope = {"type": "http", "method": method, "path": "/", "headers": headers, "query_string": query}
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return lambda: Request(scope, receive)
+
+
+def cases(algorithms: tuple[str, ...] = ALGORITHMS) -> Iterator[Case]:
+    """Yield `(name, callable, is_async)` for every benchmark case."""
+    for algorithm in algorithms:
+        private_key, public_key = _keys(algorithm)
+        for size in PAYLOAD_SIZES:
+            data = _claims(size)
+            token = create_token(uid="benchmark", key=private_key, algorithm=algorithm, data=data)  # type: ignore[arg-type]
+            request_token = RequestToken(token=token, location="headers")
+            yield (
+                f"create_token/{algorithm}/{size}",
+                lambda key=private_key, alg=algorithm, data=data: create_token(
+                    uid="benchmark", key=key, algorithm=alg, data=data
+                ),
+                False,
+            )
+            yield (
+                f"decode_token/{algorithm}/{size}",
+                lambda token=token, key=public_key, alg=algorithm: decode_token(token, key=key, algorithms=[alg]),
+                False,
+            )
+            yield (
+                f"verify/{algorithm}/{size}/headers",
+                lambda rt=request_token, key=public_key, alg=algorithm: rt.verify(key=key, algorithms=[alg]),
+                False,
+            )
+
+    key, _ = _keys("HS256")
+    for csrf_protect in (False, True):
+        csrf_setting = "csrf" if csrf_protect else "nocsrf"
+        config = AuthXConfig(
+            JWT_SECRET_KEY=key,
+            JWT_TOKEN_LOCATION=list(LOCATIONS),
+            JWT_COOKIE_CSRF_PROTECT=csrf_protect,
+        )
+        csrf = "benchmark-csrf" if csrf_protect else None
+        token = create_token(uid="benchmark", key=key, csrf=csrf or "")
+        for location in LOCATIONS:
+            request_csrf = csrf if location == "cookies" else None
+            request_token = RequestToken(token=token, csrf=request_csrf, location=location)
+            yield (
+                f"verify/HS256/small/{location}/{csrf_setting}",
+                lambda rt=request_token, protect=csrf_protect: rt.verify(key=key, verify_csrf=protect),
+                False,
+            )
+            make_request = _request(location, token, request_csrf, config)
+            yield (
+                f"extract/{location}/{csrf_setting}",
+                lambda make=make_request, config=config, loc=location: _get_token_from_request(
+                    make(), config=config, locations=[loc]
+                ),
+                True,
+            )
+        # Token found in the last configured location, every other getter fails first
+        make_request = _request("query", token, None, config)
+        yield (
+            f"extract/fallthrough/{csrf_setting}",
+            lambda make=make_request, config=config: _get_token_from_request(make(), config=config),
+            True,
+        )
+        # Bulk issue, a `jti` per token and a CSRF value with cookies CSRF protection
+        core: AuthXCore[Any] = AuthXCore(config=config)
+        yield (f"mint/HS256/{csrf_setting}", lambda core=core: core.create_access_token(uid="benchmark"), False)
+
+    yield ("ids/uuid4", lambda: str(uuid.uuid4()), False)
+    yield ("ids/random_id", get_random_id, False)
+
+
+def run(pattern: Optional[str], algorithms: tuple[str, ...], repeat: int, min_time: float) -> _baseline.Results:
+    """Run the cases whose name matches `pattern`."""
+    matcher = re.compile(pattern) if pattern else None
+    loop = asyncio.new_event_loop()
+    results: _baseline.Results = {}
+    try:
+        for name, fn, is_async in cases(algorithms):
+            if matcher is not None and not matcher.search(name):
+                continue
+            if is_async:
+                results[name] = _runner.measure_async(fn, loop, repeat=repeat, min_time=min_time)
+            else:
+                results[name] = _runner.measure(fn, repeat=repeat, min_time=min_time)
+    finally:
+        loop.close()
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line entry point, returns a non-zero status on regression."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", metavar="REGEX", help="only run the matching cases")
+    parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), choices=ALGORITHMS)
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per timed run")
+    parser.add_argument("--json", action="store_true", help="print machine-readable results")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline file")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed median slowdown ratio")
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, tuple(args.algorithms), args.repeat, args.min_time)
+    if args.json:
+        print(json.dumps(_baseline.dump("micro", results), indent=2, sort_keys=True))
+    else:
+        print(_baseline.report(results, ["median_ns", "stdev_ns", "ops_per_sec"]))
+    if args.save:
+        _baseline.save(args.save, "micro", results)
+    if args.baseline:
+        regressions = _baseline.compare(results, _baseline.load(args.baseline), "median_ns", args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+#!/usr/bin/env bash
+
+set -e
+set -x
+
+# Usage: scripts/benchmark.sh [micro|load|import_time] [benchmark options]
+BENCHMARK="${1:-micro}"
+shift || true
+
+export PYTHONPATH=.
+python -m "benchmarks.${BENCHMARK}" "$@"
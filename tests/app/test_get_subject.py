@@ -53,3 +53,20 @@ def _test_get_subject_resources(api, access_token, argument):
     assert len(result.json()["resources"]) == argument
 
     return result
+
+
+def test_lazy_subject_not_loaded(api, access_token: str):
+    response = api.get("/entity/subject/lazy", headers={"Authorization": f"Bearer {access_token}"})
+    assert response.status_code == 200
+    assert response.json() == {"uid": "test", "loaded": False}
+
+
+def test_lazy_subject_loaded(api, access_token: str):
+    response = api.get("/entity/subject/lazy?load=true", headers={"Authorization": f"Bearer {access_token}"})
+    assert response.status_code == 200
+    assert response.json()["subject"]["email"] == "test@test.com"
+
+
+def test_lazy_subject_requires_token(api):
+    with pytest.raises(exc.MissingTokenError):
+        api.get("/entity/subject/lazy")
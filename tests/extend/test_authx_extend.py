@@ -6,14 +6,13 @@ from fastapi.responses import JSONResponse
 from starlette.datastructures import Headers, MutableHeaders
 
 from authx import AuthX
+from authx.config import AuthXConfig
 from authx.exceptions import AuthXException
 
 
 @pytest.fixture(scope="function")
 def authx():
-    authx = AuthX()
-    authx._config.JWT_SECRET_KEY = "SECRET"
-    authx._config.JWT_TOKEN_LOCATION = ["headers", "json", "cookies"]
+    authx = AuthX(config=AuthXConfig(JWT_SECRET_KEY="SECRET", JWT_TOKEN_LOCATION=["headers", "json", "cookies"]))
 
     return authx
 
@@ -68,7 +67,13 @@ async def test_implicit_refresh_middleware(authx, mock_request, mock_response):
         return mock_response
 
     old_token = authx.create_access_token(uid="test_user", expiry=timedelta(seconds=1))
-    authx.config.JWT_IMPLICIT_REFRESH_DELTATIME = timedelta(minutes=5)
+    authx.load_config(
+        AuthXConfig(
+            JWT_SECRET_KEY="SECRET",
+            JWT_TOKEN_LOCATION=["headers", "json", "cookies"],
+            JWT_IMPLICIT_REFRESH_DELTATIME=timedelta(minutes=5),
+        )
+    )
 
     mock_request._cookies = {authx.config.JWT_ACCESS_COOKIE_NAME: old_token}
 
@@ -0,0 +1,11 @@
+import pytest
+
+from authx import AuthX, AuthXConfig
+
+
+@pytest.fixture(scope="function")
+def security():
+    """Fixture for AuthX reading tokens from headers, with a subject getter returning `{"uid": uid}`."""
+    security = AuthX(config=AuthXConfig(JWT_SECRET_KEY="secret", JWT_TOKEN_LOCATION=["headers"]))
+    security.set_subject_getter(lambda uid: {"uid": uid})
+    return security
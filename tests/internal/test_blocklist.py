@@ -0,0 +1,240 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+import authx.exceptions as exc
+from authx import AuthX, AuthXConfig
+from authx._internal import FakeClock, SQLiteBlocklist, get_time_ordered_id, set_clock
+from tests.utils import bearer_request
+
+
+@pytest.fixture(scope="function")
+def blocklist(tmp_path):
+    blocklist = SQLiteBlocklist(str(tmp_path / "blocklist.db"), flush_interval=0.01)
+    yield blocklist
+    blocklist.close()
+
+
+def test_wal_mode(blocklist: SQLiteBlocklist):
+    assert blocklist._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_revoke_without_event_loop_is_persisted(blocklist: SQLiteBlocklist):
+    blocklist.revoke("jti-1", exp=int(time.time()) + 60)
+    assert blocklist._pending_writes == {}
+    assert blocklist.is_revoked("jti-1")
+    assert not blocklist.is_revoked("jti-2")
+
+
+@pytest.mark.asyncio
+async def test_revoke_is_written_behind(blocklist: SQLiteBlocklist):
+    blocklist.revoke("jti-1")
+    assert "jti-1" in blocklist._pending_writes
+    assert await blocklist.contains("jti-1")
+
+    await asyncio.sleep(0.05)
+    assert blocklist._pending_writes == {}
+    assert await blocklist.contains("jti-1")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_query(blocklist: SQLiteBlocklist):
+    blocklist.flush()
+    for jti in ("a", "b"):
+        blocklist.revoke(jti)
+    blocklist.flush()
+
+    with patch.object(blocklist, "_query", wraps=blocklist._query) as query:
+        results = await asyncio.gather(*(blocklist.contains(jti) for jti in ("a", "b", "c", "a")))
+
+    assert results == [True, True, False, True]
+    query.assert_called_once()
+    assert sorted(query.call_args.args[0]) == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_lookups_run_off_the_event_loop(blocklist: SQLiteBlocklist):
+    threads = []
+
+    def query(jtis):
+        threads.append(threading.get_ident())
+        return set()
+
+    with patch.object(blocklist, "_query", side_effect=query):
+        assert not await blocklist.contains("a")
+    assert threads and threads[0] != threading.get_ident()
+
+
+@pytest.mark.asyncio
+async def test_lookup_errors_reach_every_waiter(blocklist: SQLiteBlocklist):
+    with patch.object(blocklist, "_query", side_effect=sqlite3.OperationalError("locked")):
+        results = await asyncio.gather(blocklist.contains("a"), blocklist.contains("b"), return_exceptions=True)
+    assert all(isinstance(result, sqlite3.OperationalError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_writes_run_off_the_event_loop(blocklist: SQLiteBlocklist):
+    threads = []
+    write = blocklist._write
+
+    def record_write():
+        threads.append(threading.get_ident())
+        write()
+
+    with patch.object(blocklist, "_write", side_effect=record_write):
+        blocklist.revoke("a")
+        await asyncio.sleep(0.05)
+        blocklist.revoke_issued_between(time.time() - 60, time.time() + 60)
+        await asyncio.sleep(0.05)
+
+    assert len(threads) == 2 and threading.get_ident() not in threads
+    assert blocklist._pending_writes == {} and blocklist._pending_ranges == {}
+    assert blocklist.is_revoked("a")
+    assert blocklist.is_revoked(get_time_ordered_id())
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_running_lookups(blocklist: SQLiteBlocklist):
+    started, release = threading.Event(), threading.Event()
+    refresh = blocklist._refresh_ranges
+
+    def slow_refresh():
+        started.set()
+        release.wait(2)
+        refresh()
+
+    with patch.object(blocklist, "_refresh_ranges", side_effect=slow_refresh):
+        lookup = asyncio.ensure_future(blocklist.contains("a"))
+        assert await asyncio.get_running_loop().run_in_executor(None, started.wait, 2)
+        closer = threading.Thread(target=blocklist.close)
+        closer.start()
+        closer.join(0.05)
+        assert closer.is_alive()
+        release.set()
+        assert not await lookup
+        closer.join(2)
+
+    assert blocklist._closed
+    with pytest.raises(sqlite3.ProgrammingError):
+        await blocklist.contains("a")
+
+
+def test_prune_expired_rows(blocklist: SQLiteBlocklist):
+    now = int(time.time())
+    blocklist.revoke("expired", exp=now - 10)
+    blocklist.revoke("valid", exp=now + 60)
+    blocklist.revoke("forever")
+
+    assert not blocklist.is_revoked("expired")
+    assert blocklist.is_revoked("valid")
+    assert blocklist.is_revoked("forever")
+    assert blocklist.prune() == 0
+
+
+def test_prune_limit_zero(blocklist: SQLiteBlocklist):
+    with blocklist._conn:
+        blocklist._conn.execute(
+            "INSERT INTO authx_blocklist (jti, exp) VALUES ('expired', ?)", (int(time.time()) - 10,)
+        )
+
+    assert blocklist.prune(limit=0) == 0
+    assert blocklist.prune() == 1
+
+
+def test_revoke_token_without_jti(blocklist: SQLiteBlocklist):
+    with pytest.raises(ValueError):
+        blocklist.revoke_token("not.a.token")
+
+
+@pytest.mark.asyncio
+async def test_authx_async_blocklist_callback(blocklist: SQLiteBlocklist):
+    security = AuthX(config=AuthXConfig(JWT_SECRET_KEY="secret", JWT_TOKEN_LOCATION=["headers"]))
+    security.set_token_blocklist(blocklist)
+
+    token = security.create_access_token(uid="test")
+    payload = await security._auth_required(bearer_request(token))
+    assert payload.sub == "test"
+
+    blocklist.revoke_token(token)
+    with pytest.raises(exc.RevokedTokenError):
+        await security._auth_required(bearer_request(token))
+
+
+@pytest.mark.asyncio
+async def test_revoke_issued_between(tmp_path):
+    path = str(tmp_path / "blocklist.db")
+    blocklist = SQLiteBlocklist(path)
+    security = AuthX(config=AuthXConfig(JWT_SECRET_KEY="secret", JWT_JTI_FORMAT="ulid"))
+    clock = FakeClock(start=time.time())
+    previous = set_clock(clock)
+    try:
+        tokens = []
+        for _ in range(3):
+            tokens.append(security.create_access_token(uid="test"))
+            clock.advance(60)
+        jtis = [security._decode_token(token, verify=False).jti or "" for token in tokens]
+        blocklist.revoke_issued_between(clock.time() - 150, clock.time() - 90, exp=int(time.time()) + 3600)
+
+        assert [await blocklist.contains(jti) for jti in jtis] == [False, True, False]
+        assert await blocklist(tokens[1])
+        # Random identifiers are never matched by ranges
+        assert not blocklist.is_revoked("0" * 24)
+    finally:
+        set_clock(previous)
+        blocklist.close()
+
+    reopened = SQLiteBlocklist(path)
+    assert [reopened.is_revoked(jti) for jti in jtis] == [False, True, False]
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_ranges_revoked_by_another_worker(tmp_path):
+    path = str(tmp_path / "blocklist.db")
+    workers = [SQLiteBlocklist(path), SQLiteBlocklist(path)]
+    try:
+        now = time.time()
+        jti = get_time_ordered_id()
+        assert not await workers[1].contains(jti)
+
+        workers[0].revoke_issued_between(now - 60, now + 60)
+        # Waits for the write started on the executor
+        workers[0].flush()
+
+        assert await workers[1].contains(jti)
+        assert workers[1].is_revoked(get_time_ordered_id())
+        assert workers[1]._ranges == workers[0]._ranges
+    finally:
+        for worker in workers:
+            worker.close()
+
+
+def test_expired_ranges_are_pruned(blocklist: SQLiteBlocklist):
+    now = time.time()
+    blocklist.revoke_issued_between(now - 120, now - 60, exp=int(now) - 1)
+    assert blocklist._ranges
+    blocklist.prune()
+    assert blocklist._ranges == []
+
+
+def test_prune_issued_before(blocklist: SQLiteBlocklist):
+    security = AuthX(config=AuthXConfig(JWT_SECRET_KEY="secret", JWT_JTI_FORMAT="ulid"))
+    clock = FakeClock(start=time.time() - 3600)
+    previous = set_clock(clock)
+    try:
+        old = security._decode_token(security.create_access_token(uid="test"), verify=False).jti or ""
+        clock.advance(3600)
+        recent = security._decode_token(security.create_access_token(uid="test"), verify=False).jti or ""
+    finally:
+        set_clock(previous)
+    for jti in (old, recent, "random-identifier-24char"):
+        blocklist.revoke(jti)
+
+    assert blocklist.prune_issued_before(time.time() - 60) == 1
+    assert not blocklist.is_revoked(old)
+    assert blocklist.is_revoked(recent)
+    assert blocklist.is_revoked("random-identifier-24char")
@@ -0,0 +1,122 @@
+import os
+import socket
+import threading
+
+import pytest
+
+from authx import AuthX, AuthXConfig, RequestToken
+from authx._internal import InvalidationChannel, MemoryVersionTable, SubjectCache, UnixSocketInvalidationChannel
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requires Unix domain sockets")
+
+
+@pytest.fixture(scope="function")
+def channels(tmp_path):
+    channels = [UnixSocketInvalidationChannel(str(tmp_path), poll_interval=0.05) for _ in range(3)]
+    yield channels
+    for channel in channels:
+        channel.close()
+
+
+def _collector(expected: int):
+    received = []
+    done = threading.Event()
+
+    def callback(uid: str) -> None:
+        received.append(uid)
+        if len(received) >= expected:
+            done.set()
+
+    return received, done, callback
+
+
+def test_unix_socket_channel_is_an_invalidation_channel(channels):
+    assert isinstance(channels[0], InvalidationChannel)
+
+
+def test_publish_reaches_every_peer_but_self(channels):
+    publisher, *peers = channels
+    collected = [_collector(1) for _ in channels]
+    for channel, (_, _, callback) in zip(channels, collected):
+        channel.subscribe(callback)
+
+    publisher.publish("u1")
+
+    for received, done, _ in collected[1:]:
+        assert done.wait(2)
+        assert received == ["u1"]
+    assert collected[0][0] == []
+
+
+def test_publish_removes_stale_sockets(tmp_path):
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    stale_path = str(tmp_path / "authx-0-dead.sock")
+    stale.bind(stale_path)
+    stale.close()
+
+    channel = UnixSocketInvalidationChannel(str(tmp_path), poll_interval=0.05)
+    try:
+        channel.publish("u1")
+    finally:
+        channel.close()
+    assert not os.path.exists(stale_path)
+    assert not os.path.exists(channel.path)
+
+
+def test_directory_must_be_private(tmp_path):
+    default = UnixSocketInvalidationChannel(poll_interval=0.05)
+    try:
+        assert os.stat(default.directory).st_mode & 0o777 == 0o700
+    finally:
+        default.close()
+
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(PermissionError):
+        UnixSocketInvalidationChannel(str(shared))
+    assert os.listdir(shared) == []
+
+
+def test_authx_invalidate_subject_broadcast(channels):
+    workers = []
+    for channel in channels[:2]:
+        security = AuthX()
+        security.set_subject_cache(SubjectCache())
+        security.subject_cache.set("u1", {"uid": "u1"})
+        security.set_invalidation_channel(channel)
+        workers.append(security)
+
+    received, done, callback = _collector(1)
+    channels[1].subscribe(callback)
+
+    workers[0].invalidate_subject("u1")
+
+    assert done.wait(2)
+    assert "u1" not in workers[0].subject_cache
+    assert "u1" not in workers[1].subject_cache
+
+
+def test_authx_bump_subject_version_broadcast(channels):
+    workers = []
+    for channel in channels[:2]:
+        security = AuthX(config=AuthXConfig(JWT_SECRET_KEY="secret", JWT_TOKEN_LOCATION=["headers"]))
+        security.set_token_versions(MemoryVersionTable())
+        security.set_subject_cache(SubjectCache())
+        security.subject_cache.set("u1", {"uid": "u1"})
+        security.set_invalidation_channel(channel)
+        workers.append(security)
+    payload = workers[0].verify_token(RequestToken(token=workers[0].create_access_token(uid="u1"), location="headers"))
+
+    received, done, callback = _collector(1)
+    channels[1].subscribe(callback)
+
+    assert workers[0].bump_subject_version("u1") == 1
+
+    assert done.wait(2)
+    assert workers[1].token_versions.get("u1") == 1
+    assert "u1" not in workers[1].subject_cache
+    assert not workers[1]._is_token_version_current("u1", payload.ver)
+    # Stale or repeated bumps never lower a version
+    workers[1]._on_invalidation(received[0])
+    assert workers[1].token_versions.get("u1") == 1
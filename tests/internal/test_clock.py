@@ -0,0 +1,119 @@
+import datetime
+import time
+
+import pytest
+
+from authx import AuthXConfig
+from authx._internal import Clock, CoarseClock, FakeClock, SystemClock, get_clock, get_now, get_now_ts, set_clock
+from authx.base import AuthXCore
+from authx.exceptions import JWTDecodeError
+from authx.token import create_token, decode_token
+
+
+@pytest.fixture(scope="function")
+def clock():
+    clock = FakeClock(start=1_700_000_000.0)
+    previous = set_clock(clock)
+    yield clock
+    set_clock(previous)
+
+
+def test_default_clock():
+    assert isinstance(get_clock(), SystemClock)
+    assert isinstance(get_clock(), Clock)
+    assert abs(get_now_ts() - time.time()) < 1
+
+
+def test_coarse_clock_refreshes_per_resolution():
+    monotonic = [100.0]
+    coarse = CoarseClock(resolution=1.0, timer=lambda: monotonic[0])
+    first = coarse.time()
+    assert abs(first - time.time()) < 1
+    monotonic[0] += 0.5
+    assert coarse.time() == first
+    monotonic[0] += 0.5
+    assert coarse.time() == pytest.approx(first + 1.0)
+
+
+def test_coarse_clock_invalid_resolution():
+    with pytest.raises(ValueError):
+        CoarseClock(resolution=-1)
+
+
+def test_fake_clock(clock: FakeClock):
+    assert get_now_ts() == 1_700_000_000.0
+    assert get_now() == datetime.datetime(2023, 11, 14, 22, 13, 20, tzinfo=datetime.timezone.utc)
+    clock.advance(10)
+    assert get_now_ts() == 1_700_000_010.0
+    clock.set(0)
+    assert get_now_ts() == 0
+
+
+def test_tokens_use_clock(clock: FakeClock):
+    auth = AuthXCore(config=AuthXConfig(JWT_SECRET_KEY="secret", JWT_TOKEN_LOCATION=["headers"]))
+    clock.set(int(time.time()) - 3600)
+    token = auth.create_access_token(uid="user", expiry=datetime.timedelta(minutes=5))
+    clock.set(time.time())
+    payload = auth._decode_token(token, verify=False)
+    assert payload.expiry_datetime - payload.issued_at == datetime.timedelta(minutes=5)
+    assert payload.time_until_expiry < datetime.timedelta(0)
+
+
+def test_decoding_uses_clock(clock: FakeClock):
+    auth = AuthXCore(config=AuthXConfig(JWT_SECRET_KEY="secret", JWT_TOKEN_LOCATION=["headers"]))
+    token = auth.create_access_token(uid="user", expiry=datetime.timedelta(minutes=5))
+    # Verified at the fake time, far in the past of the system time
+    assert auth._decode_token(token).sub == "user"
+
+    clock.advance(300)
+    with pytest.raises(JWTDecodeError, match="Signature has expired"):
+        auth._decode_token(token)
+    assert auth._decode_token(token, verify=False).sub == "user"
+
+
+def test_decoding_checks_nbf_and_iat_against_clock(clock: FakeClock):
+    token = create_token(uid="user", key="secret", not_before=datetime.timedelta(minutes=1))
+    with pytest.raises(JWTDecodeError, match=r"not yet valid \(nbf\)"):
+        decode_token(token, key="secret")
+    clock.advance(60)
+    assert decode_token(token, key="secret")["sub"] == "user"
+
+    clock.advance(3600)
+    token = create_token(uid="user", key="secret")
+    clock.advance(-3600)
+    with pytest.raises(JWTDecodeError, match=r"not yet valid \(iat\)"):
+        decode_token(token, key="secret")
+
+
+def test_coarse_clock_accepts_tokens_minted_within_resolution(monkeypatch: pytest.MonkeyPatch):
+    coarse = CoarseClock(resolution=5.0, timer=lambda: 100.0)
+    previous = set_clock(coarse)
+    try:
+        cached = get_now_ts()
+        # Another worker mints with the system clock, ahead of the cached reading
+        set_clock(SystemClock())
+        monkeypatch.setattr(time, "time", lambda: cached + 4.9)
+        token = create_token(uid="user", key="secret", not_before=datetime.timedelta(0))
+        monkeypatch.setattr(time, "time", lambda: cached + 6)
+        too_early = create_token(uid="user", key="secret")
+
+        set_clock(coarse)
+        assert decode_token(token, key="secret")["sub"] == "user"
+        with pytest.raises(JWTDecodeError, match=r"not yet valid \(iat\)"):
+            decode_token(too_early, key="secret")
+    finally:
+        set_clock(previous)
+
+
+def test_coarse_clock_follows_system_time_forward(monkeypatch: pytest.MonkeyPatch):
+    monotonic = [100.0]
+    coarse = CoarseClock(resolution=1.0, timer=lambda: monotonic[0])
+    first = coarse.time()
+    monotonic[0] += 1.0
+    # The system time ran ahead of the monotonic timer, the clock catches up on refresh
+    monkeypatch.setattr(time, "time", lambda: first + 60)
+    assert coarse.time() == pytest.approx(first + 60)
+    # It does not follow the system time backwards
+    monotonic[0] += 1.0
+    monkeypatch.setattr(time, "time", lambda: first)
+    assert coarse.time() == pytest.approx(first + 61)
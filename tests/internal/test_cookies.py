@@ -0,0 +1,51 @@
+import re
+
+import pytest
+from starlette.responses import Response
+
+from authx import AuthX, AuthXConfig
+from authx._internal._cookies import CookieTemplate, deletion_header
+
+
+@pytest.mark.parametrize(
+    "attributes",
+    [
+        {},
+        {"path": "/api", "domain": "example.com", "samesite": "none", "secure": True, "httponly": True},
+        {"path": None, "samesite": None, "max_age": 3600},
+        {"samesite": "strict", "max_age": 0},
+    ],
+)
+@pytest.mark.parametrize("value", ["eyJhbGciOi.eyJzdWIiOi.c2lnbmF0dXJl", "Ab3_-x", "", "with space", 'quote"d'])
+def test_template_matches_starlette(attributes, value):
+    response = Response()
+    response.set_cookie("access_token_cookie", value, **attributes)
+    assert CookieTemplate("access_token_cookie", **attributes).header(value) == response.raw_headers[-1]
+
+
+def test_deletion_header_matches_starlette():
+    response = Response()
+    response.delete_cookie("csrf_access_token", path="/api", domain="example.com")
+    expires = re.compile(rb"expires=[^;]+; ")
+    header = deletion_header("csrf_access_token", path="/api", domain="example.com")
+    assert expires.sub(b"", header[1]) == expires.sub(b"", response.raw_headers[-1][1])
+
+
+def test_cookie_templates_are_rendered_once():
+    config = AuthXConfig(JWT_SECRET_KEY="secret", JWT_TOKEN_LOCATION=["cookies"], JWT_COOKIE_DOMAIN="example.com")
+    authx = AuthX(config=config)
+    token = authx.create_access_token(uid="user")
+
+    assert authx._cookie_templates("access") is authx._cookie_templates("access")
+    assert authx._cookie_templates("access", max_age=60) is not authx._cookie_templates("access", max_age=60)
+
+    response = Response()
+    authx.set_access_cookies(token, response, max_age=60)
+    token_cookie, csrf_cookie = response.headers.getlist("set-cookie")
+    assert token_cookie.startswith(f"access_token_cookie={token}; Domain=example.com; HttpOnly; Max-Age=60")
+    assert csrf_cookie.startswith(f"csrf_access_token={authx._decode_token(token).csrf}; Domain=example.com")
+
+    authx.load_config(AuthXConfig(JWT_SECRET_KEY="secret", JWT_TOKEN_LOCATION=["cookies"]))
+    response = Response()
+    authx.unset_access_cookies(response)
+    assert all("Domain" not in cookie for cookie in response.headers.getlist("set-cookie"))
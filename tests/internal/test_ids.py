@@ -0,0 +1,70 @@
+import re
+import threading
+
+import pytest
+
+from authx._internal import FakeClock, RandomIdGenerator, TimeOrderedIdGenerator, get_random_id, set_clock
+from authx._internal._ids import _reset_after_fork, is_ulid, ulid_bound, ulid_timestamp
+from authx.schema import TokenPayload
+
+
+def test_random_id_format():
+    assert re.fullmatch(r"[A-Za-z0-9_-]{24}", get_random_id())
+    assert re.fullmatch(r"[A-Za-z0-9_-]{24}", TokenPayload(sub="user").jti or "")
+
+
+def test_random_ids_are_unique_across_batches():
+    generator = RandomIdGenerator(batch=3)
+    ids = [generator() for _ in range(1000)]
+    assert len(set(ids)) == 1000
+    assert all(len(value) == 24 for value in ids)
+
+
+def test_random_ids_are_unique_across_threads():
+    generator = RandomIdGenerator(batch=8)
+    ids: list[str] = []
+
+    def generate():
+        ids.extend(generator() for _ in range(500))
+
+    threads = [threading.Thread(target=generate) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(ids)) == 2000
+
+
+def test_buffer_dropped_after_fork():
+    generator = RandomIdGenerator()
+    generator()
+    buffer = generator._local.buffer
+    _reset_after_fork()
+    generator()
+    assert generator._local.buffer != buffer
+
+
+def test_invalid_batch():
+    with pytest.raises(ValueError):
+        RandomIdGenerator(batch=0)
+
+
+def test_time_ordered_ids():
+    clock = FakeClock(start=1_700_000_000.0)
+    previous = set_clock(clock)
+    try:
+        generator = TimeOrderedIdGenerator(batch=2)
+        ids = []
+        for _ in range(10):
+            ids.append(generator())
+            clock.advance(0.01)
+    finally:
+        set_clock(previous)
+    assert ids == sorted(ids)
+    assert len(set(ids)) == 10
+    assert all(is_ulid(value) for value in ids)
+    assert ulid_timestamp(ids[0]) == 1_700_000_000.0
+    assert ulid_bound(1_700_000_000.0) <= ids[0] < ulid_bound(1_700_000_000.005) <= ids[1]
+    assert ulid_timestamp(get_random_id()) is None
+    with pytest.raises(ValueError):
+        TimeOrderedIdGenerator(batch=0)
@@ -0,0 +1,365 @@
+import json
+import os
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from authx import AuthX, AuthXConfig
+from authx._internal import FakeClock, Keyring, KeyWatcher, set_clock
+from authx._internal._keys import _thumbprint
+from authx.exceptions import BadConfigurationError, JWTDecodeError
+from authx.schema import RequestToken
+
+
+def write(path, content):
+    path.write_text(content)
+    # Successive writes in the same clock tick must still change the modification time
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def rsa_pems():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public = (
+        key.public_key()
+        .public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+        .decode()
+    )
+    return key, private, public
+
+
+@pytest.fixture(scope="function")
+def clock():
+    clock = FakeClock()
+    previous = set_clock(clock)
+    yield clock
+    set_clock(previous)
+
+
+def verify(authx, token):
+    return authx.verify_token(RequestToken(token=token, location="headers"), verify_csrf=False)
+
+
+def test_watcher_requires_a_file():
+    with pytest.raises(ValueError):
+        KeyWatcher("HS256")
+
+
+def test_secret_rotation_with_grace(tmp_path, clock):
+    secret = tmp_path / "secret"
+    write(secret, "first-secret\n")
+    watcher = KeyWatcher("HS256", private_key_file=str(secret), grace=60)
+    authx = AuthX(config=AuthXConfig(JWT_SECRET_KEY="configured"))
+    authx.set_keyring(watcher)
+    assert authx.keyring is watcher
+
+    old = authx.create_access_token(uid="user")
+    assert jwt.decode(old, "first-secret", algorithms=["HS256"])["sub"] == "user"
+    assert not watcher.poll()
+
+    write(secret, "second-secret\n")
+    assert watcher.poll()
+    new = authx.create_access_token(uid="user")
+    assert jwt.decode(new, "second-secret", algorithms=["HS256"])["sub"] == "user"
+    # Tokens signed before the rotation verify until the grace window ends
+    assert verify(authx, old).sub == "user"
+    assert len(watcher.keys.keys) == 2
+
+    clock.advance(61)
+    with pytest.raises(JWTDecodeError):
+        verify(authx, old)
+    assert verify(authx, new).sub == "user"
+
+    authx.set_keyring(None)
+    with pytest.raises(JWTDecodeError):
+        verify(authx, new)
+
+
+def test_rsa_key_files(tmp_path):
+    _, private, public = rsa_pems()
+    private_file, public_file = tmp_path / "private.pem", tmp_path / "public.pem"
+    write(private_file, private)
+    write(public_file, public)
+    watcher = KeyWatcher("RS256", private_key_file=str(private_file), public_key_file=str(public_file))
+    authx = AuthX(config=AuthXConfig(JWT_ALGORITHM="RS256"))
+    authx.set_keyring(watcher)
+
+    token = authx.create_access_token(uid="user")
+    assert jwt.decode(token, public, algorithms=["RS256"])["sub"] == "user"
+    assert verify(authx, token).sub == "user"
+    assert authx._decode_token(token).sub == "user"
+
+
+def test_mismatched_key_files_are_not_loaded(tmp_path):
+    _, private, public = rsa_pems()
+    private_file, public_file = tmp_path / "private.pem", tmp_path / "public.pem"
+    write(private_file, private)
+    write(public_file, public)
+    watcher = KeyWatcher("RS256", private_key_file=str(private_file), public_key_file=str(public_file))
+    keys = watcher.keys
+
+    # The private key is replaced first, the pair is only loaded once both files match
+    _, new_private, new_public = rsa_pems()
+    write(private_file, new_private)
+    assert not watcher.poll()
+    assert watcher.keys is keys
+    write(public_file, new_public)
+    assert watcher.poll()
+    assert watcher.keys.signing_kid != keys.signing_kid
+    assert watcher.keys.signing_kid in watcher.keys.keys
+
+    write(public_file, public)
+    with pytest.raises(ValueError, match="do not match"):
+        KeyWatcher("RS256", private_key_file=str(private_file), public_key_file=str(public_file))
+
+
+def test_public_key_is_derived_from_private_key(tmp_path):
+    _, private, public = rsa_pems()
+    private_file = tmp_path / "private.pem"
+    write(private_file, private)
+    authx = AuthX(config=AuthXConfig(JWT_ALGORITHM="RS256"))
+    authx.set_keyring(KeyWatcher("RS256", private_key_file=str(private_file)))
+
+    assert verify(authx, authx.create_access_token(uid="user")).sub == "user"
+
+
+def test_verification_only_watcher(tmp_path):
+    _, private, public = rsa_pems()
+    public_file = tmp_path / "public.pem"
+    write(public_file, public)
+    authx = AuthX(config=AuthXConfig(JWT_ALGORITHM="RS256"))
+    authx.set_keyring(KeyWatcher("RS256", public_key_file=str(public_file)))
+
+    kid = _thumbprint(json.loads(RSAAlgorithm.to_jwk(RSAAlgorithm(RSAAlgorithm.SHA256).prepare_key(public))))
+    token = jwt.encode({"sub": "user", "type": "access", "fresh": False}, private, "RS256", headers={"kid": kid})
+    assert verify(authx, token).sub == "user"
+    with pytest.raises(BadConfigurationError):
+        authx.create_access_token(uid="user")
+
+
+def test_jwks_file(tmp_path):
+    signer, _, _ = rsa_pems()
+    other, other_private, _ = rsa_pems()
+    unrelated, _, _ = rsa_pems()
+    jwks = tmp_path / "jwks.json"
+    keys = [
+        json.loads(RSAAlgorithm.to_jwk(other.public_key())),
+        {**json.loads(RSAAlgorithm.to_jwk(signer)), "kid": "signer"},
+        {**json.loads(RSAAlgorithm.to_jwk(unrelated.public_key())), "use": "enc"},
+        {"kty": "oct", "k": "c2VjcmV0"},
+    ]
+    write(jwks, json.dumps({"keys": keys}))
+    watcher = KeyWatcher("RS256", jwks_file=str(jwks))
+    authx = AuthX(config=AuthXConfig(JWT_ALGORITHM="RS256"))
+    authx.set_keyring(watcher)
+
+    # Encryption keys and keys of another type without `alg` are skipped
+    assert len(watcher.keys.keys) == 2
+    assert watcher.keys.signing_kid == "signer"
+    assert verify(authx, authx.create_access_token(uid="user")).sub == "user"
+    other_kid = _thumbprint(keys[0])
+    token = jwt.encode(
+        {"sub": "other", "type": "access", "fresh": False}, other_private, "RS256", headers={"kid": other_kid}
+    )
+    assert verify(authx, token).sub == "other"
+    token = jwt.encode(
+        {"sub": "unrelated", "type": "access"}, unrelated, "RS256", headers={"kid": _thumbprint(keys[2])}
+    )
+    with pytest.raises(JWTDecodeError):
+        verify(authx, token)
+
+
+def test_jwks_without_matching_key(tmp_path):
+    jwks = tmp_path / "jwks.json"
+    write(jwks, json.dumps({"keys": [{"kty": "oct", "k": "c2VjcmV0"}]}))
+
+    with pytest.raises(ValueError):
+        KeyWatcher("RS256", jwks_file=str(jwks))
+
+
+def test_claims_errors_are_not_retried(tmp_path, clock):
+    secret = tmp_path / "secret"
+    write(secret, "first-secret")
+    watcher = KeyWatcher("HS256", private_key_file=str(secret))
+    authx = AuthX(config=AuthXConfig())
+    authx.set_keyring(watcher)
+    expired = authx.create_access_token(uid="user", expiry=time.time() - 10)
+    write(secret, "second-secret")
+    watcher.poll()
+
+    # The replaced key is selected by kid, its claims errors are raised as is
+    with pytest.raises(JWTDecodeError, match="expired"):
+        verify(authx, expired)
+
+
+def test_failed_reload_keeps_keys(tmp_path):
+    secret = tmp_path / "secret"
+    write(secret, "first-secret")
+    watcher = KeyWatcher("HS256", private_key_file=str(secret))
+    keys = watcher.keys
+
+    write(secret, "")
+    assert not watcher.poll()
+    assert watcher.keys is keys
+    secret.unlink()
+    assert not watcher.poll()
+    assert watcher.keys is keys
+
+    write(secret, "second-secret")
+    assert watcher.poll()
+    assert watcher.signing_key == b"second-secret"
+
+
+def test_polling_thread(tmp_path):
+    secret = tmp_path / "secret"
+    write(secret, "first-secret")
+    watcher = KeyWatcher("HS256", private_key_file=str(secret), interval=0.01)
+    watcher.start()
+    try:
+        write(secret, "second-secret")
+        deadline = time.monotonic() + 5
+        while watcher.signing_key != b"second-secret" and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert watcher.signing_key == b"second-secret"
+    finally:
+        watcher.close()
+
+
+def test_thumbprint_matches_rfc7638():
+    jwk = {
+        "kty": "RSA",
+        "n": "0vx7agoebGcQSuuPiLJXZptN9nndrQmbXEps2aiAFbWhM78LhWx4cbbfAAtVT86zwu1RK7aPFFxuhDR1L6tSoc_BJECPebWKRXjBZCiFV"
+        "4n3oknjhMstn64tZ_2W-5JsGY4Hc5n9yBXArwl93lqt7_RN5w6Cf0h4QyQ5v-65YGjQR0_FDW2QvzqY368QQMicAtaSqzs8KJZgnYb9c7d0"
+        "zgdAZHzu6qMQvRL5hajrn1n91CbOpbISD08qNLyrdkt-bFTWhAI4vMQFh6WeZu0fM4lFd2NcRwr3XPksINHaQ-G_xBniIqbw0Ls1jF44-csF"
+        "Cur-kEgU8awapJzKnqDKgw",
+        "e": "AQAB",
+        "alg": "RS256",
+        "kid": "2011-04-29",
+    }
+    assert _thumbprint(jwk) == "NzbLsXh8uDCcd-6MNwXF4W_7noWXFZAfHkxZsRGC9Xs"
+
+
+def test_keyring_stamps_and_selects_kid(monkeypatch):
+    keyring = Keyring()
+    kids = [keyring.add(f"secret-{index}", "HS256") for index in range(20)]
+    signing_kid = keyring.add("signing-secret", "HS256", signing=True)
+    authx = AuthX(config=AuthXConfig(JWT_SECRET_KEY="configured"))
+    authx.set_keyring(keyring)
+    assert authx.keyring is keyring
+    assert len(set(kids)) == 20
+    assert keyring.add("secret-0", "HS256") == kids[0]
+
+    token = authx.create_access_token(uid="user")
+    assert jwt.get_unverified_header(token)["kid"] == signing_kid
+    assert jwt.decode(token, "signing-secret", algorithms=["HS256"])["sub"] == "user"
+
+    # A single decode whatever the number of keys
+    calls = []
+    decode = jwt.decode
+    monkeypatch.setattr(jwt, "decode", lambda *args, **kwargs: calls.append(kwargs["key"]) or decode(*args, **kwargs))
+    assert verify(authx, token).sub == "user"
+    signed = jwt.encode({"sub": "other", "type": "access"}, "secret-7", "HS256", headers={"kid": kids[7]})
+    assert verify(authx, signed).sub == "other"
+    assert calls == [b"signing-secret", b"secret-7"]
+
+    forged = jwt.encode({"sub": "other", "type": "access"}, "secret-7", "HS256", headers={"kid": signing_kid})
+    with pytest.raises(JWTDecodeError):
+        verify(authx, forged)
+    assert len(calls) == 3
+
+
+def test_keyring_rejects_unknown_kid():
+    keyring = Keyring()
+    keyring.add("secret", "HS256", kid="known", signing=True)
+    authx = AuthX(config=AuthXConfig())
+    authx.set_keyring(keyring)
+
+    token = jwt.encode({"sub": "user", "type": "access"}, "secret", "HS256", headers={"kid": "unknown"})
+    with pytest.raises(JWTDecodeError, match="Unknown key id"):
+        verify(authx, token)
+    with pytest.raises(JWTDecodeError):
+        verify(authx, "not-a-token")
+
+
+def test_keyring_algorithm_allow_list():
+    keyring = Keyring()
+    keyring.add("secret-384", "HS384", kid="hs384")
+    keyring.add("secret-256", "HS256", kid="hs256", signing=True)
+    token = jwt.encode({"sub": "user", "type": "access"}, "secret-384", "HS384", headers={"kid": "hs384"})
+    authx = AuthX(config=AuthXConfig())
+    authx.set_keyring(keyring)
+
+    # HS384 is neither JWT_ALGORITHM nor in JWT_DECODE_ALGORITHMS
+    with pytest.raises(JWTDecodeError, match="Unknown key id"):
+        verify(authx, token)
+
+    authx.load_config(AuthXConfig(JWT_DECODE_ALGORITHMS=["HS256", "HS384"]))
+    assert verify(authx, token).sub == "user"
+    # Keys only verify with their own algorithm
+    mismatch = jwt.encode({"sub": "user", "type": "access"}, "secret-384", "HS256", headers={"kid": "hs384"})
+    with pytest.raises(JWTDecodeError):
+        verify(authx, mismatch)
+
+
+def test_keyring_rejects_tokens_without_kid():
+    keyring = Keyring()
+    keyring.add("current", "HS256", signing=True)
+    keyring.add("previous", "HS256")
+    authx = AuthX(config=AuthXConfig())
+    authx.set_keyring(keyring)
+
+    token = jwt.encode({"sub": "user", "type": "access"}, "current", "HS256")
+    with pytest.raises(JWTDecodeError, match="Token has no key id"):
+        verify(authx, token)
+    with pytest.raises(JWTDecodeError, match="Token has no key id"):
+        authx._decode_token(token)
+    assert authx._decode_token(jwt.encode({"sub": "user"}, "other", "HS256"), verify=False).sub == "user"
+
+
+def test_keyring_allow_missing_kid_uses_signing_key_only(monkeypatch):
+    keyring = Keyring()
+    keyring.add("current", "HS256", signing=True)
+    keyring.add("previous", "HS256")
+    authx = AuthX(config=AuthXConfig())
+    authx.set_keyring(keyring, allow_missing_kid=True)
+
+    calls = []
+    decode = jwt.decode
+    monkeypatch.setattr(jwt, "decode", lambda *args, **kwargs: calls.append(kwargs["key"]) or decode(*args, **kwargs))
+    assert verify(authx, jwt.encode({"sub": "user", "type": "access"}, "current", "HS256")).sub == "user"
+    with pytest.raises(JWTDecodeError):
+        verify(authx, jwt.encode({"sub": "user", "type": "access"}, "previous", "HS256"))
+    assert calls == [b"current", b"current"]
+
+    # Without a signing key, tokens without kid have no key to verify with
+    verification_only = Keyring()
+    verification_only.add("current", "HS256")
+    authx.set_keyring(verification_only, allow_missing_kid=True)
+    with pytest.raises(JWTDecodeError, match="Unknown key id"):
+        verify(authx, jwt.encode({"sub": "user", "type": "access"}, "current", "HS256"))
+
+
+def test_keyring_remove():
+    _, private, _ = rsa_pems()
+    keyring = Keyring()
+    kid = keyring.add(private, "RS256", signing=True)
+    authx = AuthX(config=AuthXConfig(JWT_ALGORITHM="RS256"))
+    authx.set_keyring(keyring)
+    token = authx.create_access_token(uid="user")
+    assert verify(authx, token).sub == "user"
+
+    keyring.remove(kid)
+    assert keyring.keys.signing_key is None
+    with pytest.raises(JWTDecodeError):
+        verify(authx, token)
+    with pytest.raises(BadConfigurationError):
+        authx.create_access_token(uid="user")
+    with pytest.raises(KeyError):
+        keyring.remove(kid)
@@ -22,6 +22,7 @@ def test_set_log_level():
 
 
 def test_log_debug(caplog):
+    caplog.set_level(logging.DEBUG, logger="authx")
     log_debug("Debug message")
     assert "Debug message" in caplog.text
     assert logging.getLevelName(caplog.records[0].levelno) == "DEBUG"
@@ -34,12 +35,22 @@ def test_log_info(caplog):
 
 
 def test_log_error(caplog):
-    with patch("traceback.format_exc") as mock_format_exc:
-        mock_format_exc.return_value = "Traceback"
-        log_error("Error message", e=Exception("Test exception"))
-        assert "Error message" in caplog.text
-        assert "Traceback" in caplog.text
-        assert logging.getLevelName(caplog.records[0].levelno) == "ERROR"
+    try:
+        raise ValueError("Test exception")
+    except ValueError as e:
+        error = e
+    # Logged after the except block, the traceback comes from the exception
+    log_error("Error message", e=error)
+    assert "Error message" in caplog.text
+    assert "Traceback" in caplog.text
+    assert "ValueError: Test exception" in caplog.text
+    assert "test_log_error" in caplog.text
+    assert logging.getLevelName(caplog.records[0].levelno) == "ERROR"
+
+
+def test_log_error_exception_without_traceback(caplog):
+    log_error("Error message", e=Exception("Test exception"))
+    assert "Exception: Test exception" in caplog.text
 
 
 def test_build_log_msg_no_loc_or_method():
@@ -60,3 +71,23 @@ def test_build_log_msg_with_method():
 def test_build_log_msg_with_loc_and_method():
     result = _build_log_msg("Test message", loc="test_location", method="test_method")
     assert result == "[test_location][test_method] [test_location] Test message"
+
+
+def test_no_import_time_logging_config():
+    logger = get_logger()
+    assert any(isinstance(handler, logging.NullHandler) for handler in logger.handlers)
+
+
+def test_log_debug_disabled_skips_formatting(caplog):
+    caplog.set_level(logging.INFO, logger="authx")
+    with patch("authx._internal._logger._build_log_msg") as mock_build:
+        log_debug("Debug message")
+        mock_build.assert_not_called()
+    assert "Debug message" not in caplog.text
+
+
+def test_log_error_without_exception_skips_traceback(caplog):
+    with patch("traceback.format_exception") as mock_format_exception:
+        log_error("Error message")
+        mock_format_exception.assert_not_called()
+    assert "Error message" in caplog.text
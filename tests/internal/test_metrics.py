@@ -0,0 +1,116 @@
+import threading
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+import authx.exceptions as exc
+from authx import AuthX
+from authx._internal import AuthXMetrics, SubjectCache
+from tests.utils import bearer_request
+
+
+@pytest.fixture(scope="function")
+def metrics():
+    return AuthXMetrics()
+
+
+@pytest.fixture(scope="function")
+def security(security: AuthX, metrics: AuthXMetrics):
+    security.set_metrics(metrics)
+    return security
+
+
+async def test_auth_outcomes(security: AuthX, metrics: AuthXMetrics):
+    token = security.create_access_token(uid="user")
+    await security._auth_required(bearer_request(token))
+    with pytest.raises(exc.JWTDecodeError):
+        await security._auth_required(bearer_request("invalid"))
+    with pytest.raises(exc.MissingTokenError):
+        await security._auth_required(Request(scope={"type": "http", "method": "GET", "headers": []}))
+
+    assert metrics.value("auth_total", outcome="success", location="headers", algorithm="HS256") == 1
+    assert metrics.value("auth_total", outcome="JWTDecodeError", location="headers") == 1
+    assert metrics.value("auth_total", outcome="MissingTokenError", location="none") == 1
+    assert metrics.value("tokens_created_total", type="access") == 1
+    assert metrics.stages.count("signature") == 2
+
+
+async def test_authenticate_outcomes(security: AuthX, metrics: AuthXMetrics):
+    security.set_token_blocklist(lambda token: True)
+    with pytest.raises(exc.RevokedTokenError):
+        await security.authenticate(security.create_refresh_token(uid="user"), type="refresh")
+    assert metrics.value("auth_total", outcome="RevokedTokenError") == 1
+    assert metrics.value("tokens_created_total", type="refresh") == 1
+
+
+def test_set_metrics_replaces_stage_hook(security: AuthX, metrics: AuthXMetrics):
+    assert security.metrics is metrics
+    assert security.stage_hooks == (metrics.stages,)
+    other = AuthXMetrics()
+    security.set_metrics(other)
+    assert security.stage_hooks == (other.stages,)
+    security.set_metrics(None)
+    assert security.metrics is None
+    assert security.stage_hooks == ()
+
+
+async def test_subject_cache_metrics(security: AuthX, metrics: AuthXMetrics):
+    security.set_subject_getter(lambda uid: {"uid": uid})
+    security.set_subject_cache(SubjectCache())
+    token = security.create_access_token(uid="user")
+    for _ in range(3):
+        await security.get_current_subject(bearer_request(token))
+    text = metrics.render()
+    assert "authx_subject_cache_hits_total 2\n" in text
+    assert "authx_subject_cache_misses_total 1\n" in text
+    assert "authx_subject_cache_size 1\n" in text
+
+
+def test_render(metrics: AuthXMetrics):
+    metrics.record_auth("success", "headers", "HS256")
+    metrics.record_auth("success", "headers", "HS256")
+    metrics.record_refresh()
+    metrics.stages("extract", 0.00002)
+    text = metrics.render()
+    assert "# TYPE authx_auth_total counter\n" in text
+    assert 'authx_auth_total{outcome="success",location="headers",algorithm="HS256"} 2\n' in text
+    assert 'authx_implicit_refresh_total{location="cookies"} 1\n' in text
+    assert "# TYPE authx_stage_duration_seconds histogram\n" in text
+    assert 'authx_stage_duration_seconds_bucket{stage="extract",le="1e-05"} 0\n' in text
+    assert 'authx_stage_duration_seconds_bucket{stage="extract",le="2.5e-05"} 1\n' in text
+    assert 'authx_stage_duration_seconds_bucket{stage="extract",le="+Inf"} 1\n' in text
+    assert 'authx_stage_duration_seconds_count{stage="extract"} 1\n' in text
+    assert "tokens_created_total" not in text
+
+    metrics.reset()
+    assert metrics.render() == "\n"
+
+
+def test_render_escapes_labels():
+    metrics = AuthXMetrics(namespace="app")
+    metrics.record_auth('Bad"Error\\', None, "HS256")
+    assert 'app_auth_total{outcome="Bad\\"Error\\\\",location="none",algorithm="HS256"} 1' in metrics.render()
+
+
+def test_counters_merge_threads(metrics: AuthXMetrics):
+    def record():
+        for _ in range(1000):
+            metrics.record_token("access", "HS256")
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert metrics.value("tokens_created_total") == 4000
+
+
+def test_endpoint(security: AuthX, metrics: AuthXMetrics):
+    app = FastAPI()
+    app.add_api_route("/metrics", metrics.endpoint, include_in_schema=False)
+    security.create_access_token(uid="user")
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'authx_tokens_created_total{type="access",algorithm="HS256"} 1' in response.text
@@ -0,0 +1,137 @@
+from datetime import timedelta
+
+import pytest
+
+from authx import AuthX, AuthXConfig
+from authx._internal._plan import compile_plan
+from authx.exceptions import BadConfigurationError, JWTDecodeError
+from authx.schema import RequestToken
+
+
+def test_compile_plan():
+    config = AuthXConfig(
+        JWT_SECRET_KEY="secret",
+        JWT_TOKEN_LOCATION=["query", "cookies", "headers", "cookies", "json"],
+        JWT_CSRF_METHODS=["POST", "DELETE"],
+        JWT_IMPLICIT_REFRESH_DELTATIME=timedelta(minutes=5),
+        JWT_IMPLICIT_REFRESH_ROUTE_EXCLUDE=["/logout"],
+    )
+    plan = compile_plan(config)
+
+    # Compiled from a copy, the caller's config can change without altering the plan
+    assert plan.config is not config
+    assert dict(plan.config) == dict(config)
+    assert plan.algorithm == "HS256"
+    assert plan.decode_algorithms == ("HS256",)
+    assert plan.allowed_algorithms == frozenset({"HS256"})
+    assert plan.signing_key() == plan.verification_key() == "secret"
+    # Configuration order is kept, duplicates are dropped
+    assert plan.locations == ("query", "cookies", "headers", "json")
+    assert plan.refresh_locations == ("cookies", "json")
+    assert plan.location_set == frozenset({"query", "cookies", "headers", "json"})
+    assert plan.has_location("cookies")
+    assert plan.csrf_in_payload
+    assert plan.csrf_required("post")
+    assert not plan.csrf_required("GET")
+    assert plan.implicit_refresh_seconds == 300
+    assert plan.implicit_refresh_route_exclude == frozenset({"/logout"})
+
+
+def test_compile_plan_csrf_disabled():
+    plan = compile_plan(
+        AuthXConfig(JWT_SECRET_KEY="secret", JWT_TOKEN_LOCATION=["cookies"], JWT_COOKIE_CSRF_PROTECT=False)
+    )
+
+    assert not plan.csrf_in_payload
+    assert not plan.csrf_required("POST")
+    assert plan.access_cookies.csrf is None
+
+
+def test_compile_plan_asymmetric_keys():
+    plan = compile_plan(AuthXConfig(JWT_ALGORITHM="RS256", JWT_PRIVATE_KEY="private", JWT_PUBLIC_KEY="public"))
+
+    assert plan.signing_key() == "private"
+    assert plan.verification_key() == "public"
+
+
+@pytest.mark.parametrize(("algorithm", "secret"), [("HS256", None), ("BLAH", "secret")])
+def test_key_errors_raised_on_use(algorithm, secret):
+    config = AuthXConfig(JWT_SECRET_KEY=secret)
+    config.JWT_ALGORITHM = algorithm
+    plan = compile_plan(config)
+
+    with pytest.raises(BadConfigurationError) as error:
+        plan.signing_key()
+    with pytest.raises(BadConfigurationError):
+        plan.verification_key()
+    assert "JWT_ALGORITHM" in str(error.value)
+
+    authx = AuthX(config=config)
+    with pytest.raises(BadConfigurationError):
+        authx.create_access_token(uid="user")
+
+
+def test_cookie_templates():
+    plan = compile_plan(AuthXConfig(JWT_SECRET_KEY="secret"))
+
+    assert plan.cookie_templates("access") is plan.access_cookies
+    assert plan.cookie_templates("refresh") is plan.refresh_cookies
+    assert plan.access_cookies.token.key == "access_token_cookie"
+    assert plan.refresh_cookies.token.key == "refresh_token_cookie"
+    with pytest.raises(ValueError):
+        plan.cookie_templates("other")
+
+
+def test_config_changes_need_load_config():
+    config = AuthXConfig(JWT_SECRET_KEY="secret")
+    authx = AuthX(config=config)
+    token = authx.create_access_token(uid="user")
+
+    config.JWT_SECRET_KEY = "rotated"
+    # The plan compiled at init still verifies with the old key
+    assert authx.verify_token(RequestToken(token=token, location="headers")).sub == "user"
+
+    # Every field is read from the compiled plan, not only the keys
+    config.JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+    payload = authx.verify_token(RequestToken(token=authx.create_access_token(uid="user"), location="headers"))
+    assert payload.time_until_expiry <= timedelta(minutes=15)
+
+    authx.load_config(config)
+    assert authx.config is not config
+    assert authx.config.JWT_SECRET_KEY == "rotated"
+    with pytest.raises(JWTDecodeError):
+        authx.verify_token(RequestToken(token=token, location="headers"))
+    assert authx.verify_token(RequestToken(token=authx.create_access_token(uid="user"), location="headers"))
+
+
+def test_load_config_swaps_the_plan():
+    authx = AuthX(config=AuthXConfig(JWT_SECRET_KEY="secret"))
+    plan = authx._plan
+
+    authx.load_config(AuthXConfig(JWT_SECRET_KEY="other", JWT_TOKEN_LOCATION=["cookies"]))
+
+    # The previous plan is left untouched for requests still using it
+    assert plan.locations == ("headers",)
+    assert plan.signing_key() == "secret"
+    assert authx._plan is not plan
+    assert authx._plan.locations == ("cookies",)
+    assert authx._cookie_templates("access") is authx._plan.access_cookies
+
+
+def test_config_is_read_only():
+    authx = AuthX(config=AuthXConfig(JWT_SECRET_KEY="secret", JWT_TOKEN_LOCATION=["cookies"]))
+
+    # Assignments would not reach the compiled plan, they raise instead of being ignored
+    with pytest.raises(TypeError, match="load_config"):
+        authx.config.JWT_COOKIE_CSRF_PROTECT = False
+    assert authx.config.JWT_COOKIE_CSRF_PROTECT
+    assert authx._plan.csrf_protect
+
+    authx.load_config(
+        AuthXConfig(JWT_SECRET_KEY="secret", JWT_TOKEN_LOCATION=["cookies"], JWT_COOKIE_CSRF_PROTECT=False)
+    )
+    assert not authx.config.JWT_COOKIE_CSRF_PROTECT
+    assert not authx._plan.csrf_protect
+    # The configuration in use can be loaded again
+    authx.load_config(authx.config)
+    assert authx.config.JWT_SECRET_KEY == "secret"
@@ -0,0 +1,86 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from authx import AuthX, AuthXConfig
+from authx._internal import ServerTiming
+
+
+def _stages(header: str) -> list[str]:
+    return [metric.split(";")[0] for metric in header.split(", ")]
+
+
+@pytest.fixture(scope="function")
+def security(security: AuthX):
+    security.load_config(
+        AuthXConfig(JWT_SECRET_KEY="secret", JWT_TOKEN_LOCATION=["headers", "cookies"], JWT_COOKIE_CSRF_PROTECT=False)
+    )
+    return security
+
+
+@pytest.fixture(scope="function")
+def app(security: AuthX):
+    app = FastAPI()
+
+    @app.get("/protected", dependencies=[Depends(security.access_token_required)])
+    def protected():
+        return {}
+
+    @app.get("/subject")
+    def subject(subject=security.CURRENT_SUBJECT):
+        return subject
+
+    @app.get("/public")
+    def public():
+        return {}
+
+    return app
+
+
+def test_dependency_path(security: AuthX, app: FastAPI):
+    security.add_server_timing(app)
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {security.create_access_token(uid='user')}"}
+
+    response = client.get("/protected", headers=headers)
+    assert _stages(response.headers["server-timing"]) == [
+        "authx-extract",
+        "authx-blocklist",
+        "authx-signature",
+        "authx-claims",
+        "authx-version",
+    ]
+    assert "authx-subject" in _stages(client.get("/subject", headers=headers).headers["server-timing"])
+    assert "server-timing" not in client.get("/public").headers
+
+
+def test_middleware_path(security: AuthX, app: FastAPI):
+    app.middleware("http")(security.implicit_refresh_middleware)
+    security.add_server_timing(app)
+    client = TestClient(app)
+    client.cookies.set(security.config.JWT_ACCESS_COOKIE_NAME, security.create_access_token(uid="user"))
+
+    response = client.get("/public")
+    assert response.status_code == 200
+    assert {"authx-extract", "authx-signature", "authx-claims"}.issubset(_stages(response.headers["server-timing"]))
+
+
+def test_sample_rate(security: AuthX, app: FastAPI):
+    server_timing = security.add_server_timing(app, sample_rate=0, prefix="auth.")
+    assert security.stage_hooks == (server_timing,)
+    headers = {"Authorization": f"Bearer {security.create_access_token(uid='user')}"}
+    assert "server-timing" not in TestClient(app).get("/protected", headers=headers).headers
+
+
+def test_hook_outside_request():
+    server_timing = ServerTiming()
+    server_timing("extract", 0.001)
+    assert (
+        server_timing.render({"extract": 0.001, "subject": 0.0025})
+        == "authx-extract;dur=1.000, authx-subject;dur=2.500"
+    )
+
+
+def test_invalid_sample_rate():
+    with pytest.raises(ValueError):
+        ServerTiming(sample_rate=2)
@@ -0,0 +1,96 @@
+import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from authx import AuthX, AuthXConfig
+from authx._internal import MemoryVersionTable, SubjectSnapshot
+from tests.utils import bearer_request
+
+
+class User(BaseModel):
+    id: str
+    roles: list[str]
+    tenant: str
+
+
+def test_snapshot_dump_and_load():
+    snapshot = SubjectSnapshot(fields=["id", "roles"], loader=lambda data: data)
+    user = User(id="u1", roles=["admin"], tenant="acme")
+    assert snapshot.dump("u1", user) == {"id": "u1", "roles": ["admin"]}
+    assert snapshot.dump("u1", {"id": "u1", "extra": 1}) == {"id": "u1"}
+    assert snapshot.load("u1", {"id": "u1"}) == (True, {"id": "u1"})
+    assert snapshot.load("u1", None) == (False, None)
+
+
+def test_snapshot_version_check():
+    versions = MemoryVersionTable()
+    snapshot = SubjectSnapshot(fields=["id"], versions=versions)
+    claim = snapshot.dump("u1", {"id": "u1"})
+    assert claim == {"id": "u1", "_v": 0}
+    assert snapshot.load("u1", claim) == (True, {"id": "u1"})
+    versions.bump("u1")
+    assert snapshot.load("u1", claim) == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_authx_current_subject_from_snapshot():
+    security = AuthX(config=AuthXConfig(JWT_SECRET_KEY="secret", JWT_TOKEN_LOCATION=["headers"]))
+    versions = MemoryVersionTable()
+    calls = []
+    users = {"u1": User(id="u1", roles=["admin"], tenant="acme")}
+
+    @security.set_subject_getter
+    def _get_subject(uid: str):
+        calls.append(uid)
+        return users[uid]
+
+    security.set_subject_snapshot(
+        SubjectSnapshot(fields=["id", "roles", "tenant"], loader=User.model_validate, versions=versions)
+    )
+
+    token = security.create_access_token(uid="u1", subject=users["u1"])
+    assert security._decode_token(token).sbj == {"id": "u1", "roles": ["admin"], "tenant": "acme", "_v": 0}
+
+    assert await security.get_current_subject(bearer_request(token)) == users["u1"]
+    lazy = await security.get_lazy_subject(bearer_request(token))
+    assert await lazy == users["u1"]
+    assert calls == []
+
+    users["u1"] = User(id="u1", roles=[], tenant="acme")
+    versions.bump("u1")
+    assert await security.get_current_subject(bearer_request(token)) == users["u1"]
+    assert calls == ["u1"]
+
+    plain_token = security.create_access_token(uid="u1")
+    assert await security.get_current_subject(bearer_request(plain_token)) == users["u1"]
+    assert calls == ["u1", "u1"]
+
+
+def test_implicit_refresh_snapshots_the_current_subject():
+    security = AuthX(
+        config=AuthXConfig(
+            JWT_SECRET_KEY="secret",
+            JWT_TOKEN_LOCATION=["cookies"],
+            JWT_COOKIE_CSRF_PROTECT=False,
+            JWT_IMPLICIT_REFRESH_DELTATIME=datetime.timedelta(minutes=5),
+        )
+    )
+    users = {"u1": User(id="u1", roles=["admin"], tenant="acme")}
+    security.set_subject_getter(lambda uid: users[uid])
+    security.set_subject_snapshot(SubjectSnapshot(fields=["id", "roles"], loader=User.model_validate))
+    token = security.create_access_token(uid="u1", subject=users["u1"], expiry=datetime.timedelta(minutes=1))
+    users["u1"] = User(id="u1", roles=[], tenant="acme")
+
+    app = FastAPI()
+    app.middleware("http")(security.implicit_refresh_middleware)
+    app.get("/")(lambda: "OK")
+    client = TestClient(app)
+    client.cookies.set("access_token_cookie", token)
+    response = client.get("/")
+
+    refreshed = security._decode_token(response.cookies["access_token_cookie"])
+    # The snapshot is taken again from the subject getter instead of being copied
+    assert refreshed.sbj == {"id": "u1", "roles": []}
@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+from fastapi import Request
+
+from authx import AuthX, AuthXConfig
+from authx._internal import SubjectCache
+from tests.utils import bearer_request
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(scope="function")
+def timer():
+    return FakeTimer()
+
+
+def test_ttl_expiry(timer: FakeTimer):
+    cache = SubjectCache(ttl=10, timer=timer)
+    cache.set("a", {"uid": "a"})
+    assert cache.get("a") == {"uid": "a"}
+    timer.now = 10
+    assert "a" not in cache
+    assert cache.get("a") is None
+
+
+def test_lru_eviction(timer: FakeTimer):
+    cache = SubjectCache(maxsize=2, timer=timer)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+
+def test_negative_caching(timer: FakeTimer):
+    cache = SubjectCache(ttl=60, negative_ttl=5, timer=timer)
+    cache.set("ghost", None)
+    assert "ghost" in cache
+    timer.now = 5
+    assert "ghost" not in cache
+
+    cache = SubjectCache(negative_ttl=None, timer=timer)
+    cache.set("ghost", None)
+    assert "ghost" not in cache
+
+
+def test_invalidate_and_clear():
+    cache = SubjectCache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.invalidate("a")
+    assert "a" not in cache
+    cache.clear()
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_single_flight():
+    cache = SubjectCache()
+    calls = []
+
+    async def loader(uid: str):
+        calls.append(uid)
+        await asyncio.sleep(0.01)
+        return {"uid": uid}
+
+    results = await asyncio.gather(*(cache.get_or_load("a", loader) for _ in range(5)))
+    assert results == [{"uid": "a"}] * 5
+    assert calls == ["a"]
+
+    assert await cache.get_or_load("a", loader) == {"uid": "a"}
+    assert calls == ["a"]
+    assert cache.hits == 1
+    assert cache.misses == 5
+
+
+@pytest.mark.asyncio
+async def test_get_or_load_error_is_shared_and_not_cached():
+    cache = SubjectCache()
+    calls = []
+
+    async def loader(uid: str):
+        calls.append(uid)
+        await asyncio.sleep(0.01)
+        raise LookupError(uid)
+
+    results = await asyncio.gather(*(cache.get_or_load("a", loader) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, LookupError) for r in results)
+    assert calls == ["a"]
+    assert "a" not in cache
+
+
+@pytest.mark.asyncio
+async def test_invalidate_during_load_is_not_stored():
+    cache = SubjectCache()
+
+    async def loader(uid: str):
+        await asyncio.sleep(0.01)
+        return "stale"
+
+    task = asyncio.create_task(cache.get_or_load("a", loader))
+    await asyncio.sleep(0)
+    cache.invalidate("a")
+    assert await task == "stale"
+    assert "a" not in cache
+
+
+@pytest.mark.asyncio
+async def test_authx_get_current_subject_uses_cache():
+    security = AuthX(config=AuthXConfig(JWT_SECRET_KEY="secret", JWT_TOKEN_LOCATION=["headers"]))
+    calls = []
+
+    @security.set_subject_getter
+    def _get_subject(uid: str):
+        calls.append(uid)
+        return {"uid": uid} if uid == "test" else None
+
+    security.set_subject_cache(SubjectCache(ttl=60))
+
+    def request_for(uid: str) -> Request:
+        return bearer_request(security.create_access_token(uid=uid))
+
+    assert await security.get_current_subject(request_for("test")) == {"uid": "test"}
+    assert await security.get_current_subject(request_for("test")) == {"uid": "test"}
+    assert await security.get_current_subject(request_for("ghost")) is None
+    assert await security.get_current_subject(request_for("ghost")) is None
+    assert calls == ["test", "ghost"]
+
+    security.invalidate_subject("test")
+    assert await security.get_current_subject(request_for("test")) == {"uid": "test"}
+    assert calls == ["test", "ghost", "test"]
@@ -0,0 +1,86 @@
+import threading
+from contextlib import nullcontext
+
+import pytest
+
+import authx.exceptions as exc
+from authx import AuthX
+from authx._internal import StageHistogram
+from authx._internal._timing import time_stage
+from tests.utils import bearer_request
+
+
+def test_time_stage_without_hooks_is_shared_noop():
+    assert time_stage([], "extract") is time_stage([], "signature")
+    assert isinstance(time_stage([], "extract"), nullcontext)
+
+
+def test_time_stage_reports_on_error():
+    records = []
+    with pytest.raises(ValueError), time_stage([lambda stage, duration: records.append((stage, duration))], "claims"):
+        raise ValueError
+    assert records[0][0] == "claims"
+    assert records[0][1] >= 0
+
+
+def test_histogram_buckets():
+    histogram = StageHistogram(buckets=(0.001, 0.01))
+    for duration in (0.0005, 0.001, 0.005, 0.5):
+        histogram("signature", duration)
+    assert histogram.stages() == ["signature"]
+    assert histogram.count("signature") == 4
+    assert histogram.sum("signature") == pytest.approx(0.5065)
+    assert histogram.cumulative("signature") == [(0.001, 2), (0.01, 3), (float("inf"), 4)]
+    assert histogram.quantile("signature", 0.5) == 0.001
+    assert histogram.quantile("signature", 0.75) == 0.01
+    assert histogram.quantile("signature", 1.0) == float("inf")
+    assert histogram.quantile("subject", 0.5) is None
+    assert histogram.snapshot()["signature"]["count"] == 4
+    histogram.reset()
+    assert histogram.count("signature") == 0
+
+
+def test_histogram_merges_threads():
+    histogram = StageHistogram()
+
+    def record():
+        for _ in range(1000):
+            histogram("extract", 0.0001)
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert histogram.count("extract") == 4000
+
+
+async def test_stage_hooks_get_current_subject(security: AuthX):
+    histogram = StageHistogram()
+    security.add_stage_hook(histogram)
+    assert security.stage_hooks == (histogram,)
+    token = security.create_access_token(uid="user")
+    assert await security.get_current_subject(bearer_request(token)) == {"uid": "user"}
+    assert histogram.stages() == ["blocklist", "claims", "extract", "signature", "subject", "version"]
+
+    security.remove_stage_hook(histogram)
+    await security.get_current_subject(bearer_request(token))
+    assert histogram.count("subject") == 1
+
+
+async def test_stage_hooks_lazy_subject(security: AuthX):
+    histogram = StageHistogram()
+    security.add_stage_hook(histogram)
+    lazy = await security.get_lazy_subject(bearer_request(security.create_access_token(uid="user")))
+    assert histogram.count("subject") == 0
+
+    assert await lazy == {"uid": "user"}
+    assert histogram.count("subject") == 1
+
+
+async def test_stage_hooks_failed_stage(security: AuthX):
+    records = []
+    security.add_stage_hook(lambda stage, duration: records.append(stage))
+    with pytest.raises(exc.JWTDecodeError):
+        await security._auth_required(bearer_request("invalid"))
+    assert records == ["extract", "blocklist", "signature"]
@@ -0,0 +1,122 @@
+import asyncio
+import datetime
+from collections import Counter
+from contextlib import nullcontext
+
+import pytest
+from fastapi import Request
+
+import authx.exceptions as exc
+from authx import AuthX
+from authx._internal import InMemoryTracer, Tracer
+from authx._internal._tracing import trace_span
+from tests.utils import bearer_request
+
+
+@pytest.fixture(scope="function")
+def tracer():
+    return InMemoryTracer()
+
+
+@pytest.fixture(scope="function")
+def security(security: AuthX, tracer: InMemoryTracer):
+    security.set_tracer(tracer)
+    return security
+
+
+def test_trace_span_without_tracer_is_shared_noop():
+    assert trace_span(None, "authx.extract") is trace_span(None, "authx.subject")
+    assert isinstance(trace_span(None, "authx.extract"), nullcontext)
+    with trace_span(None, "authx.extract") as span:
+        assert span is None
+
+
+def test_in_memory_tracer_nesting(tracer: InMemoryTracer):
+    assert isinstance(tracer, Tracer)
+    with pytest.raises(ValueError), trace_span(tracer, "outer"), trace_span(tracer, "inner"):
+        raise ValueError
+    inner, outer = tracer.spans
+    assert (inner.name, inner.parent, inner.attributes) == ("inner", "outer", {"authx.outcome": "ValueError"})
+    assert (outer.name, outer.parent) == ("outer", None)
+    assert outer.duration >= inner.duration >= 0
+    tracer.clear()
+    assert tracer.spans == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_keep_their_own_spans(security: AuthX, tracer: InMemoryTracer):
+    async def get_subject(uid: str):
+        await asyncio.sleep(0.01)
+        return {"uid": uid}
+
+    security.set_subject_getter(get_subject)
+    tokens = {name: security.create_access_token(uid=name) for name in ("a", "b")}
+    tracer.clear()
+
+    async def handle(name: str):
+        with tracer.start_as_current_span(f"request-{name}"):
+            await asyncio.sleep(0)
+            return await security.get_current_subject(bearer_request(tokens[name]))
+
+    # Both requests are in flight on the event loop at once
+    assert await asyncio.gather(handle("a"), handle("b")) == [{"uid": "a"}, {"uid": "b"}]
+
+    assert [span.parent for span in tracer.spans if span.name.startswith("request-")] == [None, None]
+    parents = Counter(span.parent for span in tracer.spans if span.name.startswith("authx."))
+    assert parents == {"request-a": 4, "request-b": 4}
+
+
+def test_create_token_span(security: AuthX, tracer: InMemoryTracer):
+    security.create_refresh_token(uid="user")
+    assert tracer.find("authx.create_token")[0].attributes == {
+        "authx.type": "refresh",
+        "authx.algorithm": "HS256",
+        "authx.outcome": "success",
+    }
+
+
+@pytest.mark.asyncio
+async def test_request_spans(security: AuthX, tracer: InMemoryTracer):
+    token = security.create_access_token(uid="user")
+    tracer.clear()
+    subject = await security.get_current_subject(bearer_request(token))
+    assert subject == {"uid": "user"}
+    assert [span.name for span in tracer.spans] == [
+        "authx.extract",
+        "authx.blocklist",
+        "authx.verify_token",
+        "authx.subject",
+    ]
+    assert tracer.find("authx.extract")[0].attributes == {"authx.location": "headers", "authx.outcome": "success"}
+    assert tracer.find("authx.blocklist")[0].attributes == {"authx.revoked": False, "authx.outcome": "success"}
+    assert tracer.find("authx.verify_token")[0].attributes == {
+        "authx.algorithm": "HS256",
+        "authx.location": "headers",
+        "authx.outcome": "success",
+    }
+
+
+@pytest.mark.asyncio
+async def test_lazy_subject_span(security: AuthX, tracer: InMemoryTracer):
+    lazy = await security.get_lazy_subject(bearer_request(security.create_access_token(uid="user")))
+    assert not tracer.find("authx.subject")
+
+    assert await lazy == {"uid": "user"}
+    assert len(tracer.find("authx.subject")) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_spans(security: AuthX, tracer: InMemoryTracer):
+    with pytest.raises(exc.MissingTokenError):
+        await security.access_token_required(Request(scope={"type": "http", "method": "GET", "headers": []}))
+    assert tracer.find("authx.extract")[0].attributes == {"authx.outcome": "MissingTokenError"}
+
+    token = security.create_access_token(uid="user", expiry=datetime.timedelta(seconds=-60))
+    with pytest.raises(exc.JWTDecodeError):
+        await security.access_token_required(bearer_request(token))
+    assert tracer.find("authx.verify_token")[0].attributes["authx.outcome"] == "JWTDecodeError"
+
+    security.set_tracer(None)
+    tracer.clear()
+    security.create_access_token(uid="user")
+    assert tracer.spans == []
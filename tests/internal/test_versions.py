@@ -0,0 +1,84 @@
+import pytest
+
+import authx.exceptions as exc
+from authx import AuthX, AuthXConfig
+from authx._internal import MemoryVersionTable, SubjectCache, VersionTable
+from tests.utils import bearer_request
+
+
+@pytest.fixture(scope="function")
+def security(security: AuthX):
+    security.set_token_versions(MemoryVersionTable())
+    return security
+
+
+def test_memory_version_table():
+    versions = MemoryVersionTable()
+    assert isinstance(versions, VersionTable)
+    assert versions.get("a") == 0
+    assert versions.bump("a") == 1
+    assert versions.bump("a") == 2
+    versions.set("b", 5)
+    assert versions.get("b") == 5
+
+
+def test_ver_claim_is_stamped(security: AuthX):
+    assert security._decode_token(security.create_access_token(uid="u1")).ver == 0
+    security.bump_subject_version("u1")
+    assert security._decode_token(security.create_access_token(uid="u1")).ver == 1
+    assert security._decode_token(security.create_refresh_token(uid="u1")).ver == 1
+
+
+def test_ver_claim_not_stamped_without_table():
+    security = AuthX(config=AuthXConfig(JWT_SECRET_KEY="secret"))
+    assert "ver" not in security._decode_token(security.create_access_token(uid="u1")).extra_dict
+    with pytest.raises(AttributeError):
+        security.bump_subject_version("u1")
+
+
+@pytest.mark.asyncio
+async def test_bump_invalidates_existing_tokens(security: AuthX):
+    token = security.create_access_token(uid="u1")
+    other = security.create_access_token(uid="u2")
+    assert (await security._auth_required(bearer_request(token))).sub == "u1"
+
+    assert security.bump_subject_version("u1") == 1
+    with pytest.raises(exc.RevokedTokenError):
+        await security._auth_required(bearer_request(token))
+    assert (await security._auth_required(bearer_request(other))).sub == "u2"
+
+    new_token = security.create_access_token(uid="u1")
+    assert (await security._auth_required(bearer_request(new_token))).sub == "u1"
+
+
+@pytest.mark.asyncio
+async def test_bump_invalidates_cached_subject(security: AuthX):
+    calls = []
+
+    @security.set_subject_getter
+    def _get_subject(uid: str):
+        calls.append(uid)
+        return {"uid": uid}
+
+    security.set_subject_cache(SubjectCache())
+    await security.get_current_subject(bearer_request(security.create_access_token(uid="u1")))
+    security.bump_subject_version("u1")
+    await security.get_current_subject(bearer_request(security.create_access_token(uid="u1")))
+    assert calls == ["u1", "u1"]
+
+
+@pytest.mark.asyncio
+async def test_fresh_worker_adopts_newer_versions(security: AuthX):
+    security.bump_subject_version("u1")
+    old_token = security.create_access_token(uid="u1")
+    security.bump_subject_version("u1")
+    # A worker started after the bumps, with an empty table and the same key
+    fresh = AuthX(config=AuthXConfig(JWT_SECRET_KEY="secret", JWT_TOKEN_LOCATION=["headers"]))
+    fresh.set_token_versions(MemoryVersionTable())
+
+    assert (await fresh._auth_required(bearer_request(security.create_access_token(uid="u1")))).sub == "u1"
+    assert fresh.token_versions.get("u1") == 2
+    with pytest.raises(exc.RevokedTokenError):
+        await fresh._auth_required(bearer_request(old_token))
+    # Tokens it mints from then on are accepted by the other worker
+    assert (await security._auth_required(bearer_request(fresh.create_access_token(uid="u1")))).sub == "u1"
@@ -11,9 +11,7 @@ from authx.exceptions import AuthXException, MissingTokenError
 
 @pytest.fixture(scope="function")
 def authx():
-    authx = AuthX()
-    authx._config.JWT_SECRET_KEY = "SECRET"
-    authx._config.JWT_TOKEN_LOCATION = ["headers", "json", "cookies"]
+    authx = AuthX(config=AuthXConfig(JWT_SECRET_KEY="SECRET", JWT_TOKEN_LOCATION=["headers", "json", "cookies"]))
     return authx
 
 
@@ -0,0 +1,67 @@
+import pytest
+
+from authx import AuthXConfig, AuthXCore
+from authx._internal import MemoryVersionTable, SubjectSnapshot
+from authx.exceptions import AccessTokenRequiredError, CSRFError, JWTDecodeError, RevokedTokenError
+
+
+@pytest.fixture(scope="function")
+def core():
+    return AuthXCore(config=AuthXConfig(JWT_SECRET_KEY="SECRET", JWT_TOKEN_LOCATION=["headers", "cookies"]))
+
+
+async def test_authenticate(core: AuthXCore):
+    token = core.create_access_token(uid="hello", fresh=True)
+    payload = await core.authenticate(token, verify_fresh=True)
+    assert payload.sub == "hello"
+
+
+async def test_authenticate_refresh(core: AuthXCore):
+    token = core.create_refresh_token(uid="hello")
+    with pytest.raises(AccessTokenRequiredError):
+        await core.authenticate(token)
+    payload = await core.authenticate(token, type="refresh")
+    assert payload.type == "refresh"
+
+
+async def test_authenticate_invalid(core: AuthXCore):
+    with pytest.raises(JWTDecodeError):
+        await core.authenticate("not-a-token")
+
+
+async def test_authenticate_blocklist(core: AuthXCore):
+    token = core.create_access_token(uid="hello")
+    core.set_token_blocklist(lambda t: t == token)
+    with pytest.raises(RevokedTokenError):
+        await core.authenticate(token)
+
+
+async def test_authenticate_token_version(core: AuthXCore):
+    core.set_token_versions(MemoryVersionTable())
+    token = core.create_access_token(uid="hello")
+    await core.authenticate(token)
+    core.bump_subject_version("hello")
+    with pytest.raises(RevokedTokenError, match="outdated"):
+        await core.authenticate(token)
+
+
+async def test_authenticate_cookie_csrf(core: AuthXCore):
+    token = core.create_access_token(uid="hello")
+    csrf = core._decode_token(token).csrf
+    with pytest.raises(CSRFError):
+        await core.authenticate(token, location="cookies")
+    payload = await core.authenticate(token, location="cookies", csrf=csrf)
+    assert payload.sub == "hello"
+
+
+async def test_get_subject(core: AuthXCore):
+    core.set_subject_getter(lambda uid: {"uid": uid})
+    payload = await core.authenticate(core.create_access_token(uid="hello"))
+    assert await core.get_subject(payload) == {"uid": "hello"}
+
+
+async def test_get_subject_snapshot(core: AuthXCore):
+    core.set_subject_snapshot(SubjectSnapshot(fields=["name"]))
+    core.set_subject_getter(lambda uid: pytest.fail("subject getter called"))
+    token = core.create_access_token(uid="hello", subject={"name": "Hello", "password": "secret"})
+    assert await core.get_subject(await core.authenticate(token)) == {"name": "Hello"}
@@ -0,0 +1,33 @@
+import json
+
+from benchmarks import _baseline, micro
+
+
+def test_micro_smoke(tmp_path, capsys):
+    baseline = tmp_path / "micro.json"
+    args = ["--algorithms", "HS256", "--filter", "small", "--repeat", "1", "--min-time", "0"]
+    assert micro.main([*args, "--json", "--save", str(baseline)]) == 0
+    output = json.loads(capsys.readouterr().out)
+    assert output["benchmark"] == "micro"
+    assert "create_token/HS256/small" in output["results"]
+    assert "extract/cookies/csrf" not in output["results"]
+    assert _baseline.load(str(baseline)).keys() == output["results"].keys()
+
+
+def test_compare():
+    baseline = {"a": {"median_ns": 100.0}, "b": {"median_ns": 100.0}}
+    results = {"a": {"median_ns": 105.0}, "b": {"median_ns": 150.0}, "c": {"median_ns": 1.0}}
+    regressions = _baseline.compare(results, baseline, "median_ns", tolerance=0.1)
+    assert len(regressions) == 1
+    assert regressions[0].startswith("b:")
+    assert _baseline.compare(results, baseline, "median_ns", tolerance=0.1, higher_is_better=True) == []
+
+
+def test_load_smoke(capsys):
+    from benchmarks import load
+
+    args = ["--scenarios", "valid", "missing", "--mix", "valid=3,missing=1"]
+    assert load.main([*args, "--requests", "20", "--concurrency", "2", "--warmup", "0", "--json"]) == 0
+    results = json.loads(capsys.readouterr().out)["results"]
+    assert set(results) == {"valid", "missing", "mix"}
+    assert all(values["errors"] == 0 and values["requests"] == 20 for values in results.values())
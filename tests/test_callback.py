@@ -1,3 +1,4 @@
+import threading
 from typing import Optional
 from unittest.mock import Mock, patch
 
@@ -286,3 +287,93 @@ def test_is_token_in_blocklist_callback_execution():
         handler.callback_is_token_in_blocklist = mock_callback
         assert handler.is_token_in_blocklist("test_token", extra="param")
         mock_callback.assert_called_once_with("test_token", extra="param")
+
+
+@pytest.mark.asyncio
+async def test_load_current_subject_sync_callback(handler):
+    subject = await handler._load_current_subject("123")
+    assert isinstance(subject, DummyModel)
+    assert subject.id == "123"
+
+
+@pytest.mark.asyncio
+async def test_load_current_subject_async_callback():
+    handler = _CallbackHandler()
+
+    @handler.set_subject_getter
+    async def async_model_callback(uid: str, **kwargs) -> Optional[DummyModel]:
+        return DummyModel(uid) if uid else None
+
+    subject = await handler._load_current_subject("123")
+    assert isinstance(subject, DummyModel)
+    assert subject.id == "123"
+    assert await handler._load_current_subject("") is None
+
+
+@pytest.mark.asyncio
+async def test_load_current_subject_async_callable_object():
+    class AsyncGetter:
+        async def __call__(self, uid: str, **kwargs) -> DummyModel:
+            return DummyModel(uid)
+
+    handler = _CallbackHandler()
+    handler.set_subject_getter(AsyncGetter(), run_in_threadpool=True)
+    subject = await handler._load_current_subject("123")
+    assert subject.id == "123"
+
+
+@pytest.mark.asyncio
+async def test_load_current_subject_in_threadpool():
+    handler = _CallbackHandler()
+    main_thread = threading.get_ident()
+    threads = []
+
+    def blocking_model_callback(uid: str, **kwargs) -> DummyModel:
+        threads.append(threading.get_ident())
+        return DummyModel(uid)
+
+    handler.set_subject_getter(blocking_model_callback, run_in_threadpool=True)
+    subject = await handler._load_current_subject("123")
+    assert subject.id == "123"
+    assert threads and threads[0] != main_thread
+
+
+@pytest.mark.asyncio
+async def test_load_current_subject_in_threadpool_awaitable_result():
+    async def load(uid: str) -> DummyModel:
+        return DummyModel(uid)
+
+    handler = _CallbackHandler()
+    handler.set_subject_getter(lambda uid, **kwargs: load(uid), run_in_threadpool=True)
+    subject = await handler._load_current_subject("123")
+    assert isinstance(subject, DummyModel)
+    assert subject.id == "123"
+
+
+@pytest.mark.asyncio
+async def test_load_current_subject_not_set():
+    handler = _CallbackHandler()
+    with pytest.raises(AttributeError):
+        await handler._load_current_subject("123")
+
+
+@pytest.mark.asyncio
+async def test_is_token_revoked_async_callback():
+    handler = _CallbackHandler()
+
+    @handler.set_token_blocklist
+    async def async_blocklist(token: str, **kwargs) -> bool:
+        return token == "blocked"
+
+    assert await handler.is_token_revoked("blocked")
+    assert not await handler.is_token_revoked("valid")
+    assert not await handler.is_token_revoked(None)
+    # The sync check never returns the coroutine, which would be truthy
+    with pytest.raises(TypeError, match="is_token_revoked"):
+        handler.is_token_in_blocklist("valid")
+
+
+@pytest.mark.asyncio
+async def test_is_token_revoked_sync_callback(handler):
+    assert await handler.is_token_revoked("any_token", block_all=True)
+    assert not await handler.is_token_revoked("any_token")
@@ -1,8 +1,10 @@
+import asyncio
 from unittest.mock import Mock
 
+import pytest
 from fastapi import Response
 
-from authx import AuthXDependency
+from authx import AuthXDependency, LazySubject
 
 
 class MockAuthX:
@@ -67,3 +69,40 @@ async def test_authx_dependency_methods():
 
     current_subject = await authx_dependency.get_current_subject()
     assert current_subject == "current_subject"
+
+
+async def test_lazy_subject_loads_once():
+    calls = []
+
+    async def loader(uid):
+        calls.append(uid)
+        await asyncio.sleep(0)
+        return {"uid": uid}
+
+    subject = LazySubject("uid", loader)
+    assert subject.uid == "uid"
+    assert not subject.loaded
+    assert calls == []
+
+    results = await asyncio.gather(subject.get(), subject.get())
+    assert results == [{"uid": "uid"}, {"uid": "uid"}]
+    assert await subject == {"uid": "uid"}
+    assert subject.loaded
+    assert calls == ["uid"]
+
+
+async def test_lazy_subject_retries_after_error():
+    calls = []
+
+    async def loader(uid):
+        calls.append(uid)
+        if len(calls) == 1:
+            raise LookupError(uid)
+        return uid
+
+    subject = LazySubject("uid", loader)
+    with pytest.raises(LookupError):
+        await subject
+    assert not subject.loaded
+    assert await subject == "uid"
+    assert calls == ["uid", "uid"]
@@ -158,3 +158,63 @@ async def test_set_app_exception_handler(app, client, error_handler, exception,
         "message": expected_message,
         "error_type": exception.__name__,
     }
+
+
+def test_error_responses_are_prerendered(app: FastAPI, client: TestClient, authx: AuthX):
+    authx.handle_errors(app)
+
+    @app.get("/missing")
+    async def missing():
+        raise exc.MissingTokenError("Missing 'Bearer' in 'Authorization' header.")
+
+    class SessionTokenMissingError(exc.MissingTokenError):
+        pass
+
+    @app.get("/subclass")
+    async def subclass():
+        raise SessionTokenMissingError("Missing session token")
+
+    first = client.get("/missing")
+    second = client.get("/missing")
+    assert first.status_code == second.status_code == 401
+    assert first.content == second.content
+    assert first.json() == {"message": AuthX.MSG_TokenError, "error_type": "MissingTokenError"}
+    assert first.headers["content-type"] == "application/json"
+    assert first.headers["content-length"] == str(len(first.content))
+
+    # Subclasses go through the handler of their parent, rendered with their own name
+    response = client.get("/subclass")
+    assert response.status_code == 401
+    assert response.json() == {"message": AuthX.MSG_TokenError, "error_type": "SessionTokenMissingError"}
+    assert response.headers["content-length"] == str(len(response.content))
+
+
+def test_messages_assigned_after_handle_errors(app: FastAPI, client: TestClient, authx: AuthX):
+    authx.handle_errors(app)
+
+    @app.get("/missing")
+    async def missing():
+        raise exc.MissingTokenError("Missing 'Bearer' in 'Authorization' header.")
+
+    @app.get("/decode")
+    async def decode():
+        raise exc.JWTDecodeError("Signature has expired")
+
+    assert client.get("/missing").json()["message"] == AuthX.MSG_TokenError
+    authx.MSG_TokenError = "Please sign in"
+    authx.MSG_JWTDecodeError = "Please sign in again"
+
+    response = client.get("/missing")
+    assert response.json() == {"message": "Please sign in", "error_type": "MissingTokenError"}
+    assert response.headers["content-length"] == str(len(response.content))
+    assert client.get("/decode").json() == {"message": "Please sign in again", "error_type": "JWTDecodeError"}
+
+
+def test_render_error_response(error_handler):
+    rendered = error_handler._render_error_response(exc.CSRFError, 401, None)
+    assert rendered is not None
+    assert json.loads(rendered) == {"message": _ErrorHandler.MSG_CSRFError, "error_type": "CSRFError"}
+
+
+def test_render_error_response_instance_message(error_handler):
+    assert error_handler._render_error_response(ValueError, 400, None) is None
@@ -1,3 +1,4 @@
+import datetime
 from unittest.mock import Mock, patch
 
 import pytest
@@ -66,7 +67,7 @@ async def test_implicit_refresh_middleware_with_refresh_once(authx, app):
     client = TestClient(app)
 
     mock_token = Mock()
-    mock_payload = Mock(time_until_expiry=100, sub="user123", extra_dict={})
+    mock_payload = Mock(_seconds_until_expiry=100, sub="user123", extra_dict={})
 
     with (
         patch.object(authx, "_get_token_from_request", return_value=mock_token),
@@ -94,7 +95,7 @@ async def test_implicit_refresh_middleware_with_refresh(authx, app):
     client = TestClient(app)
 
     mock_token = Mock()
-    mock_payload = Mock(time_until_expiry=100, sub="user123", extra_dict={})
+    mock_payload = Mock(_seconds_until_expiry=100, sub="user123", extra_dict={})
 
     with (
         patch.object(authx, "_get_token_from_request", return_value=mock_token),
@@ -121,7 +122,7 @@ async def test_implicit_refresh_middleware_no_refresh_needed(authx, app):
     client = TestClient(app)
 
     mock_token = Mock()
-    mock_payload = Mock(time_until_expiry=1000, sub="user123", extra_dict={})
+    mock_payload = Mock(_seconds_until_expiry=1000, sub="user123", extra_dict={})
 
     with (
         patch.object(authx, "_get_token_from_request", return_value=mock_token),
@@ -174,3 +175,21 @@ async def test_implicit_refresh_middleware_excluded_method(authx, app):
         assert response.status_code == 200
         assert response.json() == {"message": "post"}
         mock_get_token.assert_not_called()
+
+
+def test_implicit_refresh_middleware_refreshes_expiring_token():
+    config = AuthXConfig(JWT_SECRET_KEY="secret", JWT_TOKEN_LOCATION=["cookies"], JWT_COOKIE_CSRF_PROTECT=False)
+    authx = AuthX(config=config)
+    app = FastAPI()
+    app.middleware("http")(authx.implicit_refresh_middleware)
+
+    @app.get("/test")
+    async def test_route():
+        return {"message": "success"}
+
+    client = TestClient(app)
+    for expiry, refreshed in ((datetime.timedelta(minutes=5), True), (datetime.timedelta(hours=1), False)):
+        client.cookies.set(config.JWT_ACCESS_COOKIE_NAME, authx.create_access_token(uid="user", expiry=expiry))
+        response = client.get("/test")
+        assert response.status_code == 200
+        assert ("set-cookie" in response.headers) is refreshed
@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def _run(code: str) -> str:
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.mark.parametrize("module", ["jwt", "dateutil", "pytz", "itsdangerous", "sqlite3"])
+def test_import_authx_is_lazy(module: str):
+    assert _run(f"import sys, authx; print({module!r} in sys.modules)") == "False"
+
+
+def test_authx_default_config_is_not_shared():
+    from authx import AuthX
+
+    assert AuthX().config is not AuthX().config
+
+
+def test_internal_lazy_attributes():
+    from authx import _internal
+    from authx._internal._blocklist import SQLiteBlocklist
+    from authx._internal._signature import SignatureSerializer
+
+    assert _internal.SQLiteBlocklist is SQLiteBlocklist
+    assert _internal.SignatureSerializer is SignatureSerializer
+    assert str(_internal.utc) == "UTC"
+    with pytest.raises(AttributeError):
+        _internal.missing  # noqa: B018
+
+
+def test_core_does_not_import_fastapi():
+    code = (
+        "import sys, asyncio\n"
+        "from authx import AuthXConfig, AuthXCore\n"
+        "core = AuthXCore(AuthXConfig(JWT_SECRET_KEY='secret', JWT_TOKEN_LOCATION=['headers']))\n"
+        "asyncio.run(core.authenticate(core.create_access_token(uid='user')))\n"
+        "print('fastapi' in sys.modules, 'starlette' in sys.modules)"
+    )
+    assert _run(code) == "False False"
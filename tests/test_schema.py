@@ -452,5 +452,13 @@ def test_token_payload_invalid_decode():
 def test_token_payload_nbf_validator():
     future_time = datetime.datetime.now() + datetime.timedelta(minutes=5)
     payload = TokenPayload(sub="1234567890", nbf=future_time)
-    assert isinstance(payload.nbf, float)
+    assert isinstance(payload.nbf, int)
     assert payload.nbf == pytest.approx(future_time.timestamp(), abs=1)
+
+
+def test_token_payload_integer_claims():
+    payload = TokenPayload(sub="1234567890", exp=datetime.timedelta(minutes=5))
+    assert isinstance(payload.iat, int)
+    assert payload.exp == payload.iat + 300
+    assert 299 <= payload.time_until_expiry.total_seconds() <= 300
+    assert payload.expiry_datetime.tzinfo == datetime.timezone.utc
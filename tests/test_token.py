@@ -28,7 +28,7 @@ def test_encode_decode_token():
     assert payload.get("type") == "TYPE"
     assert payload.get("iat") is not None
     assert payload.get("jti") is not None
-    assert isinstance(payload.get("iat"), float)
+    assert isinstance(payload.get("iat"), int)
     assert isinstance(payload.get("jti"), str)
 
 
@@ -105,7 +105,7 @@ def test_create_token_with_timed_claims(claim, argument):
     payload = decode_token(token, key=KEY, algorithms=[ALGO], verify=False)
 
     assert payload.get(claim) is not None
-    assert isinstance(payload.get(claim), float)
+    assert isinstance(payload.get(claim), int)
     assert abs((now + dt).timestamp() - payload.get(claim)) < 1
 
 
@@ -1,8 +1,8 @@
 from typing import NamedTuple, Optional
 
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, Request
 
-from authx import AuthX, AuthXConfig, AuthXDependency, RequestToken, TokenPayload
+from authx import AuthX, AuthXConfig, AuthXDependency, LazySubject, RequestToken, TokenPayload
 
 
 class SecuritiesTuple(NamedTuple):
@@ -18,6 +18,11 @@ class SecuritiesTuple(NamedTuple):
     refresh_token_cookies: TokenPayload
 
 
+def bearer_request(token: str) -> Request:
+    """Build a GET request carrying the token in the Authorization header."""
+    return Request(scope={"type": "http", "method": "GET", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+
 def init_app(config: Optional[AuthXConfig] = None) -> "tuple[FastAPI, AuthX]":
     """Initialize FastAPI app and AuthX instance."""
     app = FastAPI()
@@ -226,3 +231,9 @@ def create_subject_routes(app: FastAPI, security: AuthX) -> None:
     @app.get("/entity/subject/resources")
     async def _subject_resources_route(subject: dict = security.CURRENT_SUBJECT):
         return {"resources": [r for r in RESOURCES if subject["uid"] == r["subject"]]}
+
+    @app.get("/entity/subject/lazy")
+    async def _lazy_subject_route(load: bool = False, subject: LazySubject = security.LAZY_SUBJECT):
+        if load:
+            return {"uid": subject.uid, "subject": await subject}
+        return {"uid": subject.uid, "loaded": subject.loaded}